@@ -0,0 +1,71 @@
+"""
+Counts the matrices allocated per iteration of an iterative update C = C + A @ B.T, computed eagerly
+(a transposed copy, a product and a sum per iteration) and in place (matrix_multiplication into C with accumulate
+and a view of B.T), with the time per iteration and the peak memory allocated by python (tracemalloc).
+Usage: python -m benchmarks.bench_allocations [size, 128 by default] [iterations, 5 by default]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, cast
+
+from hw1.matrices import PYTHON_BACKEND, Matrix, matrix_backend, matrix_multiplication, matrix_sum, matrix_transpose
+
+
+def random_matrix(size: int, seed: int) -> Matrix:
+    generator = random.Random(seed)
+    return Matrix.from_rows([[generator.uniform(-1, 1) for _ in range(size)] for _ in range(size)])
+
+
+def copy_of_transpose(matrix: Matrix) -> Matrix:
+    # what matrix_transpose did before it returned views
+    return Matrix.from_rows([list(matrix.data[j :: matrix.n_cols]) for j in range(matrix.n_cols)])
+
+
+def measure(name: str, iterations: int, step: Callable[[], None]) -> None:
+    created = 0
+    original_init = Matrix.__init__
+
+    def counting_init(self: Matrix, *args: Any, **kwargs: Any) -> None:
+        nonlocal created
+        created += 1
+        original_init(self, *args, **kwargs)
+
+    setattr(Matrix, "__init__", counting_init)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with matrix_backend(PYTHON_BACKEND):
+            for _ in range(iterations):
+                step()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        setattr(Matrix, "__init__", original_init)
+    print(
+        f"{name:>9}: {elapsed / iterations:8.3f} s and {created / iterations:4.1f} matrices allocated per iteration, "
+        f"peak allocated {peak / 2**20:7.2f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    a, b = random_matrix(size, 1), random_matrix(size, 2)
+    eager, in_place = Matrix(size, size), Matrix(size, size)
+
+    def eager_step() -> None:
+        global eager
+        # the sum of matrices is a matrix, its .data is compared below
+        eager = cast(Matrix, matrix_sum(eager, matrix_multiplication(a, copy_of_transpose(b))))
+
+    def in_place_step() -> None:
+        matrix_multiplication(a, matrix_transpose(b), out=in_place, accumulate=True)
+
+    measure("eager", iterations, eager_step)
+    measure("in place", iterations, in_place_step)
+    error = max(abs(x - y) for x, y in zip(eager.data, in_place.data))
+    print(f"largest difference between the results: {error:.3g}")
@@ -0,0 +1,59 @@
+"""
+Measures the cost of one application of a curried function for functions of growing arity, with curry_explicit and
+with the currying it replaced, which checked the signature of the function and copied its attributes with wraps
+on every application.
+Usage: python -m benchmarks.bench_curry [largest arity, 32 by default] [runs, 2000 by default]
+"""
+
+import inspect
+import sys
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from hw2.curry import curry_explicit
+
+
+def checking_curry(func: Callable[..., Any], arity: int, passed_args: tuple = ()) -> Callable:
+    """
+    The way curry_explicit applied arguments before the signatures were cached.
+    """
+    inspect.getfullargspec(func)
+    inspect.getfullargspec(func)
+
+    @wraps(func)
+    def curried_function(x):
+        if len(passed_args) + 1 < arity:
+            return checking_curry(func, arity, (*passed_args, x))
+        return func(*passed_args, x)
+
+    return curried_function
+
+
+def n_ary_function(arity: int) -> Callable[..., Any]:
+    names = ", ".join(f"a{i}" for i in range(arity))
+    return eval(f"lambda {names}: 0")
+
+
+def measure(curry: Callable[[Callable[..., Any], int], Callable], arity: int, n_runs: int) -> float:
+    """
+    :return: the time of an application of the curried function in microseconds, currying it is not included
+    """
+    curried_function = curry(n_ary_function(arity), arity)
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        curried = curried_function
+        for i in range(arity):
+            curried = curried(i)
+    return (time.perf_counter() - start) / (n_runs * arity) * 1e6
+
+
+if __name__ == "__main__":
+    largest_arity = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    arity = 1
+    while arity <= largest_arity:
+        checking = measure(checking_curry, arity, n_runs)
+        cached = measure(curry_explicit, arity, n_runs)
+        print(f"arity {arity:3}: {checking:7.2f} us per application checking, {cached:7.2f} us with curry_explicit")
+        arity *= 2
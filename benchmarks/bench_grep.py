@@ -0,0 +1,71 @@
+"""
+Compares the block-wise grep engine with searching line by line, for a regular expression and a fixed string
+that match rarely, which is what grep is mostly used for.
+Usage: python -m benchmarks.bench_grep [size in MiB, 1024 by default]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from hw1.line_matching import LineMatcher, iter_matching_lines
+
+REGEX = rb"request=4[0-9]{3}\b"
+FIXED_STRING = b"ERROR"
+
+
+def count_naively(filepath: str, pattern: bytes, fixed_strings: bool) -> int:
+    """
+    Iterates the lines of the file and searches each of them.
+    """
+    n_matching_lines = 0
+    with open(filepath, "rb") as f:
+        if fixed_strings:
+            for line in f:
+                n_matching_lines += pattern in line
+        else:
+            search = re.compile(pattern).search
+            for line in f:
+                n_matching_lines += search(line) is not None
+    return n_matching_lines
+
+
+def count_in_blocks(filepath: str, pattern: bytes, fixed_strings: bool) -> int:
+    with open(filepath, "rb") as f:
+        return sum(1 for _ in iter_matching_lines(f, LineMatcher(pattern, fixed_strings)))
+
+
+def generate_file(filepath: str, size: int) -> None:
+    words = [b"lorem", b"ipsum", b"dolor", b"sit", b"amet", b"2021-03-01T12:00:00", b"INFO", b"request=42"]
+    generator = random.Random(42)
+    lines = [b" ".join(generator.choices(words, k=generator.randint(0, 16))) + b"\n" for _ in range(10_000)]
+    lines[1234] = b"2021-03-01T12:00:00 ERROR request=4711 failed\n"
+    block = b"".join(lines)
+    with open(filepath, "wb") as f:
+        for _ in range(size // len(block) + 1):
+            f.write(block)
+
+
+def measure(name: str, count: Callable[[str, bytes, bool], int], filepath: str, pattern: bytes, fixed: bool) -> int:
+    start = time.perf_counter()
+    n_matching_lines = count(filepath, pattern, fixed)
+    elapsed = time.perf_counter() - start
+    size_mib = os.path.getsize(filepath) / 2 ** 20
+    print(f"{name:>24}: {elapsed:8.2f} s, {size_mib / elapsed:8.1f} MiB/s, {n_matching_lines} lines")
+    return n_matching_lines
+
+
+if __name__ == "__main__":
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "input.txt")
+        generate_file(filepath, size_mib * 2 ** 20)
+        for pattern, fixed_strings in ((REGEX, False), (FIXED_STRING, True)):
+            kind = "fixed string" if fixed_strings else "regex"
+            naive = measure(f"{kind}, line by line", count_naively, filepath, pattern, fixed_strings)
+            blocks = measure(f"{kind}, blocks", count_in_blocks, filepath, pattern, fixed_strings)
+            assert naive == blocks, "the engines disagree"
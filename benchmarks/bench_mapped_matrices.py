@@ -0,0 +1,74 @@
+"""
+Times the out-of-core sum, transpose and multiplication of matrix files and reports the peak resident memory of
+each of them, every operation runs in a fresh process so that its peak is its own.
+Usage: python -m benchmarks.bench_mapped_matrices [size, 2048 by default] [memory budget in MiB, 16 by default]
+       [multiplication size, 256 by default]
+"""
+
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from array import array
+from typing import Tuple
+
+from hw1.mapped_matrices import (
+    MappedMatrix,
+    mapped_matrix_multiplication,
+    mapped_matrix_sum,
+    mapped_matrix_transpose,
+)
+
+
+def generate_matrix_file(path: str, size: int, seed: int) -> None:
+    generator = random.Random(seed)
+    with MappedMatrix.create(path, size, size) as matrix, matrix.elements() as view:
+        for i in range(size):
+            view[i * size : (i + 1) * size] = array("d", [generator.uniform(-1, 1) for _ in range(size)])
+            matrix.release(i * size, (i + 1) * size)
+
+
+def run_operation(operation: str, directory: str, memory_budget: int) -> Tuple[float, int]:
+    """
+    :return: the time the operation took and the peak resident memory of the process in KiB
+    """
+    start = time.perf_counter()
+    with MappedMatrix(os.path.join(directory, f"{operation}1")) as matrix1:
+        if operation == "transpose":
+            result = mapped_matrix_transpose(matrix1, os.path.join(directory, "result"), memory_budget)
+        else:
+            with MappedMatrix(os.path.join(directory, f"{operation}2")) as matrix2:
+                function = mapped_matrix_sum if operation == "sum" else mapped_matrix_multiplication
+                result = function(matrix1, matrix2, os.path.join(directory, "result"), memory_budget)
+        result.close()
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    memory_budget = (int(sys.argv[2]) if len(sys.argv) > 2 else 16) * 2 ** 20
+    multiplication_size = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, matrix_size, seed in [
+            ("sum1", size, 1),
+            ("sum2", size, 2),
+            ("transpose1", size, 3),
+            ("multiplication1", multiplication_size, 4),
+            ("multiplication2", multiplication_size, 5),
+        ]:
+            generate_matrix_file(os.path.join(directory, name), matrix_size, seed)
+        with context.Pool(1) as pool:
+            baseline_kib = pool.apply(resource.getrusage, (resource.RUSAGE_SELF,)).ru_maxrss
+        for operation in ["sum", "transpose", "multiplication"]:
+            with context.Pool(1) as pool:
+                elapsed, peak_kib = pool.apply(run_operation, (operation, directory, memory_budget))
+            matrix_size = multiplication_size if operation == "multiplication" else size
+            print(
+                f"{operation:>14} of {matrix_size}x{matrix_size} ({matrix_size**2 * 8 / 2**20:.0f} MiB): "
+                f"{elapsed:8.2f} s, peak memory {(peak_kib - baseline_kib) / 1024:6.1f} MiB over the interpreter, "
+                f"budget {memory_budget / 2**20:.0f} MiB"
+            )
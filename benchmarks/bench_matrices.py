@@ -0,0 +1,53 @@
+"""
+Compares the memory and the speed of matrices stored as lists of lists with the array-backed Matrix,
+both computed by the pure python backend.
+Usage: python -m benchmarks.bench_matrices [size, 1000 by default] [size of multiplied matrices, 200 by default]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from hw1.matrices import PYTHON_BACKEND, Matrix, matrix_multiplication, matrix_sum, matrix_transpose, set_backend
+
+
+def random_rows(size: int) -> List[List[float]]:
+    generator = random.Random(42)
+    return [[generator.random() for _ in range(size)] for _ in range(size)]
+
+
+def measure_memory(name: str, create: Callable[[], Any]) -> Any:
+    tracemalloc.start()
+    created = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>28}: {size / 2**20:8.1f} MiB")
+    return created
+
+
+def measure_time(name: str, function: Callable[..., Any], *args: Any) -> Any:
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{name:>28}: {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+if __name__ == "__main__":
+    set_backend(PYTHON_BACKEND)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    multiplied_size = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rows = measure_memory(f"lists {size}x{size}", lambda: random_rows(size))
+    matrix = measure_memory(f"Matrix {size}x{size}", lambda: Matrix.from_rows(rows))
+    for name, function in (("transpose", matrix_transpose), ("sum", lambda m: matrix_sum(m, m))):
+        from_lists = measure_time(f"{name}, lists", function, rows)
+        from_matrix = measure_time(f"{name}, Matrix", function, matrix)
+        assert Matrix.from_rows(from_lists) == from_matrix, "the results differ"
+    small_rows = [row[:multiplied_size] for row in rows[:multiplied_size]]
+    small_matrix = Matrix.from_rows(small_rows)
+    from_lists = measure_time(f"multiplication {multiplied_size}, lists", matrix_multiplication, small_rows, small_rows)
+    from_matrix = measure_time(
+        f"multiplication {multiplied_size}, Matrix", matrix_multiplication, small_matrix, small_matrix
+    )
+    assert Matrix.from_rows(from_lists) == from_matrix, "the results differ"
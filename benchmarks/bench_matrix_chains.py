@@ -0,0 +1,62 @@
+"""
+Compares multiplying a chain of rectangular matrices left to right with multiply_chain, and raising a matrix to
+a power by repeated multiplication with matrix_power, by time and by the planned floating point operations.
+Usage: python -m benchmarks.bench_matrix_chains [size, 128 by default] [power, 16 by default]
+"""
+
+import random
+import sys
+import time
+from typing import Callable, List, Sequence
+
+from hw1.matrices import PYTHON_BACKEND, Matrix, MatrixLike, matrix_backend, matrix_multiplication
+from hw1.matrix_chains import Order, chain_shapes, matrix_power, multiply_chain, order_flops
+
+
+def random_matrix(n_rows: int, n_cols: int, seed: int) -> Matrix:
+    generator = random.Random(seed)
+    return Matrix.from_rows([[generator.uniform(-1, 1) for _ in range(n_cols)] for _ in range(n_rows)])
+
+
+def multiply_left_to_right(matrices: Sequence[MatrixLike]) -> MatrixLike:
+    product = matrices[0]
+    for matrix in matrices[1:]:
+        product = matrix_multiplication(product, matrix)
+    return product
+
+
+def measure(name: str, compute: Callable[[], int]) -> None:
+    """
+    :param compute: computes a product and returns the floating point operations it took
+    """
+    start = time.perf_counter()
+    with matrix_backend(PYTHON_BACKEND):
+        flops = compute()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28}: {elapsed:8.3f} s, {flops / 1e6:10.1f} MFLOP")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    power = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    # a wide matrix in the middle makes the left to right order expensive
+    dimensions = [size, size // 8, size * 2, size // 8, size]
+    chain: List[Matrix] = [random_matrix(n, m, seed) for seed, (n, m) in enumerate(zip(dimensions, dimensions[1:]))]
+    shapes = chain_shapes(chain)
+    left_to_right: Order = 0
+    for i in range(1, len(chain)):
+        left_to_right = left_to_right, i
+
+    def multiply_chain_left_to_right() -> int:
+        multiply_left_to_right(chain)
+        return order_flops(shapes, left_to_right)
+
+    def multiply_repeatedly() -> int:
+        multiply_left_to_right([matrix] * power)
+        return (power - 1) * 2 * matrix.n_rows ** 3
+
+    measure("chain left to right", multiply_chain_left_to_right)
+    measure("multiply_chain", lambda: multiply_chain(*chain).flops)
+    matrix = random_matrix(size // 2, size // 2, len(chain))
+    measure(f"power {power} by multiplication", multiply_repeatedly)
+    measure(f"matrix_power {power}", lambda: matrix_power(matrix, power).flops)
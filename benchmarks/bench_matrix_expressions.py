@@ -0,0 +1,57 @@
+"""
+Compares evaluating expressions with the eager matrix functions with evaluating them as lazy expressions,
+by time and by the peak memory allocated by python (tracemalloc) on the way.
+Usage: python -m benchmarks.bench_matrix_expressions [size, 256 by default]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from hw1.matrices import (
+    PYTHON_BACKEND,
+    Matrix,
+    MatrixLike,
+    matrix_backend,
+    matrix_multiplication,
+    matrix_sum,
+    matrix_transpose,
+)
+from hw1.matrix_expressions import lazy
+
+
+def random_matrix(size: int, seed: int) -> Matrix:
+    generator = random.Random(seed)
+    return Matrix.from_rows([[generator.uniform(-1, 1) for _ in range(size)] for _ in range(size)])
+
+
+def measure(name: str, evaluate: Callable[[], MatrixLike]) -> MatrixLike:
+    tracemalloc.start()
+    start = time.perf_counter()
+    with matrix_backend(PYTHON_BACKEND):
+        result = evaluate()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:>34}: {elapsed:8.3f} s, peak allocated {peak / 2**20:8.2f} MiB")
+    return result
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    a, b, c = random_matrix(size, 1), random_matrix(size, 2), random_matrix(size, 3)
+    cases: List[Tuple[str, Callable[[], MatrixLike], Callable[[], MatrixLike]]] = [
+        ("A @ B + C", lambda: matrix_sum(matrix_multiplication(a, b), c), lambda: (lazy(a) @ b + c).evaluate()),
+        (
+            "A.T.T + B + C",
+            lambda: matrix_sum(matrix_sum(matrix_transpose(matrix_transpose(a)), b), c),
+            lambda: (lazy(a).T.T + b + c).evaluate(),
+        ),
+        ("A @ B.T", lambda: matrix_multiplication(a, matrix_transpose(b)), lambda: (lazy(a) @ lazy(b).T).evaluate()),
+    ]
+    for name, evaluate_eagerly, evaluate_lazily in cases:
+        eager = measure(f"eager {name}", evaluate_eagerly)
+        fused = measure(f"lazy {name}", evaluate_lazily)
+        assert eager == fused, "the results differ"
@@ -0,0 +1,177 @@
+"""
+The benchmark suite of hw1.matrices: times dot_product, matrix_transpose, matrix_sum and matrix_multiplication
+on seeded random inputs of several sizes and shapes (square, tall and skinny, short and wide), records the peak memory
+python allocates for every one of them (tracemalloc, in a run of its own so it does not slow the timed runs down)
+and writes the results as JSON. Given a baseline written by an earlier run, it compares every result with it and
+exits with status 1 listing the regressions if an operation got slower or allocates more than the tolerances allow.
+Usage: python -m benchmarks.bench_matrix_suite [--sizes 64 128 256] [--multiplication-sizes 32 64 128]
+       [--repeat 5] [--backend python] [--output results.json] [--baseline benchmarks/matrix_baseline.json]
+       [--time-tolerance 0.25] [--memory-tolerance 0.10] [--update-baseline]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from hw1.matrices import (
+    PYTHON_BACKEND,
+    Matrix,
+    as_matrix,
+    dot_product,
+    matrix_backend,
+    matrix_multiplication,
+    matrix_sum,
+    matrix_transpose,
+)
+
+DEFAULT_BASELINE = "benchmarks/matrix_baseline.json"
+# times differ by this much from run to run whatever the tolerance, so faster operations are not compared by it
+TIME_NOISE = 0.0002
+
+# a case is an operation, a shape and a size, and the inputs it is run on
+Case = Tuple[str, str, int, Callable[[], Any]]
+
+
+def random_matrix(n_rows: int, n_cols: int, name: str) -> Matrix:
+    # seeded by the name, so a case gets the same inputs whatever cases are run before it
+    generator = random.Random(zlib.crc32(name.encode()))
+    return Matrix.from_rows([[generator.uniform(-1, 1) for _ in range(n_cols)] for _ in range(n_rows)])
+
+
+def shapes(size: int) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yields the shapes of matrices of [size] x [size] elements.
+    """
+    yield "square", size, size
+    yield "tall-skinny", size * 4, max(1, size // 4)
+    yield "short-wide", max(1, size // 4), size * 4
+
+
+def copy_of_transpose(matrix: Matrix) -> Matrix:
+    # a transpose is a view of the matrix, copying it is the work of transposing
+    return as_matrix(matrix_transpose(matrix))
+
+
+def cases(sizes: List[int], multiplication_sizes: List[int]) -> Iterator[Case]:
+    for size in sizes:
+        vector1 = random_matrix(1, size * size, f"dot {size} 1")
+        vector2 = random_matrix(1, size * size, f"dot {size} 2")
+        yield "dot_product", "vector", size, partial(dot_product, vector1, vector2)
+        for shape, n_rows, n_cols in shapes(size):
+            matrix1 = random_matrix(n_rows, n_cols, f"{shape} {size} 1")
+            matrix2 = random_matrix(n_rows, n_cols, f"{shape} {size} 2")
+            yield "matrix_transpose", shape, size, partial(copy_of_transpose, matrix1)
+            yield "matrix_sum", shape, size, partial(matrix_sum, matrix1, matrix2)
+    for size in multiplication_sizes:
+        for shape, n_rows, n_cols in shapes(size):
+            matrix1 = random_matrix(n_rows, n_cols, f"{shape} {size} product 1")
+            matrix2 = random_matrix(n_cols, n_rows, f"{shape} {size} product 2")
+            yield "matrix_multiplication", shape, size, partial(matrix_multiplication, matrix1, matrix2)
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    :return: the best time of [repeat] runs and the peak memory allocated by a run, over what was allocated before it
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    run()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+    return result["operation"], result["shape"], result["size"]
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], time_tolerance: float, memory_tolerance: float
+) -> List[str]:
+    """
+    :return: a description of every result that is slower or allocates more than its baseline result
+    by more than the tolerances, the results of cases missing from the baseline are not compared
+    """
+    baseline_results = {key(result): result for result in baseline["results"]}
+    found = []
+    for result in results:
+        expected = baseline_results.get(key(result))
+        if expected is None:
+            continue
+        name = "{} {} {}".format(*key(result))
+        if result["seconds"] > expected["seconds"] * (1 + time_tolerance) + TIME_NOISE:
+            found.append(f"{name}: {result['seconds']:.4f} s, the baseline is {expected['seconds']:.4f} s")
+        if result["peak_bytes"] > expected["peak_bytes"] * (1 + memory_tolerance):
+            found.append(f"{name}: peak {result['peak_bytes']} bytes, the baseline is {expected['peak_bytes']} bytes")
+    return found
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="The benchmark suite of hw1.matrices")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--multiplication-sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", default=PYTHON_BACKEND)
+    parser.add_argument("--output", help="the file to write the results to, the standard output by default")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--memory-tolerance", type=float, default=0.10)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    results: List[Dict[str, Any]] = []
+    with matrix_backend(arguments.backend):
+        for operation, shape, size, run in cases(arguments.sizes, arguments.multiplication_sizes):
+            result: Dict[str, Any] = {"operation": operation, "shape": shape, "size": size}
+            result.update(measure(run, arguments.repeat))
+            print(
+                f"{operation:>21} {shape:>11} {size:5}: {result['seconds']:9.5f} s, "
+                f"peak {result['peak_bytes'] / 2**20:8.3f} MiB",
+                file=sys.stderr,
+            )
+            results.append(result)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": arguments.backend,
+        "repeat": arguments.repeat,
+        "results": results,
+    }
+    if arguments.output:
+        with open(arguments.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if arguments.update_baseline:
+        with open(arguments.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"the baseline is written to {arguments.baseline}", file=sys.stderr)
+    else:
+        try:
+            with open(arguments.baseline) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"no baseline at {arguments.baseline}, nothing to compare with", file=sys.stderr)
+        else:
+            found = regressions(results, baseline, arguments.time_tolerance, arguments.memory_tolerance)
+            if found:
+                print(f"{len(found)} regressions against {arguments.baseline}:", file=sys.stderr)
+                print("\n".join(found), file=sys.stderr)
+                sys.exit(1)
+            print(f"no regressions against {arguments.baseline}", file=sys.stderr)
@@ -0,0 +1,71 @@
+"""
+Compares the blocked matrix multiplication with multiplying rows by columns the way it was done before,
+for square matrices of doubling sizes, on a pool of processes if a number of jobs is given,
+and with the NumPy backend if NumPy is installed.
+Pure python multiplication is cubic, 2048x2048 takes many minutes.
+Usage: python -m benchmarks.bench_multiplication [largest size, 512 by default] [block size, 128 by default]
+       [jobs, 1 by default]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from hw1.matrices import (
+    NUMPY_BACKEND,
+    PYTHON_BACKEND,
+    Matrix,
+    load_numpy_backend,
+    matrix_backend,
+    matrix_multiplication,
+)
+
+Rows = List[List[float]]
+
+
+def multiply_rows_by_columns(rows1: Rows, rows2: Rows) -> Rows:
+    """
+    The multiplication matrix_multiplication did before it was blocked.
+    """
+    columns = list(zip(*rows2))
+    return [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in rows1]
+
+
+def random_rows(size: int) -> Rows:
+    generator = random.Random(size)
+    return [[generator.uniform(-1, 1) for _ in range(size)] for _ in range(size)]
+
+
+if __name__ == "__main__":
+    largest_size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    size = 64
+    while size <= largest_size:
+        rows = random_rows(size)
+        matrix = Matrix.from_rows(rows)
+        start = time.perf_counter()
+        expected = multiply_rows_by_columns(rows, rows)
+        unblocked = time.perf_counter() - start
+        with matrix_backend(PYTHON_BACKEND):
+            start = time.perf_counter()
+            product = matrix_multiplication(matrix, matrix, block_size)
+            blocked = time.perf_counter() - start
+        assert product == Matrix.from_rows(expected), "the results differ"
+        gflops = 2 * size ** 3 / blocked / 1e9
+        report = f"{size:>5}: rows by columns {unblocked:9.3f} s, blocked {blocked:9.3f} s, {gflops:.3f} GFLOP/s"
+        if jobs > 1:
+            with matrix_backend(PYTHON_BACKEND):
+                start = time.perf_counter()
+                parallel_product = matrix_multiplication(matrix, matrix, block_size, jobs)
+                parallel = time.perf_counter() - start
+            assert parallel_product == product, "the parallel result differs"
+            report += f", {jobs} jobs {parallel:9.3f} s ({blocked / parallel:.1f}x)"
+        if load_numpy_backend() is not None:
+            with matrix_backend(NUMPY_BACKEND):
+                start = time.perf_counter()
+                matrix_multiplication(matrix, matrix)
+                report += f", numpy {time.perf_counter() - start:9.4f} s"
+        print(report)
+        size *= 2
@@ -0,0 +1,47 @@
+"""
+Compares computing the angles between queries and corpus vectors pair by pair with angle_between_vectors
+with the batch API of hw1.similarity, which computes the norms of the corpus once, and times the top-k search.
+Usage: python -m benchmarks.bench_similarity [corpus size, 10000 by default] [queries, 20] [dimension, 64] [k, 10]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from hw1.matrices import PYTHON_BACKEND, Matrix, angle_between_vectors, matrix_backend
+from hw1.similarity import VectorCorpus, angles, iter_most_similar
+
+
+def random_rows(n_rows: int, n_cols: int, seed: int) -> List[List[float]]:
+    generator = random.Random(seed)
+    return [[generator.uniform(-1, 1) for _ in range(n_cols)] for _ in range(n_rows)]
+
+
+if __name__ == "__main__":
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    dimension = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    k = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    vectors = random_rows(corpus_size, dimension, seed=1)
+    queries = random_rows(n_queries, dimension, seed=2)
+    start = time.perf_counter()
+    with matrix_backend(PYTHON_BACKEND):
+        expected = Matrix.from_rows([[angle_between_vectors(query, vector) for vector in vectors] for query in queries])
+    pairwise = time.perf_counter() - start
+    start = time.perf_counter()
+    corpus = VectorCorpus(vectors)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = angles(queries, corpus)
+    batched = time.perf_counter() - start
+    assert batch == expected, "the angles differ"
+    start = time.perf_counter()
+    for _ in iter_most_similar(queries, corpus, k):
+        pass
+    top_k = time.perf_counter() - start
+    n_pairs = corpus_size * n_queries
+    print(
+        f"{n_pairs} pairs of {dimension} dimensions: pairwise {pairwise:.3f} s, corpus norms {indexed:.3f} s, "
+        f"batch {batched:.3f} s ({pairwise / batched:.1f}x), top {k} {top_k:.3f} s"
+    )
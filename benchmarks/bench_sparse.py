@@ -0,0 +1,44 @@
+"""
+Compares multiplying a sparse matrix by a dense one in the CSR format with the dense blocked multiplication,
+for square matrices of a given size and densities from 10% down to 0.1%.
+Usage: python -m benchmarks.bench_sparse [size, 512 by default]
+"""
+
+import random
+import sys
+import time
+
+from hw1.matrices import PYTHON_BACKEND, Matrix, matrix_backend, matrix_multiplication
+from hw1.sparse import CSRMatrix, sparse_dense_multiplication
+
+DENSITIES = [0.1, 0.01, 0.001]
+
+
+def random_sparse_matrix(size: int, density: float) -> Matrix:
+    generator = random.Random(size)
+    n_nonzeros = max(1, int(size * size * density))
+    matrix = Matrix(size, size)
+    for position in generator.sample(range(size * size), n_nonzeros):
+        matrix.data[position] = generator.uniform(-1, 1)
+    return matrix
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    generator = random.Random(0)
+    dense = Matrix.from_rows([[generator.uniform(-1, 1) for _ in range(size)] for _ in range(size)])
+    for density in DENSITIES:
+        matrix = random_sparse_matrix(size, density)
+        sparse = CSRMatrix.from_dense(matrix)
+        start = time.perf_counter()
+        sparse_product = sparse_dense_multiplication(sparse, dense)
+        sparse_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        with matrix_backend(PYTHON_BACKEND):
+            dense_product = matrix_multiplication(matrix, dense)
+        dense_elapsed = time.perf_counter() - start
+        assert sparse_product == dense_product, "the multiplications disagree"
+        print(
+            f"{size}x{size}, {density:6.1%} nonzeros ({sparse.n_nonzeros}): "
+            f"sparse {sparse_elapsed:8.3f} s, dense {dense_elapsed:8.3f} s"
+        )
@@ -0,0 +1,38 @@
+"""
+Measures the cold start of the command line interface: the time to run a command on a tiny file in a new
+interpreter, compared with starting the bare interpreter and with importing every module of hw1 eagerly.
+Usage: python -m benchmarks.bench_startup [runs, 50 by default]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+EAGER_IMPORTS = (
+    "import hw1.bashcommands, hw1.external_sort, hw1.follow, hw1.line_matching, hw1.wc_cache, tempfile, threading"
+)
+
+
+def measure(name: str, command: List[str], n_runs: int) -> None:
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"{name:>16}: best {times[0] * 1000:6.1f} ms, median {times[len(times) // 2] * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "input.txt")
+        with open(filepath, "wb") as f:
+            f.write(b"".join(b"line %d\n" % i for i in range(100)))
+        measure("bare interpreter", [sys.executable, "-c", "pass"], n_runs)
+        measure("eager imports", [sys.executable, "-c", EAGER_IMPORTS], n_runs)
+        for arguments in (["head", "-n", "5"], ["tail", "-n", "5"], ["wc"], ["nl"], ["grep", "-c", "line 4"]):
+            measure(arguments[0], [sys.executable, "-m", "hw1.bashcommands", *arguments, filepath], n_runs)
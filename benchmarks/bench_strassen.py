@@ -0,0 +1,43 @@
+"""
+Finds the crossover of strassen_multiplication on this machine: multiplies random square matrices with every
+crossover from the size of the matrices (no level of Strassen's algorithm) down to 16 and reports the time and
+the largest error relative to matrix_multiplication, in the units of STRASSEN_TOLERANCE, of every one of them.
+Usage: python -m benchmarks.bench_strassen [size, 512 by default]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from hw1.matrices import (
+    PYTHON_BACKEND,
+    STRASSEN_CROSSOVER,
+    matrix_backend,
+    matrix_multiplication,
+    strassen_multiplication,
+)
+
+
+def random_rows(size: int, seed: int) -> List[List[float]]:
+    generator = random.Random(seed)
+    return [[generator.uniform(-1, 1) for _ in range(size)] for _ in range(size)]
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    rows1, rows2 = random_rows(size, 1), random_rows(size, 2)
+    with matrix_backend(PYTHON_BACKEND):
+        start = time.perf_counter()
+        expected = matrix_multiplication(rows1, rows2)
+        print(f"matrix_multiplication: {time.perf_counter() - start:8.3f} s")
+        crossover, timings = size, []
+        while crossover >= 16:
+            start = time.perf_counter()
+            product = strassen_multiplication(rows1, rows2, crossover)
+            elapsed = time.perf_counter() - start
+            error = max(abs(x - y) for row1, row2 in zip(expected, product) for x, y in zip(row1, row2)) / size
+            print(f"crossover {crossover:5}: {elapsed:8.3f} s, largest error {error:.2g} * n")
+            timings.append((elapsed, crossover))
+            crossover //= 2
+    print(f"fastest crossover for {size}x{size}: {min(timings)[1]}, STRASSEN_CROSSOVER is {STRASSEN_CROSSOVER}")
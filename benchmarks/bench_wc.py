@@ -0,0 +1,62 @@
+"""
+Compares the chunked binary wc engine with the line-by-line text implementation it replaced.
+Usage: python -m benchmarks.bench_wc [size in MiB, 2048 by default]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Tuple
+
+from hw1.word_count import count_lines_words_bytes
+
+Counts = Tuple[int, int, int]
+
+
+def count_text_lines(filepath: str) -> Counts:
+    """
+    The implementation wc used before the chunked engine.
+    """
+    n_lines, n_words, n_bytes = 0, 0, 0
+    with open(filepath) as f:
+        for line in f:
+            n_lines += 1
+            n_words += len(line.split())
+            n_bytes += len(bytes(line, encoding="utf8"))
+    return n_lines, n_words, n_bytes
+
+
+def count_binary_chunks(filepath: str) -> Counts:
+    with open(filepath, "rb") as f:
+        return count_lines_words_bytes(f)
+
+
+def generate_file(filepath: str, size: int) -> None:
+    words = [b"lorem", b"ipsum", b"dolor", b"sit", b"amet", b"2021-03-01T12:00:00", b"INFO", b"request=42"]
+    generator = random.Random(42)
+    lines = [b" ".join(generator.choices(words, k=generator.randint(0, 16))) + b"\n" for _ in range(10_000)]
+    block = b"".join(lines)
+    with open(filepath, "wb") as f:
+        for _ in range(size // len(block) + 1):
+            f.write(block)
+
+
+def measure(name: str, count: Callable[[str], Counts], filepath: str) -> Counts:
+    start = time.perf_counter()
+    counts = count(filepath)
+    elapsed = time.perf_counter() - start
+    size_mib = os.path.getsize(filepath) / 2 ** 20
+    print(f"{name:>14}: {elapsed:8.2f} s, {size_mib / elapsed:8.1f} MiB/s, {counts}")
+    return counts
+
+
+if __name__ == "__main__":
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "input.txt")
+        generate_file(filepath, size_mib * 2 ** 20)
+        text_counts = measure("text lines", count_text_lines, filepath)
+        binary_counts = measure("binary chunks", count_binary_chunks, filepath)
+        assert text_counts == binary_counts, "the engines disagree"
@@ -1,15 +1,59 @@
+import io
+import os
+import sys
 from collections import deque
-from typing import Callable, TypeVar, Tuple
-from functools import wraps
+from contextlib import closing
+from itertools import groupby, islice
+from operator import methodcaller
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Tuple,
+    Union,
+)
+from functools import partial, wraps
+
+from hw1.output import BufferedOutput, exit_on_broken_pipe
+from hw1.readers import (
+    NEWLINE,
+    PREFETCH_FILES,
+    STDIN,
+    Bytes,
+    iter_lines,
+    iter_terminated_lines,
+    open_input,
+    plain_regular_file_stat,
+    prefetching,
+)
+from hw1.word_count import Counters, count_lines_words_bytes
+
+# the modules only some commands need are imported by those commands, so that starting any command stays fast
+if TYPE_CHECKING:
+    from threading import Event
+
+    from hw1.follow import FollowedFile
 
 T = TypeVar("T")
 R = TypeVar("R")
+M = TypeVar("M")
 
-ReceivedFunction = Callable[[T, int, int, R], R]
+ReceivedFunction = Callable[..., R]
+ReportFunction = Callable[..., None]
 ResultFunction = Callable[..., R]
 
 
-def for_each_argument(initial_value: R = None) -> Callable[[ReceivedFunction], ResultFunction]:
+def for_each_argument(initial_value: R = None, prefetch: int = 0) -> Callable[[ReceivedFunction], ResultFunction]:
     """
     This function must be called for a decorator to be returned!
     This returns a decorator which accepts a function that describes its behaviour for 1 target parameter of type T,
@@ -17,24 +61,26 @@ def for_each_argument(initial_value: R = None) -> Callable[[ReceivedFunction], R
     and for each calls the original function.
     The returned function is called the result function.
     :param initial_value: the initial value of the accumulator
+    :param prefetch: how many of the next target arguments, which have to be file paths then, are read ahead while
+    the current one is processed (see readers.prefetching), the result function accepts keyword-only prefetch too
     :return: the decorator that accepts the original function which receives 4 parameters: one of many
     target arguments of type T, current target argument index in the list of all target arguments provided
     to the result function, total number of target arguments provided to the result function,
-    accumulator of type R which is equal to the return value of the f function on the previous iteration
+    accumulator of type R which is equal to the return value of the f function on the previous iteration;
+    keyword arguments passed to the result function (like n=20) are forwarded to the original function as is,
     the result function which accepts any number of target arguments, which returns the value returned by f on
     the last iteration
     """
 
     # this trick is used to remain the return types clear
     def decorator(f: ReceivedFunction) -> ResultFunction:
-        accumulator = initial_value
-
         @wraps(f)
-        def f_for_many(*many_args):
-            nonlocal accumulator
+        def f_for_many(*many_args, prefetch: int = prefetch, **kwargs):
+            accumulator = initial_value
             n_args = len(many_args)
-            for arg_index, arg in enumerate(many_args):
-                accumulator = f(arg, arg_index, n_args, accumulator)
+            with prefetching(many_args, prefetch):
+                for arg_index, arg in enumerate(many_args):
+                    accumulator = f(arg, arg_index, n_args, accumulator, **kwargs)
             return accumulator
 
         return f_for_many
@@ -42,96 +88,542 @@ def for_each_argument(initial_value: R = None) -> Callable[[ReceivedFunction], R
     return decorator
 
 
-def print_line(line: str) -> None:
+def parallel_map(
+    function: Callable[[T], M], items: Iterable[T], jobs: int = 1, use_threads: bool = False
+) -> Iterator[M]:
     """
-    This is needed to fight special cases when lines end not with a newline character but with EOF or some weird
-    character. Supports only \n newlines for simplicity.
+    Lazily maps items in their order. If jobs > 1 the items are mapped on a pool of [jobs] processes (or threads),
+    at most 2 * jobs items are in flight, so results do not pile up in memory when they are consumed slowly.
+    :param function: the function to map with, must be picklable (defined at module level) for processes
     """
-    print(line if len(line) == 0 or line[-1] == "\n" else f"{line}\n", end="")
+    if jobs <= 1:
+        yield from map(function, items)
+        return
+    # imported here because the pools are only needed in the parallel mode
+    from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+    executor: Executor = ThreadPoolExecutor(jobs) if use_threads else ProcessPoolExecutor(jobs)
+    with executor:
+        in_flight: Deque[Future] = deque()
+        for item in items:
+            in_flight.append(executor.submit(function, item))
+            if len(in_flight) >= 2 * jobs:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def map_reduce_arguments(
+    map_argument: Callable[[T], M], combine: Callable[[R, M], R], initial_value: R, prefetch: int = 0
+) -> Callable[[ReportFunction], ResultFunction]:
+    """
+    The parallel counterpart of for_each_argument, this function must be called for a decorator to be returned too.
+    The work for 1 target argument is split into map_argument, which does the heavy part and may run on a pool,
+    and the decorated report function, which is always called in the main thread in the order of the arguments.
+    The result function accepts any number of target arguments and keyword-only jobs (1 by default, which means
+    serially) and use_threads (processes are used by default). Output ordering and totals do not depend on jobs.
+    Other keyword arguments passed to the result function are forwarded to map_argument as is.
+    :param map_argument: the picklable function that maps 1 target argument of type T to a value of type M
+    :param combine: the associative function that adds a mapped value to the accumulator
+    :param initial_value: the initial value of the accumulator
+    :param prefetch: how many of the next file paths are read ahead when the arguments are mapped serially,
+    the result function accepts keyword-only prefetch too
+    :return: the decorator that accepts the report function which receives 5 parameters: one of many target
+    arguments of type T, its index, total number of target arguments, its mapped value of type M and the accumulator
+    combined with the mapped values of all target arguments up to this one inclusive,
+    the result function returns the accumulator combined with the mapped values of all target arguments
+    """
+
+    def decorator(report: ReportFunction) -> ResultFunction:
+        @wraps(report)
+        def report_for_many(*many_args, jobs: int = 1, use_threads: bool = False, prefetch: int = prefetch, **kwargs):
+            accumulator = initial_value
+            n_args = len(many_args)
+            map_with_kwargs: Callable[[T], M] = map_argument
+            if kwargs:
+                map_with_kwargs = partial(map_argument, **kwargs)
+            # a pool already reads many files at once
+            with prefetching(many_args, prefetch if jobs <= 1 else 0):
+                mapped_values = parallel_map(map_with_kwargs, many_args, jobs, use_threads)
+                for arg_index, (arg, mapped_value) in enumerate(zip(many_args, mapped_values)):
+                    accumulator = combine(accumulator, mapped_value)
+                    report(arg, arg_index, n_args, mapped_value, accumulator)
+            return accumulator
 
+        return report_for_many
 
-def print_file_header_conditionally(filepath: str, n_files: int) -> None:
+    return decorator
+
+
+def print_file_header_conditionally(filepath: str, n_files: int, out: BufferedOutput) -> None:
     if n_files > 1:
-        print(f"==> {filepath} <==")
+        out.write(b"==> %s <==\n" % os.fsencode(filepath))
 
 
-@for_each_argument(initial_value=(0, 0, 0))
-def wc(
-    filepath: str, cur_filepath_index: int, n_filepaths: int, total_counters: Tuple[int, int, int]
-) -> Tuple[int, int, int]:
-    total_lines, total_words, total_bytes = total_counters
-    cur_lines, cur_words, cur_bytes = 0, 0, 0
+def print_no_such_file(filepath: str, out: BufferedOutput) -> None:
+    out.write(b"%s no such file\n" % os.fsencode(filepath))
+
+
+def count_file(filepath: str, cache_directory: Optional[str] = None) -> Optional[Counters]:
+    """
+    Counts lines, words and bytes of a file, the map step of wc.
+    :param cache_directory: where to cache the counts of regular files, so that unchanged files are not read again
+    and only the appended parts of grown files are read, nothing is cached if it is None
+    :return: (lines, words, bytes) or None if there is no such file
+    """
     try:
-        with open(filepath) as f:
-            for line in f:
-                cur_lines += 1
-                cur_words += len(line.split())
-                cur_bytes += len(bytes(line, encoding="utf8"))
-        total_lines += cur_lines
-        total_words += cur_words
-        total_bytes += cur_bytes
-        print(f"lines : {cur_lines}, words : {cur_words}, bytes : {cur_bytes} for {filepath}")
+        with open_input(filepath) as f:
+            file_stat = plain_regular_file_stat(f)
+            if file_stat is None:
+                return count_lines_words_bytes(f)
+            if cache_directory is None:
+                n_lines, n_words, _ = count_lines_words_bytes(f)
+            else:
+                from hw1.wc_cache import count_with_cache
+
+                n_lines, n_words, _ = count_with_cache(f, file_stat, cache_directory).counters
+            return n_lines, n_words, file_stat.st_size
     except FileNotFoundError:
-        print(filepath, "no such file")
+        return None
 
-    is_last_file = cur_filepath_index == n_filepaths - 1
-    if is_last_file:
-        print(f"lines : {total_lines}, words : {total_words}, bytes : {total_bytes} in total\n")
-    return total_lines, total_words, total_bytes
 
+def add_counters(total_counters: Counters, counters: Optional[Counters]) -> Counters:
+    if counters is None:
+        return total_counters
+    total_lines, total_words, total_bytes = total_counters
+    n_lines, n_words, n_bytes = counters
+    return total_lines + n_lines, total_words + n_words, total_bytes + n_bytes
 
-def is_blank(string: str) -> bool:
-    blank_chars = {"\n", "\r", "\r\n", "\t"}
-    return set(string) | blank_chars == blank_chars
 
+@map_reduce_arguments(count_file, add_counters, (0, 0, 0), prefetch=PREFETCH_FILES)
+def wc(
+    filepath: str,
+    cur_filepath_index: int,
+    n_filepaths: int,
+    counters: Optional[Counters],
+    total_counters: Counters,
+) -> None:
+    with BufferedOutput.for_stdout() as out:
+        if counters is None:
+            print_no_such_file(filepath, out)
+        else:
+            out.write(b"lines : %d, words : %d, bytes : %d for %s\n" % (*counters, os.fsencode(filepath)))
 
-@for_each_argument(initial_value=1)
-def nl(filepath: str, _, __, line_count: int) -> int:
-    cur_line_count = line_count
+        is_last_file = cur_filepath_index == n_filepaths - 1
+        if is_last_file:
+            out.write(b"lines : %d, words : %d, bytes : %d in total\n\n" % total_counters)
+
+
+BLANK_BYTES = b"\n\r\t"
+
+
+def is_blank(line: Bytes) -> bool:
+    # most lines start with a non-blank byte, so they do not have to be copied to be stripped
+    return len(line) == 0 or line[0] in BLANK_BYTES and not bytes(line).strip(BLANK_BYTES)
+
+
+def number_lines(filepath: str, first_number: int, out: BufferedOutput) -> int:
+    """
+    Prints the lines of a file numbering the non-blank ones starting with [first_number].
+    :return: the number the next non-blank line would get
+    """
+    cur_line_count = first_number
+    # the lines are formatted right into the output buffer, this is the hot loop of nl
+    buffer, flush_size = out.buffer, out.flush_size
     try:
-        with open(filepath) as f:
-            for line in f:
-                if is_blank(line):
-                    print()
+        with open_input(filepath) as f:
+            for line in iter_lines(f):
+                if line[0] in BLANK_BYTES and is_blank(line):
+                    buffer += b"\n"
                 else:
-                    print_line(f"{cur_line_count}\t{line}")
+                    buffer += b"%d\t" % cur_line_count
+                    buffer += line
+                    if line[-1] != NEWLINE:
+                        buffer += b"\n"
                     cur_line_count += 1
+                if len(buffer) >= flush_size:
+                    out.flush()
     except FileNotFoundError:
-        print(filepath, "no such file")
+        print_no_such_file(filepath, out)
 
     return cur_line_count
 
 
-@for_each_argument()
-def head(filepath: str, _, n_files: int, __) -> None:
-    print_file_header_conditionally(filepath, n_files)
+def count_numbered_lines(filepath: str) -> int:
+    """
+    Counts the lines of a file that nl would number, the first parallel pass of nl.
+    """
     try:
-        with open(filepath) as f:
-            for line_num, line in enumerate(f):
-                if line_num >= 10:
-                    break
-                print_line(line)
-                line_num += 1
+        with open_input(filepath) as f:
+            # a line is blank if nothing is left after stripping the blank characters, counted without a python loop
+            return sum(map(bool, map(methodcaller("strip", BLANK_BYTES), f)))
     except FileNotFoundError:
-        print(filepath, "no such file")
+        return 0
+
+
+def render_numbered_lines(filepath_and_first_number: Tuple[str, int]) -> bytes:
+    """
+    Renders what number_lines would print, the second parallel pass of nl.
+    """
+    rendered = io.BytesIO()
+    with BufferedOutput(rendered) as out:
+        number_lines(*filepath_and_first_number, out)
+    return rendered.getvalue()
+
+
+@for_each_argument(initial_value=1, prefetch=PREFETCH_FILES)
+def number_files_serially(filepath: str, _, __, line_count: int) -> int:
+    with BufferedOutput.for_stdout() as out:
+        return number_lines(filepath, line_count, out)
+
+
+def nl(*filepaths: str, jobs: int = 1, use_threads: bool = False, prefetch: int = PREFETCH_FILES) -> int:
+    """
+    Prints the files numbering their non-blank lines continuously across all files.
+    If jobs > 1 the files are processed on a pool of processes (or threads) in two passes: the numbered lines of every
+    file are counted, the prefix sums of the counts give the first number of every file, then every file is rendered
+    independently. A rendered file is buffered in memory until all files before it are printed.
+    Stdin can only be read once, so if it is among the files they are numbered serially.
+    :param prefetch: how many of the next files are read ahead when the files are numbered serially
+    :return: the number the next non-blank line would get
+    """
+    if jobs <= 1 or STDIN in filepaths:
+        return number_files_serially(*filepaths, prefetch=prefetch)
+    counts = parallel_map(count_numbered_lines, filepaths, jobs, use_threads)
+    first_numbers = [1]
+    for count in counts:
+        first_numbers.append(first_numbers[-1] + count)
+    with BufferedOutput.for_stdout() as out:
+        for rendered in parallel_map(render_numbered_lines, zip(filepaths, first_numbers), jobs, use_threads):
+            out.write(rendered)
+    return first_numbers[-1]
+
+
+@for_each_argument(prefetch=PREFETCH_FILES)
+def head(filepath: str, _, n_files: int, __, n: int = 10) -> None:
+    """
+    Prints the first [n] lines of the file.
+    """
+    with BufferedOutput.for_stdout() as out:
+        print_file_header_conditionally(filepath, n_files, out)
+        try:
+            with open_input(filepath) as f, closing(iter_lines(f)) as lines:
+                for line in islice(lines, max(n, 0)):
+                    out.write_line(line)
+        except FileNotFoundError:
+            print_no_such_file(filepath, out)
 
 
-@for_each_argument()
-def tail(filepath: str, _, n_files: int, __) -> None:
-    print_file_header_conditionally(filepath, n_files)
-    queue: deque = deque(maxlen=10)
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def read_last_lines(f: BinaryIO, n_lines: int, block_size: int = TAIL_BLOCK_SIZE) -> bytes:
+    """
+    Reads the last [n_lines] lines of a seekable binary file. Seeks to the end of the file and reads fixed-size blocks
+    backwards until enough newlines are found, so the cost depends on the size of the tail, not of the file.
+    A trailing newline terminates the last line and does not start a new one.
+    :return: the bytes of the last [n_lines] lines
+    """
+    if n_lines <= 0:
+        return b""
+    position = f.seek(0, os.SEEK_END)
+    blocks: List[bytes] = []
+    n_newlines = 0
+    # one newline more than n_lines is needed to find where the first of the last lines starts
+    while position > 0 and n_newlines <= n_lines:
+        block_start = max(0, position - block_size)
+        f.seek(block_start)
+        block = f.read(position - block_start)
+        blocks.append(block)
+        n_newlines += block.count(b"\n")
+        position = block_start
+    data = b"".join(reversed(blocks))
+    line_start = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(n_lines):
+        line_start = data.rfind(b"\n", 0, line_start)
+        if line_start == -1:
+            return data
+    return data[line_start + 1 :]
+
+
+@for_each_argument(initial_value=())
+def tail(
+    filepath: str,
+    cur_filepath_index: int,
+    n_files: int,
+    followed: Tuple["FollowedFile", ...],
+    n: int = 10,
+    follow: bool = False,
+    stop: Optional["Event"] = None,
+) -> Tuple["FollowedFile", ...]:
+    """
+    Prints the last [n] lines of the file. If [follow] then after the last file the regular files that are not
+    compressed are followed:
+    the data appended to them is printed as it arrives until [stop] is set (forever if it is None).
+    :return: the files to be followed
+    """
+    with BufferedOutput.for_stdout() as out:
+        print_file_header_conditionally(filepath, n_files, out)
+        try:
+            with open_input(filepath) as f:
+                if plain_regular_file_stat(f) is not None:
+                    end = f.seek(0, os.SEEK_END)
+                    last_lines = read_last_lines(f, n)
+                    if follow and filepath != STDIN:
+                        from hw1.follow import FollowedFile
+
+                        # read_last_lines leaves the file where its last block starts, the data written after
+                        # the end it saw is the data to follow
+                        f.seek(end)
+                        followed = (*followed, FollowedFile(filepath, f))
+                else:
+                    # pipes, special files and compressed files cannot be read backwards,
+                    # so they are streamed through a bounded queue
+                    last_lines = b"".join(deque(f, maxlen=max(n, 0)))
+            out.write_line(last_lines)
+        except FileNotFoundError:
+            print_no_such_file(filepath, out)
+
+    is_last_file = cur_filepath_index == n_files - 1
+    if follow and is_last_file:
+        from hw1.follow import follow_files
+
+        follow_files(followed, sys.stdout.buffer, show_headers=n_files > 1, last_printed_path=filepath, stop=stop)
+    return followed
+
+
+@for_each_argument(initial_value=False, prefetch=PREFETCH_FILES)
+def grep(
+    filepath: str,
+    _,
+    n_files: int,
+    has_matched: bool,
+    *,
+    pattern: Union[str, bytes],
+    count: bool = False,
+    files_with_matches: bool = False,
+    line_number: bool = False,
+    fixed_strings: bool = False,
+) -> bool:
+    """
+    Prints the lines of the file that contain a match of [pattern], prefixed with the path if there are many files.
+    The pattern is searched for in large blocks of lines at once (in the memory mapping of large regular files),
+    so the lines without matches are never split and looked at one by one.
+    :param pattern: a regular expression, ^ and $ match at the start and the end of a line
+    :param count: print only the number of matching lines (-c)
+    :param files_with_matches: print only the path if the file has a match, reading stops at the first match (-l)
+    :param line_number: prefix the lines with their numbers (-n)
+    :param fixed_strings: the pattern is a literal string, it is searched for with bytes.find (-F)
+    :return: whether a line of any file so far has matched, like the exit status of grep
+    """
+    from hw1.line_matching import iter_matching_lines, line_matcher
+
+    matcher = line_matcher(pattern, fixed_strings)
+    path_prefix = b"%s:" % os.fsencode(filepath) if n_files > 1 else b""
+    n_matching_lines = 0
+    with BufferedOutput.for_stdout() as out:
+        try:
+            with open_input(filepath) as f, closing(iter_matching_lines(f, matcher, line_number)) as matching_lines:
+                if files_with_matches:
+                    n_matching_lines = int(next(matching_lines, None) is not None)
+                elif count:
+                    n_matching_lines = sum(1 for _ in matching_lines)
+                else:
+                    for number, buffer, line_start, line_end in matching_lines:
+                        n_matching_lines += 1
+                        out.write(path_prefix)
+                        if line_number:
+                            out.write(b"%d:" % number)
+                        out.write(buffer[line_start:line_end])
+                        out.write(b"\n")
+        except FileNotFoundError:
+            print_no_such_file(filepath, out)
+            return has_matched
+        if files_with_matches and n_matching_lines:
+            out.write(b"%s\n" % os.fsencode(filepath))
+        elif count:
+            out.write(b"%s%d\n" % (path_prefix, n_matching_lines))
+    return has_matched or n_matching_lines > 0
+
+
+def open_existing_inputs(filepaths: Iterable[str], out: BufferedOutput) -> Iterator[BinaryIO]:
+    """
+    Opens the files one after another, each one is closed when the next one is requested.
+    """
+    for filepath in filepaths:
+        try:
+            with open_input(filepath) as f:
+                yield f
+        except FileNotFoundError:
+            print_no_such_file(filepath, out)
+
+
+def write_lines(lines: Iterable[bytes], out: BufferedOutput) -> None:
+    buffer, flush_size = out.buffer, out.flush_size
+    for line in lines:
+        buffer += line
+        if len(buffer) >= flush_size:
+            out.flush()
+
+
+def sort(
+    *filepaths: str,
+    run_size: Optional[int] = None,
+    jobs: int = 1,
+    use_threads: bool = False,
+    temp_directory: Optional[str] = None,
+) -> None:
+    """
+    Prints the lines of all the files sorted together by their bytes (like LC_ALL=C sort), in bounded memory:
+    runs of about [run_size] bytes of lines are sorted and spilled into temporary files, which are then merged
+    with heapq.merge. Input that fits into one run is sorted in memory without temporary files.
+    The runs are sorted on a pool of [jobs] processes (or threads), so about (2 * jobs + 1) * run_size bytes of lines
+    are held in memory at most.
+    :param run_size: SORT_RUN_SIZE if it is None
+    :param temp_directory: where to spill the runs, the default temporary directory if it is None
+    """
+    import tempfile
+
+    from hw1.external_sort import SORT_RUN_SIZE, iter_runs, merge_runs, spill_sorted_run
+
+    if run_size is None:
+        run_size = SORT_RUN_SIZE
+    with BufferedOutput.for_stdout() as out:
+        runs = iter_runs(open_existing_inputs(filepaths, out), run_size)
+        first_run: List[bytes] = next(runs, [])
+        if sum(map(len, first_run)) < run_size:
+            first_run.sort()
+            write_lines(first_run, out)
+            return
+        with tempfile.TemporaryDirectory(prefix="sort-", dir=temp_directory) as directory:
+            first_path = spill_sorted_run(first_run, directory)
+            del first_run
+            spill = partial(spill_sorted_run, directory=directory)
+            paths = [first_path, *parallel_map(spill, runs, jobs, use_threads)]
+            write_lines(merge_runs(paths, directory), out)
+
+
+@for_each_argument(prefetch=PREFETCH_FILES)
+def uniq(filepath: str, _, n_files: int, __, count: bool = False) -> None:
+    """
+    Prints the lines of the file collapsing every run of equal adjacent lines into one, in constant memory.
+    Equal lines that are not adjacent are not collapsed, sort the lines first for that.
+    :param count: prefix the lines with the number of times they occur in a row (-c)
+    """
+    with BufferedOutput.for_stdout() as out:
+        print_file_header_conditionally(filepath, n_files, out)
+        try:
+            with open_input(filepath) as f, closing(iter_terminated_lines(f)) as lines:
+                for line, equal_lines in groupby(lines):
+                    if count:
+                        out.write(b"%7d " % sum(1 for _ in equal_lines))
+                    out.write(line)
+        except FileNotFoundError:
+            print_no_such_file(filepath, out)
+
+
+class Command(NamedTuple):
+    function: Callable[..., Any]
+    # option -> (the keyword argument it sets, the type of its value or None if it is a switch)
+    options: Dict[str, Tuple[str, Optional[Callable[[str], Any]]]]
+    usage: str
+    # whether the first operand is a pattern, the exit status then tells whether anything has matched, like grep's
+    takes_pattern: bool = False
+
+
+COMMANDS = {
+    "wc": Command(wc, {"-j": ("jobs", int), "-C": ("cache_directory", str)}, "[-j JOBS] [-C CACHE_DIR]"),
+    "nl": Command(nl, {"-j": ("jobs", int)}, "[-j JOBS]"),
+    "head": Command(head, {"-n": ("n", int)}, "[-n LINES]"),
+    "tail": Command(tail, {"-n": ("n", int), "-f": ("follow", None)}, "[-n LINES] [-f]"),
+    "grep": Command(
+        grep,
+        {
+            "-c": ("count", None),
+            "-l": ("files_with_matches", None),
+            "-n": ("line_number", None),
+            "-F": ("fixed_strings", None),
+        },
+        "[-clnF] PATTERN",
+        takes_pattern=True,
+    ),
+    "sort": Command(
+        sort,
+        {"-S": ("run_size", int), "-j": ("jobs", int), "-T": ("temp_directory", str)},
+        "[-S RUN_SIZE] [-j JOBS] [-T DIR]",
+    ),
+    "uniq": Command(uniq, {"-c": ("count", None)}, "[-c]"),
+}
+
+USAGE = "usage: python -m hw1.bashcommands COMMAND [OPTION]... [FILE]...\n" + "".join(
+    f"  {name} {command.usage} [FILE]...\n" for name, command in COMMANDS.items()
+)
+
+
+def parse_arguments(
+    options: Dict[str, Tuple[str, Optional[Callable[[str], Any]]]], arguments: Iterable[str]
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    A minimal getopt, argparse is not used because importing it costs more than running a command on a small file.
+    Options and operands may be mixed, switches may be grouped (-cn), the value of an option follows it right away
+    or as the next argument (-n5 or -n 5), -- ends the options and - is an operand (stdin).
+    :return: the operands and the keyword arguments set by the options
+    :raise ValueError: if an option is unknown or its value is missing or malformed
+    """
+    operands: List[str] = []
+    kwargs: Dict[str, Any] = {}
+    remaining = iter(arguments)
+    for argument in remaining:
+        if argument == "--":
+            operands.extend(remaining)
+            break
+        if not argument.startswith("-") or argument == STDIN:
+            operands.append(argument)
+            continue
+        for i in range(1, len(argument)):
+            option = "-" + argument[i]
+            if option not in options:
+                raise ValueError(f"unknown option {option}")
+            name, value_type = options[option]
+            if value_type is None:
+                kwargs[name] = True
+                continue
+            value: Optional[str] = argument[i + 1 :]
+            if not value:
+                # the value is the next argument, as in -n 5
+                value = next(remaining, None)
+                if value is None:
+                    raise ValueError(f"option {option} needs a value")
+            kwargs[name] = value_type(value)
+            break
+    return operands, kwargs
+
+
+def main(arguments: Sequence[str]) -> int:
+    """
+    Runs a command from the command line: COMMAND [OPTION]... [FILE]..., stdin is read if no file is given.
+    :return: the exit status
+    """
+    if len(arguments) == 0 or arguments[0] not in COMMANDS:
+        sys.stderr.write(USAGE)
+        return 2
+    name, command = arguments[0], COMMANDS[arguments[0]]
     try:
-        with open(filepath) as f:
-            for line in f:
-                queue.append(line)
-    except FileNotFoundError:
-        print(filepath, "no such file")
-    for line in queue:
-        print_line(line)
+        operands, kwargs = parse_arguments(command.options, arguments[1:])
+        if command.takes_pattern:
+            if len(operands) == 0:
+                raise ValueError("a pattern is needed")
+            kwargs["pattern"] = os.fsencode(operands.pop(0))
+    except ValueError as e:
+        sys.stderr.write(f"{name}: {e}\nusage: python -m hw1.bashcommands {name} {command.usage} [FILE]...\n")
+        return 2
+    try:
+        with exit_on_broken_pipe():
+            result = command.function(*(operands or [STDIN]), **kwargs)
+    except KeyboardInterrupt:
+        return 130
+    return (0 if result else 1) if command.takes_pattern else 0
 
 
 if __name__ == "__main__":
-    wc("bashcommands.py", "test.txt")
-    nl("bashcommands.py", "test.txt")
-    head("bashcommands.py", "test.txt")
-    tail("bashcommands.py", "test.txt")
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,68 @@
+import heapq
+import os
+import tempfile
+from contextlib import ExitStack
+from functools import partial
+from typing import BinaryIO, Iterable, Iterator, List
+
+# how many bytes of lines are sorted in memory at once
+SORT_RUN_SIZE = 64 * 1024 * 1024
+# how many runs are merged at once, more runs are merged in several passes so that few files are open at a time
+MERGE_FAN_IN = 64
+MERGE_BUFFER_SIZE = 256 * 1024
+
+
+def iter_runs(files: Iterable[BinaryIO], run_size: int = SORT_RUN_SIZE) -> Iterator[List[bytes]]:
+    """
+    Yields the lines of the files as runs of about [run_size] bytes of lines (a run may hold lines of several files).
+    Lines are read in batches by readlines, the last line of a file gets a newline if it has none.
+    """
+    run: List[bytes] = []
+    n_run_bytes = 0
+    for f in files:
+        for lines in iter(partial(f.readlines, run_size - n_run_bytes), []):
+            if not lines[-1].endswith(b"\n"):
+                lines[-1] += b"\n"
+            run += lines
+            n_run_bytes += sum(map(len, lines))
+            if n_run_bytes >= run_size:
+                yield run
+                run, n_run_bytes = [], 0
+    if run:
+        yield run
+
+
+def spill_sorted_run(run: List[bytes], directory: str) -> str:
+    """
+    Sorts a run and writes it into a new temporary file, this is the step that may run in worker processes.
+    :return: the path of the file
+    """
+    run.sort()
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with open(fd, "wb") as f:
+        f.writelines(run)
+    return path
+
+
+def merge_into_file(paths: List[str], directory: str) -> str:
+    """
+    Merges sorted run files into a new one and removes them.
+    """
+    fd, merged_path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with open(fd, "wb", buffering=MERGE_BUFFER_SIZE) as merged:
+        merged.writelines(merge_runs(paths, directory))
+    for path in paths:
+        os.remove(path)
+    return merged_path
+
+
+def merge_runs(paths: List[str], directory: str, fan_in: int = MERGE_FAN_IN) -> Iterator[bytes]:
+    """
+    Lazily merges sorted run files into sorted lines with heapq.merge, reading each of them sequentially.
+    If there are more than [fan_in] runs, they are first merged into fewer runs in [directory].
+    """
+    while len(paths) > fan_in:
+        paths = [merge_into_file(paths[i : i + fan_in], directory) for i in range(0, len(paths), fan_in)]
+    with ExitStack() as stack:
+        runs = [stack.enter_context(open(path, "rb", buffering=MERGE_BUFFER_SIZE)) for path in paths]
+        yield from heapq.merge(*runs)
@@ -0,0 +1,191 @@
+import os
+import select
+import sys
+import time
+from functools import partial
+from threading import Event
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, Tuple
+
+FileIdentity = Tuple[int, int]
+
+FOLLOW_READ_SIZE = 1024 * 1024
+MIN_POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 1.0
+
+# inotify events of a watched directory that may mean one of its files was appended to, truncated or replaced
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+DIRECTORY_EVENTS = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def file_identity(file_stat: os.stat_result) -> FileIdentity:
+    return file_stat.st_dev, file_stat.st_ino
+
+
+def warn(message: str) -> None:
+    print(f"tail: {message}", file=sys.stderr)
+
+
+class FollowedFile:
+    """
+    A regular file followed by its name, like tail -F does. The data appended to it is read as it arrives,
+    if it is truncated it is read from the start again, if its name is given to another file (the file is rotated)
+    the rest of the old file is read and the new one is followed from its start.
+    """
+
+    def __init__(self, path: str, file: BinaryIO):
+        """
+        :param file: the file opened by the path, it is followed from its current position
+        """
+        self.path = path
+        self.position = file.tell()
+        self.file: Optional[BinaryIO] = open(os.dup(file.fileno()), "rb", buffering=0)
+        self.file.seek(self.position)
+        self.identity = file_identity(os.fstat(self.file.fileno()))
+
+    def reopen(self) -> bool:
+        """
+        Opens the file the path currently points to, it is read from the start if it is not the one
+        the position belongs to.
+        :return: False if there is no such file at the moment
+        """
+        try:
+            self.file = open(self.path, "rb", buffering=0)
+        except FileNotFoundError:
+            return False
+        identity = file_identity(os.fstat(self.file.fileno()))
+        if identity != self.identity:
+            self.identity, self.position = identity, 0
+        self.file.seek(self.position)
+        return True
+
+    def read_to_end(self) -> Iterator[bytes]:
+        assert self.file is not None
+        for data in iter(partial(self.file.read, FOLLOW_READ_SIZE), b""):
+            self.position += len(data)
+            yield data
+
+    def poll(self) -> Iterator[bytes]:
+        """
+        Yields the data appended since the last poll.
+        """
+        if self.file is None and not self.reopen():
+            return
+        assert self.file is not None
+        if os.fstat(self.file.fileno()).st_size < self.position:
+            warn(f"{self.path}: file truncated")
+            self.file.seek(0)
+            self.position = 0
+        yield from self.read_to_end()
+        try:
+            path_identity = file_identity(os.stat(self.path))
+        except FileNotFoundError:
+            # the file was moved away and nothing has taken its place yet, the old file is still followed
+            return
+        if path_identity != self.identity:
+            warn(f"'{self.path}' has been replaced; following new file")
+            self.close()
+            if self.reopen():
+                yield from self.read_to_end()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Inotify:
+    """
+    A minimal ctypes binding of Linux inotify, used to sleep until something happens in the watched directories.
+    """
+
+    def __init__(self, directories: Iterable[str]):
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), DIRECTORY_EVENTS) < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+
+    def wait(self, timeout: float) -> None:
+        """
+        Waits until an event happens or [timeout] seconds pass, the pending events are discarded.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 64 * 1024):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_inotify(directories: Iterable[str]) -> Optional[Inotify]:
+    """
+    :return: an inotify watching the directories or None if inotify is not available
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return Inotify(directories)
+    except (OSError, AttributeError):
+        return None
+
+
+def follow_files(
+    followed: Sequence[FollowedFile],
+    out: BinaryIO,
+    show_headers: bool,
+    last_printed_path: Optional[str] = None,
+    stop: Optional[Event] = None,
+    max_interval: float = MAX_POLL_INTERVAL,
+) -> None:
+    """
+    Prints the data appended to the files until [stop] is set, forever if it is None.
+    Sleeps until the directories of the files change if inotify is available, [max_interval] is then only a safety
+    net for filesystems that do not report changes. Otherwise polls the files, the interval grows from
+    MIN_POLL_INTERVAL up to [max_interval] while the files stay idle and drops back as soon as data arrives.
+    :param show_headers: whether to print ==> path <== whenever the output switches to another file
+    :param last_printed_path: the path of the file printed last before following
+    """
+    if len(followed) == 0:
+        return
+    inotify = open_inotify({os.path.dirname(os.path.abspath(f.path)) for f in followed})
+    interval = MIN_POLL_INTERVAL
+    try:
+        while stop is None or not stop.is_set():
+            has_printed = False
+            for followed_file in followed:
+                for data in followed_file.poll():
+                    if show_headers and followed_file.path != last_printed_path:
+                        out.write(f"==> {followed_file.path} <==\n".encode("utf8"))
+                    last_printed_path = followed_file.path
+                    out.write(data)
+                    has_printed = True
+            if has_printed:
+                out.flush()
+            if inotify is not None:
+                inotify.wait(max_interval)
+                continue
+            interval = MIN_POLL_INTERVAL if has_printed else min(2 * interval, max_interval)
+            if stop is None:
+                time.sleep(interval)
+            else:
+                stop.wait(interval)
+    finally:
+        if inotify is not None:
+            inotify.close()
+        for followed_file in followed:
+            followed_file.close()
@@ -0,0 +1,92 @@
+import re
+from functools import lru_cache
+from typing import BinaryIO, Generator, Iterator, Optional, Pattern, Tuple, Union
+
+from hw1.readers import Buffer, iter_line_blocks
+
+LINE_BLOCK_SIZE = 4 * 1024 * 1024
+
+# (line number or 0 if line numbers are not counted, buffer, line start, line end), the line is buffer[start:end]
+MatchingLine = Tuple[int, Buffer, int, int]
+
+
+def count_newlines(buffer: Buffer, start: int, end: int) -> int:
+    if isinstance(buffer, bytes):
+        return buffer.count(b"\n", start, end)
+    # memory mappings cannot count
+    return buffer[start:end].count(b"\n")
+
+
+class LineMatcher:
+    """
+    Finds the lines that contain a match of a pattern in blocks of whole lines.
+    The pattern is searched for in the whole block at once and line boundaries are only looked for around the matches,
+    so lines without matches are skipped without running any python code for them.
+    """
+
+    def __init__(self, pattern: bytes, fixed_strings: bool = False):
+        """
+        :param pattern: a regular expression (^ and $ match at line boundaries) or a literal string
+        :param fixed_strings: whether the pattern is a literal string, it is then searched for with bytes.find
+        """
+        self.pattern = pattern
+        self.regex: Optional[Pattern[bytes]] = None if fixed_strings else re.compile(pattern, re.MULTILINE)
+        # a line cannot contain a newline
+        self.never_matches = fixed_strings and b"\n" in pattern
+
+    def search(self, buffer: Buffer, start: int, end: int) -> Tuple[int, int]:
+        """
+        :return: (start, end) of the first match in buffer[start:end] or (-1, -1) if there is none
+        """
+        if self.regex is None:
+            match_start = buffer.find(self.pattern, start, end)
+            return match_start, match_start + len(self.pattern)
+        match = self.regex.search(buffer, start, end)  # type: ignore
+        return (match.start(), match.end()) if match is not None else (-1, -1)
+
+    def matching_lines(self, buffer: Buffer, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (start, end) of every line of buffer[start:end] that contains a match, without the newline.
+        """
+        if self.never_matches:
+            return
+        position = start
+        while position < end:
+            match_start, match_end = self.search(buffer, position, end)
+            if match_start < 0:
+                return
+            if match_start == end and buffer[end - 1 : end] == b"\n":
+                # an empty match after the last newline of the block, there is no line there
+                return
+            line_start = buffer.rfind(b"\n", position, match_start) + 1 or position
+            line_end = buffer.find(b"\n", match_start, end)
+            if line_end < 0:
+                line_end = end
+            # a regular expression may match across a newline, then the line may still contain another match
+            if match_end <= line_end or self.search(buffer, line_start, line_end)[0] >= 0:
+                yield line_start, line_end
+            position = line_end + 1
+
+
+@lru_cache(maxsize=16)
+def line_matcher(pattern: Union[str, bytes], fixed_strings: bool = False) -> LineMatcher:
+    return LineMatcher(pattern.encode("utf8") if isinstance(pattern, str) else pattern, fixed_strings)
+
+
+def iter_matching_lines(
+    f: BinaryIO, matcher: LineMatcher, with_line_numbers: bool = False, block_size: int = LINE_BLOCK_SIZE
+) -> Generator[MatchingLine, None, None]:
+    """
+    Yields the lines of a binary file that contain a match. Large regular files are searched through a memory mapping.
+    :param with_line_numbers: whether to count line numbers, this costs counting newlines between the matches
+    """
+    n_lines_before = 0
+    for buffer, start, end in iter_line_blocks(f, block_size):
+        counted_to = start
+        for line_start, line_end in matcher.matching_lines(buffer, start, end):
+            if with_line_numbers:
+                n_lines_before += count_newlines(buffer, counted_to, line_start)
+                counted_to = line_start
+            yield n_lines_before + 1 if with_line_numbers else 0, buffer, line_start, line_end
+        if with_line_numbers:
+            n_lines_before += count_newlines(buffer, counted_to, end)
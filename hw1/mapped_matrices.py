@@ -0,0 +1,256 @@
+"""
+Matrices stored in files and processed through memory mappings, for matrices that do not fit in memory.
+A matrix file is a header of 32 bytes (HEADER: the magic bytes, the type of the elements and the shape)
+followed by the elements row by row as native doubles.
+The functions process the files in row bands or tiles sized so that at most a memory budget of them is resident
+at a time, and release the pages of every band or tile once it is processed. On top of the budget the kernel may map
+the clean page cache around the pages that are accessed (a few large folios per file on recent Linux), which it
+reclaims whenever memory is needed.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from math import isqrt
+from operator import add, mul
+from typing import Iterator, List, Optional, Tuple, cast
+
+from hw1.matrices import Matrix, MatrixLike, check_and_matrix_shape
+
+HEADER = struct.Struct("<8s8sQQ")
+MAGIC = b"HW1MATRX"
+DTYPE = b"<f8" if sys.byteorder == "little" else b">f8"
+DOUBLE_SIZE = 8
+# python floats in lists take a pointer and a float object each
+LIST_ELEMENT_SIZE = 32
+
+# how much memory the functions of this module may keep resident by default
+MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+class MappedMatrix:
+    """
+    A matrix file opened through a memory mapping. Its elements are accessed as a flat memoryview of doubles row by
+    row with elements(), which is only valid inside the with block.
+    """
+
+    __slots__ = ("path", "n_rows", "n_cols", "file", "mapping")
+
+    def __init__(self, path: str, writable: bool = False):
+        """
+        :raise ValueError: if the file is not a matrix file of doubles of the native byte order
+        """
+        self.path = path
+        self.file = open(path, "r+b" if writable else "rb")
+        try:
+            magic, dtype, self.n_rows, self.n_cols = HEADER.unpack(self.file.read(HEADER.size).ljust(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a matrix file")
+            if dtype.rstrip(b"\0") != DTYPE:
+                raise ValueError(
+                    f"{path} holds elements of type {dtype.rstrip(bytes(1)).decode()}, not {DTYPE.decode()}"
+                )
+            size = HEADER.size + self.n_rows * self.n_cols * DOUBLE_SIZE
+            self.file.seek(0, 2)
+            if self.file.tell() != size:
+                raise ValueError(f"{path} is not of the size of a matrix of shape {self.n_rows}x{self.n_cols}")
+            self.mapping = mmap.mmap(
+                self.file.fileno(), size, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+        except BaseException:
+            self.file.close()
+            raise
+
+    @staticmethod
+    def create(path: str, n_rows: int, n_cols: int) -> "MappedMatrix":
+        """
+        Creates (or overwrites) a matrix file of zeros, the file is sparse where the file system supports it.
+        """
+        if n_rows <= 0 or n_cols <= 0:
+            raise IndexError("Matrix cannot be empty or contain empty rows and must be of rectangular shape")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, DTYPE, n_rows, n_cols))
+            f.truncate(HEADER.size + n_rows * n_cols * DOUBLE_SIZE)
+        return MappedMatrix(path, writable=True)
+
+    @staticmethod
+    def from_matrix(path: str, matrix: MatrixLike) -> "MappedMatrix":
+        n_rows, n_cols = check_and_matrix_shape(matrix)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, DTYPE, n_rows, n_cols))
+            for i in range(n_rows):
+                f.write(array("d", matrix[i]).tobytes())
+        return MappedMatrix(path, writable=True)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    @contextmanager
+    def elements(self) -> Iterator[memoryview]:
+        """
+        Yields the elements of the matrix row by row as a writable (if the matrix is) memoryview of doubles.
+        """
+        with memoryview(self.mapping) as raw, raw[HEADER.size :] as data, data.cast("d") as view:
+            yield cast(memoryview, view)
+
+    def release(self, start: int, end: int) -> None:
+        """
+        Drops the pages holding the elements start:end (and the rest of their pages) from the resident memory
+        of the process, written elements are kept by the page cache and the file. Does nothing where madvise
+        is not available.
+        """
+        if not hasattr(self.mapping, "madvise") or start >= end:
+            return
+        first = (HEADER.size + start * DOUBLE_SIZE) // mmap.PAGESIZE * mmap.PAGESIZE
+        last = min(HEADER.size + end * DOUBLE_SIZE, len(self.mapping))
+        self.mapping.madvise(mmap.MADV_DONTNEED, first, last - first)
+
+    def to_matrix(self) -> Matrix:
+        data = array("d")
+        with memoryview(self.mapping) as raw, raw[HEADER.size :] as data_bytes:
+            data.frombytes(data_bytes)
+        return Matrix(self.n_rows, self.n_cols, data)
+
+    def flush(self) -> None:
+        self.mapping.flush()
+
+    def close(self) -> None:
+        self.mapping.close()
+        self.file.close()
+
+    def __enter__(self) -> "MappedMatrix":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"MappedMatrix({self.path!r}) of shape {self.n_rows}x{self.n_cols}"
+
+
+def rows_per_band(n_cols: int, n_buffers: int, memory_budget: Optional[int], element_size: int = DOUBLE_SIZE) -> int:
+    """
+    :return: the number of rows of [n_cols] elements of [element_size] bytes of which [n_buffers] bands (mapped
+    or copied) fit in the budget, at least 1
+    """
+    budget = memory_budget if memory_budget is not None else MEMORY_BUDGET
+    return max(1, budget // (n_buffers * (n_cols * element_size + mmap.PAGESIZE)))
+
+
+def tile_size(element_size: int, n_tiles: int, memory_budget: Optional[int]) -> int:
+    """
+    :return: the size t of square tiles of which [n_tiles] of elements of [element_size] bytes fit in the budget
+    together with the pages their rows touch in the mapped files (up to t * 2 pages per tile), at least 1
+    """
+    budget = memory_budget if memory_budget is not None else MEMORY_BUDGET
+    # n_tiles * (element_size * t * t + 2 * PAGESIZE * t) <= budget
+    a, b = n_tiles * element_size, 2 * n_tiles * mmap.PAGESIZE
+    return max(1, (isqrt(b * b + 4 * a * budget) - b) // (2 * a))
+
+
+def mapped_matrix_sum(
+    matrix1: MappedMatrix, matrix2: MappedMatrix, path: str, memory_budget: Optional[int] = None
+) -> MappedMatrix:
+    """
+    Adds matrix files band of rows by band of rows into a new matrix file at [path].
+    """
+    if matrix1.shape != matrix2.shape:
+        raise IndexError("Matrix sum is only defined for matrices of the same shape")
+    n_rows, n_cols = matrix1.shape
+    result = MappedMatrix.create(path, n_rows, n_cols)
+    # both operands, the sum and its copy in the result
+    band = rows_per_band(n_cols, 4, memory_budget)
+    with matrix1.elements() as view1, matrix2.elements() as view2, result.elements() as result_view:
+        for i0 in range(0, n_rows, band):
+            start, end = i0 * n_cols, min(i0 + band, n_rows) * n_cols
+            # the view is written through a view of the doubles, typeshed only types memoryviews of bytes
+            result_view[start:end] = memoryview(array("d", map(add, view1[start:end], view2[start:end])))
+            for matrix in (matrix1, matrix2, result):
+                matrix.release(start, end)
+    return result
+
+
+def mapped_matrix_transpose(matrix: MappedMatrix, path: str, memory_budget: Optional[int] = None) -> MappedMatrix:
+    """
+    Transposes a matrix file into a new matrix file at [path] tile by tile: a tile is copied out of its rows and its
+    columns are written as pieces of the rows of the result, so both files are accessed in runs of a tile row
+    instead of one element per page.
+    """
+    n_rows, n_cols = matrix.shape
+    result = MappedMatrix.create(path, n_cols, n_rows)
+    # the copied tile, the pages of the tile in both files and room for the copies of its columns
+    size = tile_size(DOUBLE_SIZE, 4, memory_budget)
+    with matrix.elements() as view, result.elements() as result_view:
+        for i0 in range(0, n_rows, size):
+            i1 = min(i0 + size, n_rows)
+            for j0 in range(0, n_cols, size):
+                j1 = min(j0 + size, n_cols)
+                width = j1 - j0
+                tile = array("d")
+                for i in range(i0, i1):
+                    tile.extend(view[i * n_cols + j0 : i * n_cols + j1])
+                for j in range(j0, j1):
+                    result_view[j * n_rows + i0 : j * n_rows + i1] = memoryview(tile[j - j0 :: width])
+                matrix.release(i0 * n_cols + j0, (i1 - 1) * n_cols + j1)
+                result.release(j0 * n_rows + i0, (j1 - 1) * n_rows + i1)
+    return result
+
+
+def read_tile(view: memoryview, n_cols: int, rows: range, columns: range) -> List[List[float]]:
+    return [cast(List[float], view[i * n_cols + columns.start : i * n_cols + columns.stop].tolist()) for i in rows]
+
+
+def read_columns(
+    matrix: MappedMatrix, view: memoryview, columns: range, memory_budget: Optional[int]
+) -> List[List[float]]:
+    """
+    :return: the [columns] of a matrix file as lists of python floats, read a band of rows at a time so that
+    only the pages of one band are resident
+    """
+    n_rows, n_cols = matrix.shape
+    copies: List[List[float]] = [[] for _ in columns]
+    # a third of the budget, the rest holds the copies of the columns and rows being multiplied
+    band = rows_per_band(n_cols, 3, memory_budget)
+    for i0 in range(0, n_rows, band):
+        rows = range(i0, min(i0 + band, n_rows))
+        for copy, column in zip(copies, zip(*read_tile(view, n_cols, rows, columns))):
+            copy.extend(column)
+        matrix.release(rows.start * n_cols + columns.start, (rows.stop - 1) * n_cols + columns.stop)
+    return copies
+
+
+def mapped_matrix_multiplication(
+    matrix1: MappedMatrix, matrix2: MappedMatrix, path: str, memory_budget: Optional[int] = None
+) -> MappedMatrix:
+    """
+    Multiplies matrix files band by band into a new matrix file at [path]: a band of columns of [matrix2] is copied
+    once, then every band of rows of [matrix1] is multiplied by it and written into the product, and the pages of
+    the bands are released. Every element is one sum over its whole row and column, as in matrix_multiplication,
+    so the result is identical to it.
+    """
+    n_rows1, n_cols1 = matrix1.shape
+    n_rows2, n_cols2 = matrix2.shape
+    if n_cols1 != n_rows2:
+        raise IndexError(
+            f"Matrix multiplication is not defined for matrices of shapes {n_rows1}x{n_cols1} and {n_rows2}x{n_cols2}"
+        )
+    result = MappedMatrix.create(path, n_rows1, n_cols2)
+    # a band of rows and a band of columns as lists of python floats, and the pages being read
+    size = rows_per_band(n_cols1, 3, memory_budget, LIST_ELEMENT_SIZE)
+    with matrix1.elements() as view1, matrix2.elements() as view2, result.elements() as result_view:
+        for j0 in range(0, n_cols2, size):
+            columns = range(j0, min(j0 + size, n_cols2))
+            column_band = read_columns(matrix2, view2, columns, memory_budget)
+            for i0 in range(0, n_rows1, size):
+                rows = range(i0, min(i0 + size, n_rows1))
+                row_band = read_tile(view1, n_cols1, rows, range(n_cols1))
+                matrix1.release(rows.start * n_cols1, rows.stop * n_cols1)
+                for i, row in zip(rows, row_band):
+                    start = i * n_cols2 + columns.start
+                    product_row = array("d", [sum(map(mul, row, column)) for column in column_band])
+                    result_view[start : start + len(columns)] = memoryview(product_row)
+                result.release(rows.start * n_cols2 + columns.start, (rows.stop - 1) * n_cols2 + columns.stop)
+    return result
@@ -1,54 +1,607 @@
+import sys
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
 from math import sqrt, acos, isclose, pi
-from typing import Sequence, Tuple
+from operator import add, mul, sub
+from typing import Any, Iterator, List, MutableSequence, Optional, Sequence, Tuple, Union, cast, overload
 
 Vector = Sequence[float]
-Matrix = Sequence[Vector]
+# a matrix as a sequence of its rows, like a list of lists
+Rows = Sequence[Vector]
 
 
-def dot_product(vector1: Vector, vector2: Vector) -> float:
+class Matrix:
+    """
+    A dense matrix of floats stored row by row in one flat array('d'): 8 bytes per element instead of a boxed float
+    and a pointer, no list per row, and the elements of a row lie next to each other in memory.
+    Indexing it gives its rows as memoryviews of the array (matrix[i][j] works as with nested lists, nothing is
+    copied), matrix[i, j] gives an element.
+    """
+
+    __slots__ = ("data", "n_rows", "n_cols")
+
+    def __init__(self, n_rows: int, n_cols: int, data: Optional[array] = None):
+        """
+        :param data: the n_rows * n_cols elements row by row, it is not copied, zeros if it is None
+        """
+        if n_rows <= 0 or n_cols <= 0:
+            raise IndexError("Matrix cannot be empty or contain empty rows and must be of rectangular shape")
+        if data is None:
+            data = array("d", bytes(8 * n_rows * n_cols))
+        elif len(data) != n_rows * n_cols:
+            raise IndexError(f"{len(data)} elements do not make a matrix of shape {n_rows}x{n_cols}")
+        self.data = data
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+
+    @staticmethod
+    def from_rows(rows: Rows) -> "Matrix":
+        n_rows, n_cols = check_and_matrix_shape(rows)
+        return Matrix(n_rows, n_cols, array("d", chain.from_iterable(rows)))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    def row(self, i: int) -> memoryview:
+        if not 0 <= i < self.n_rows:
+            raise IndexError(f"Row {i} is out of a matrix of {self.n_rows} rows")
+        return memoryview(self.data)[i * self.n_cols : (i + 1) * self.n_cols]
+
+    def to_rows(self) -> List[List[float]]:
+        return [self.data[start : start + self.n_cols].tolist() for start in range(0, len(self.data), self.n_cols)]
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @overload
+    def __getitem__(self, index: int) -> memoryview:
+        ...
+
+    @overload
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        ...
+
+    def __getitem__(self, index: Union[int, Tuple[int, int]]) -> Union[memoryview, float]:
+        if isinstance(index, tuple):
+            i, j = index
+            if not (0 <= i < self.n_rows and 0 <= j < self.n_cols):
+                raise IndexError(f"Element {i}, {j} is out of a matrix of shape {self.n_rows}x{self.n_cols}")
+            return self.data[i * self.n_cols + j]
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return map(self.row, range(self.n_rows))
+
+    @property
+    def T(self) -> "TransposedMatrix":
+        return TransposedMatrix(self)
+
+    def __iadd__(self, other: Any) -> "Matrix":
+        """
+        Adds a matrix, or accumulates a lazy expression (C += lazy(A) @ B), into this matrix in place.
+        """
+        if hasattr(other, "accumulate_into"):
+            other.accumulate_into(self)
+        else:
+            matrix_sum(self, other, out=self)
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TransposedMatrix):
+            return self == other.copy()
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.shape == other.shape and self.data == other.data
+
+    def __repr__(self) -> str:
+        return f"Matrix.from_rows({self.to_rows()!r})"
+
+
+class TransposedMatrix:
+    """
+    The transpose of a Matrix as a view of it: nothing is copied, its rows are strided memoryviews of the columns
+    of the matrix, and changes of the matrix are seen through it. copy() makes a Matrix of it.
+    """
+
+    __slots__ = ("base", "n_rows", "n_cols")
+
+    def __init__(self, base: Matrix):
+        self.base = base
+        self.n_rows = base.n_cols
+        self.n_cols = base.n_rows
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    @property
+    def T(self) -> Matrix:
+        return self.base
+
+    def row(self, i: int) -> memoryview:
+        if not 0 <= i < self.n_rows:
+            raise IndexError(f"Row {i} is out of a matrix of {self.n_rows} rows")
+        return memoryview(self.base.data)[i :: self.n_rows]
+
+    def copy(self) -> Matrix:
+        # a column is a strided slice of the array, which is copied without a python loop per element
+        data = array("d")
+        for j in range(self.n_rows):
+            data.extend(self.base.data[j :: self.n_rows])
+        return Matrix(self.n_rows, self.n_cols, data)
+
+    def to_rows(self) -> List[List[float]]:
+        return [self.base.data[j :: self.n_rows].tolist() for j in range(self.n_rows)]
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @overload
+    def __getitem__(self, index: int) -> memoryview:
+        ...
+
+    @overload
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        ...
+
+    def __getitem__(self, index: Union[int, Tuple[int, int]]) -> Union[memoryview, float]:
+        if isinstance(index, tuple):
+            i, j = index
+            return self.base[j, i]
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return map(self.row, range(self.n_rows))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (Matrix, TransposedMatrix)):
+            return NotImplemented
+        return self.copy() == (other.copy() if isinstance(other, TransposedMatrix) else other)
+
+    def __repr__(self) -> str:
+        return f"{self.base!r}.T"
+
+
+# ndarrays are matrices too if NumPy is installed
+MatrixLike = Union[Matrix, Rows, Any]
+
+PYTHON_BACKEND = "python"
+NUMPY_BACKEND = "numpy"
+AUTO_BACKEND = "auto"
+# in the auto mode inputs of at least this many elements go to NumPy, converting smaller ones costs more than it saves
+NUMPY_MIN_SIZE = 64 * 64
+
+_backend = AUTO_BACKEND
+
+
+@lru_cache(maxsize=None)
+def load_numpy_backend() -> Optional[Any]:
+    """
+    :return: hw1.numpy_backend or None if NumPy is not installed, it is typed Any as mypy does not know
+    the functions of a module held in a variable
+    """
+    try:
+        from hw1 import numpy_backend
+    except ImportError:
+        return None
+    return numpy_backend
+
+
+def set_backend(backend: str) -> None:
+    """
+    Selects how the matrix functions compute: PYTHON_BACKEND always runs the pure python code, NUMPY_BACKEND always
+    runs NumPy kernels (BLAS for multiplication), AUTO_BACKEND (the default) runs NumPy for ndarrays and for inputs
+    of at least NUMPY_MIN_SIZE elements that are all stored as doubles already (Matrix and array("d")) if NumPy is
+    installed and the pure python code otherwise. So lists of ints, Fractions or complex numbers are computed exactly
+    by python in the auto mode, NUMPY_BACKEND converts them to doubles.
+    The shapes are checked the same way whatever the backend is, mismatching shapes raise IndexError.
+    NumPy computes with doubles and sums products in another order, so its results may differ in the last bits.
+    :raise ValueError: if there is no such backend
+    :raise ImportError: if NUMPY_BACKEND is selected but NumPy is not installed
+    """
+    global _backend
+    if backend not in (PYTHON_BACKEND, NUMPY_BACKEND, AUTO_BACKEND):
+        raise ValueError(f"Unknown matrix backend {backend!r}")
+    if backend == NUMPY_BACKEND and load_numpy_backend() is None:
+        raise ImportError("The numpy matrix backend needs NumPy to be installed")
+    _backend = backend
+
+
+def get_backend() -> str:
+    return _backend
+
+
+@contextmanager
+def matrix_backend(backend: str) -> Iterator[None]:
+    """
+    Selects the backend (see set_backend) for the duration of a with block.
+    """
+    previous = get_backend()
+    set_backend(backend)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def is_ndarray(value: object) -> bool:
+    # nothing can be an ndarray if NumPy has not been imported, so it is not imported to find out
+    numpy: Any = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def holds_doubles(value: object) -> bool:
+    """
+    :return: whether [value] stores its elements as doubles, so NumPy computes with the same numbers as python does
+    """
+    if isinstance(value, (Matrix, TransposedMatrix)):
+        return True
+    if isinstance(value, array):
+        return value.typecode == "d"
+    return isinstance(value, memoryview) and value.format == "d"
+
+
+def numpy_backend_for(n_elements: int, *operands: object) -> Optional[Any]:
+    """
+    :param n_elements: the number of elements of the operands
+    :return: hw1.numpy_backend if the operands should be computed by NumPy, otherwise None
+    """
+    if _backend == PYTHON_BACKEND:
+        return None
+    if _backend == AUTO_BACKEND and not any(map(is_ndarray, operands)):
+        # other sequences may hold ints, Fractions or complex numbers that converting to doubles would change
+        if n_elements < NUMPY_MIN_SIZE or not all(map(holds_doubles, operands)):
+            return None
+    return load_numpy_backend()
+
+
+def ndarray_shape(array_: Any) -> Tuple[int, int]:
+    """
+    :return: the shape of a 2-dimensional ndarray, a 1-dimensional one is a row
+    """
+    if array_.ndim == 1:
+        return 1, len(array_)
+    if array_.ndim != 2:
+        raise IndexError(f"An array of {array_.ndim} dimensions is neither a vector nor a matrix")
+    return array_.shape
+
+
+def as_vector(vector: Union[Vector, Matrix]) -> Vector:
+    """
+    :return: the elements of a vector, a matrix of one row or one column is a vector too
+    """
+    if isinstance(vector, Matrix):
+        shape, elements = vector.shape, vector.data
+    elif isinstance(vector, TransposedMatrix):
+        # a row or a column is stored the same way as its transpose
+        shape, elements = vector.shape, vector.base.data
+    elif is_ndarray(vector):
+        shape, elements = ndarray_shape(vector), vector.ravel()  # type: ignore
+    else:
+        return vector
+    if shape[0] != 1 and shape[1] != 1:
+        raise IndexError(f"A matrix of shape {shape[0]}x{shape[1]} is not a vector")
+    return elements
+
+
+def check_and_vectors_dimension(vector1: Vector, vector2: Vector) -> int:
     if len(vector1) != len(vector2):
         raise IndexError(
             f"Cannot perform dot product of vectors of different dimensions: {len(vector1)} and {len(vector2)} "
         )
-    return sum((x * y for x, y in zip(vector1, vector2)))
+    return len(vector1)
+
 
+def dot_product(vector1: Union[Vector, Matrix], vector2: Union[Vector, Matrix]) -> float:
+    vector1, vector2 = as_vector(vector1), as_vector(vector2)
+    dimension = check_and_vectors_dimension(vector1, vector2)
+    numpy_backend = numpy_backend_for(2 * dimension, vector1, vector2)
+    if numpy_backend is not None:
+        return numpy_backend.dot_product(vector1, vector2)
+    # the products are added in the same order as by a generator, but without running python code per element
+    return sum(map(mul, vector1, vector2))
 
-def magnitude(vector: Vector) -> float:
+
+def magnitude(vector: Union[Vector, Matrix]) -> float:
     return sqrt(dot_product(vector, vector))
 
 
-def angle_between_vectors(vector1: Vector, vector2: Vector) -> float:
+def angle_between_vectors(vector1: Union[Vector, Matrix], vector2: Union[Vector, Matrix]) -> float:
+    vector1, vector2 = as_vector(vector1), as_vector(vector2)
+    dimension = check_and_vectors_dimension(vector1, vector2)
+    numpy_backend = numpy_backend_for(2 * dimension, vector1, vector2)
+    if numpy_backend is not None:
+        return numpy_backend.angle_between_vectors(vector1, vector2)
     return acos(dot_product(vector1, vector2) / (magnitude(vector1) * magnitude(vector2)))
 
 
-def check_and_matrix_shape(matrix: Matrix) -> Tuple[int, int]:
+def check_and_matrix_shape(matrix: MatrixLike) -> Tuple[int, int]:
+    if isinstance(matrix, (Matrix, TransposedMatrix)):
+        # checked when the matrix was created
+        return matrix.shape
+    if is_ndarray(matrix):
+        n_rows, n_cols = ndarray_shape(matrix) if cast(Any, matrix).ndim == 2 else (0, 0)
+        if n_rows == 0 or n_cols == 0:
+            raise IndexError("Matrix cannot be empty or contain empty rows and must be of rectangular shape")
+        return n_rows, n_cols
     if len(matrix) == 0 or len(matrix[0]) == 0 or any((len(row) != len(matrix[0]) for row in matrix)):
         raise IndexError("Matrix cannot be empty or contain empty rows and must be of rectangular shape")
     return len(matrix), len(matrix[0])
 
 
-def matrix_transpose(matrix: Matrix) -> Matrix:
+def as_matrix(matrix: MatrixLike) -> Matrix:
+    if isinstance(matrix, TransposedMatrix):
+        return matrix.copy()
+    return matrix if isinstance(matrix, Matrix) else Matrix.from_rows(matrix)
+
+
+def check_out(out: Matrix, shape: Tuple[int, int]) -> None:
+    if not isinstance(out, Matrix):
+        raise TypeError(f"The result can only be written into a Matrix, not into {type(out).__name__}")
+    if out.shape != shape:
+        raise IndexError(
+            f"A matrix of shape {out.n_rows}x{out.n_cols} cannot hold a result of shape {shape[0]}x{shape[1]}"
+        )
+
+
+def shares_storage(matrix: MatrixLike, out: Matrix) -> bool:
+    return matrix is out or isinstance(matrix, TransposedMatrix) and matrix.base is out
+
+
+def matrix_transpose(matrix: MatrixLike) -> MatrixLike:
+    """
+    :return: a view of [matrix] sharing its storage if it is a Matrix (see TransposedMatrix), the Matrix itself
+    if [matrix] is such a view, otherwise a list of lists
+    """
+    if isinstance(matrix, Matrix):
+        return matrix.T
+    if isinstance(matrix, TransposedMatrix):
+        return matrix.base
     n_rows, n_cols = check_and_matrix_shape(matrix)
+    numpy_backend = numpy_backend_for(n_rows * n_cols, matrix)
+    if numpy_backend is not None:
+        return numpy_backend.matrix_transpose(matrix)
     return [[matrix[i][j] for i in range(n_rows)] for j in range(n_cols)]
 
 
-def matrix_sum(matrix1: Matrix, matrix2: Matrix) -> Matrix:
+def matrix_sum(matrix1: MatrixLike, matrix2: MatrixLike, out: Optional[Matrix] = None) -> MatrixLike:
+    """
+    :param out: a Matrix to write the sum into instead of allocating one, it may be one of the matrices:
+    matrix_sum(c, a, out=c) adds a to c in place like c += a
+    :return: [out] if it is given, otherwise a Matrix if any of the matrices is one, otherwise a list of lists
+    """
     n_rows1, n_cols1 = check_and_matrix_shape(matrix1)
     n_rows2, n_cols2 = check_and_matrix_shape(matrix2)
     if n_rows1 != n_rows2 or n_cols1 != n_cols2:
         raise IndexError("Matrix sum is only defined for matrices of the same shape")
+    if out is not None:
+        check_out(out, (n_rows1, n_cols1))
+    numpy_backend = numpy_backend_for(2 * n_rows1 * n_cols1, matrix1, matrix2)
+    if numpy_backend is not None:
+        return numpy_backend.matrix_sum(matrix1, matrix2, out)
+    if out is not None:
+        # a row of the result may only be written after the rows it is computed of are read
+        if isinstance(matrix1, TransposedMatrix) and matrix1.base is out:
+            matrix1 = matrix1.copy()
+        if isinstance(matrix2, TransposedMatrix) and matrix2.base is out:
+            matrix2 = matrix2.copy()
+        for i in range(n_rows1):
+            out.data[i * n_cols1 : (i + 1) * n_cols1] = array("d", map(add, matrix1[i], matrix2[i]))
+        return out
+    if isinstance(matrix1, (Matrix, TransposedMatrix)) or isinstance(matrix2, (Matrix, TransposedMatrix)):
+        data = array("d", map(add, as_matrix(matrix1).data, as_matrix(matrix2).data))
+        return Matrix(n_rows1, n_cols1, data)
     return [[matrix1[i][j] + matrix2[i][j] for j in range(n_cols1)] for i in range(n_rows1)]
 
 
-def matrix_multiplication(matrix1: Matrix, matrix2: Matrix) -> Matrix:
+MULTIPLICATION_BLOCK_SIZE = 128
+# the number of multiplications below which matrices are multiplied serially whatever the number of jobs,
+# starting a pool of processes takes longer than multiplying them
+PARALLEL_MIN_WORK = 256 * 256 * 256
+
+
+def blocked_multiplication(
+    matrix1: MatrixLike, matrix2: MatrixLike, block_size: int = MULTIPLICATION_BLOCK_SIZE
+) -> List[float]:
+    """
+    Multiplies matrices tile by tile with blocked_rows_by_columns.
+    The shapes are expected to be checked already.
+    :return: the elements of the product row by row
+    """
+    n_rows1, n_cols2 = check_and_matrix_shape(matrix1)[0], check_and_matrix_shape(matrix2)[1]
+    product: List[float] = [0] * (n_rows1 * n_cols2)
+    blocked_rows_by_columns(matrix1, matrix_transpose(matrix2), product, block_size)
+    return product
+
+
+def blocked_rows_by_columns(
+    rows: MatrixLike,
+    columns: MatrixLike,
+    product: MutableSequence[float],
+    block_size: int = MULTIPLICATION_BLOCK_SIZE,
+    accumulate: bool = True,
+) -> None:
+    """
+    Multiplies [rows] by [columns] tile by tile: a block of [block_size] rows is multiplied by a block of
+    [block_size] columns, so the rows and columns of a tile are reused while they are in cache and only one block
+    of rows and one block of columns are copied at a time.
+    The blocks are lists, so the inner loop (sum and map in C) does not box the elements it reads.
+    Every element is one sum over its whole row and column, as in dot_product, so the result is identical to
+    multiplying rows by columns: since python 3.12 sum compensates the rounding of floats, so sums split into pieces
+    along the shared dimension would round differently.
+    :param product: the elements of the product row by row are added to it if [accumulate], otherwise written into it
+    """
+    n_rows1, n_cols2 = len(rows), len(columns)
+    for i0 in range(0, n_rows1, block_size):
+        row_block = [list(rows[i]) for i in range(i0, min(i0 + block_size, n_rows1))]
+        for j0 in range(0, n_cols2, block_size):
+            column_block = [list(columns[j]) for j in range(j0, min(j0 + block_size, n_cols2))]
+            for i, row in enumerate(row_block, i0):
+                position = i * n_cols2 + j0
+                for column in column_block:
+                    product[position] = sum(map(mul, row, column), product[position] if accumulate else 0)
+                    position += 1
+
+
+def store_product(out: Matrix, product: Sequence[float], accumulate: bool) -> None:
+    if accumulate:
+        out.data[:] = array("d", map(add, out.data, product))
+    else:
+        out.data[:] = array("d", product)
+
+
+def matrix_multiplication(
+    matrix1: MatrixLike,
+    matrix2: MatrixLike,
+    block_size: int = MULTIPLICATION_BLOCK_SIZE,
+    jobs: int = 1,
+    out: Optional[Matrix] = None,
+    accumulate: bool = False,
+) -> MatrixLike:
+    """
+    :param block_size: the size of the tiles of blocked_multiplication
+    :param jobs: if it is more than 1, bands of rows of the product are multiplied on a pool of [jobs] processes
+    over shared memory, unless the matrices need fewer than PARALLEL_MIN_WORK multiplications.
+    The result does not depend on [jobs]. Asking for a pool selects the python backend in the auto mode, unless
+    a matrix is an ndarray, NumPy is only used with [jobs] if it is selected explicitly (and then ignores it)
+    :param out: a Matrix to write the product into instead of allocating one. The product is computed in it directly
+    unless it is one of the matrices (or their storage)
+    :param accumulate: add the product to [out] instead of overwriting it, like out += matrix1 @ matrix2.
+    The products are added to the elements of [out] one by one, so the rounding may differ from adding the product
+    :return: [out] if it is given, otherwise a Matrix if any of the matrices is one, otherwise a list of lists
+    """
+    n_rows1, n_cols1 = check_and_matrix_shape(matrix1)
+    n_rows2, n_cols2 = check_and_matrix_shape(matrix2)
+    if n_cols1 != n_rows2:
+        raise IndexError(
+            f"Matrix multiplication is not defined for matrices of shapes {n_rows1}x{n_cols1} and {n_rows2}x{n_cols2}"
+        )
+    if out is not None:
+        check_out(out, (n_rows1, n_cols2))
+    numpy_backend = None
+    if jobs <= 1 or _backend != AUTO_BACKEND or is_ndarray(matrix1) or is_ndarray(matrix2):
+        numpy_backend = numpy_backend_for(n_rows1 * n_cols1 + n_rows2 * n_cols2, matrix1, matrix2)
+    if numpy_backend is not None:
+        return numpy_backend.matrix_multiplication(matrix1, matrix2, out, accumulate)
+    parallel = jobs > 1 and n_rows1 > 1 and n_rows1 * n_cols1 * n_cols2 >= PARALLEL_MIN_WORK
+    if out is not None and not parallel and not shares_storage(matrix1, out) and not shares_storage(matrix2, out):
+        blocked_rows_by_columns(matrix1, matrix_transpose(matrix2), out.data, block_size, accumulate)
+        return out
+    if parallel:
+        from hw1.parallel_multiplication import parallel_multiplication
+
+        product = parallel_multiplication(matrix1, matrix2, jobs, block_size)
+    else:
+        product = blocked_multiplication(matrix1, matrix2, block_size)
+    if out is not None:
+        store_product(out, product, accumulate)
+        return out
+    if isinstance(matrix1, (Matrix, TransposedMatrix)) or isinstance(matrix2, (Matrix, TransposedMatrix)):
+        return Matrix(n_rows1, n_cols2, array("d", product))
+    return [product[start : start + n_cols2] for start in range(0, len(product), n_cols2)]
+
+
+# the size below which strassen_multiplication multiplies with blocked_multiplication, found by
+# benchmarks/bench_strassen.py: the seven products of halves save an eighth of the multiplications of a level,
+# which only pays for its fifteen sums of quarters on large enough matrices. With this crossover 1024x1024 matrices
+# are multiplied about 17% faster than by matrix_multiplication, 512x512 ones about 6%, smaller ones as fast
+STRASSEN_CROSSOVER = 256
+# the largest error of an element of strassen_multiplication relative to matrix_multiplication,
+# in units of n * max|matrix1| * max|matrix2| for n x n matrices. The error grows with the levels of recursion,
+# it is below 1e-14 even with a crossover of 16 for 1024x1024 matrices
+STRASSEN_TOLERANCE = 1e-13
+
+
+def add_quarters(quarter1: List[List[float]], quarter2: List[List[float]]) -> List[List[float]]:
+    return [list(map(add, row1, row2)) for row1, row2 in zip(quarter1, quarter2)]
+
+
+def subtract_quarters(quarter1: List[List[float]], quarter2: List[List[float]]) -> List[List[float]]:
+    return [list(map(sub, row1, row2)) for row1, row2 in zip(quarter1, quarter2)]
+
+
+def winograd_rows(
+    rows1: List[List[float]], rows2: List[List[float]], crossover: int, block_size: int
+) -> List[List[float]]:
+    """
+    Multiplies n x m by m x p matrices given as lists of rows with one level of the Winograd variant of Strassen's
+    algorithm: 7 products of halves and 15 sums of quarters, then recurses on the products.
+    A dimension of odd size is padded with a row or a column of zeros that is cut off the product.
+    """
+    n, m, p = len(rows1), len(rows2), len(rows2[0])
+    if min(n, m, p) <= crossover:
+        product = blocked_multiplication(rows1, rows2, block_size)
+        return [product[start : start + p] for start in range(0, n * p, p)]
+    if m % 2:
+        rows1 = [row + [0.0] for row in rows1]
+        rows2 = rows2 + [[0.0] * p]
+    if n % 2:
+        rows1 = rows1 + [[0.0] * len(rows1[0])]
+    if p % 2:
+        rows2 = [row + [0.0] for row in rows2]
+    n_half, m_half, p_half = (n + 1) // 2, (m + 1) // 2, (p + 1) // 2
+    a11, a12 = [row[:m_half] for row in rows1[:n_half]], [row[m_half:] for row in rows1[:n_half]]
+    a21, a22 = [row[:m_half] for row in rows1[n_half:]], [row[m_half:] for row in rows1[n_half:]]
+    b11, b12 = [row[:p_half] for row in rows2[:m_half]], [row[p_half:] for row in rows2[:m_half]]
+    b21, b22 = [row[:p_half] for row in rows2[m_half:]], [row[p_half:] for row in rows2[m_half:]]
+
+    s1 = add_quarters(a21, a22)
+    s2 = subtract_quarters(s1, a11)
+    s3 = subtract_quarters(a11, a21)
+    s4 = subtract_quarters(a12, s2)
+    t1 = subtract_quarters(b12, b11)
+    t2 = subtract_quarters(b22, t1)
+    t3 = subtract_quarters(b22, b12)
+    t4 = subtract_quarters(t2, b21)
+
+    def multiply(quarter1: List[List[float]], quarter2: List[List[float]]) -> List[List[float]]:
+        return winograd_rows(quarter1, quarter2, crossover, block_size)
+
+    m1, m2, m3, m4 = multiply(a11, b11), multiply(a12, b21), multiply(s4, b22), multiply(a22, t4)
+    m5, m6, m7 = multiply(s1, t1), multiply(s2, t2), multiply(s3, t3)
+    u2 = add_quarters(m1, m6)
+    u3 = add_quarters(u2, m7)
+    c11 = add_quarters(m1, m2)
+    c12 = add_quarters(add_quarters(u2, m5), m3)
+    c21 = subtract_quarters(u3, m4)
+    c22 = add_quarters(u3, m5)
+    return [(row1 + row2)[:p] for row1, row2 in chain(zip(c11, c12), zip(c21, c22))][:n]
+
+
+def strassen_multiplication(
+    matrix1: MatrixLike,
+    matrix2: MatrixLike,
+    crossover: Optional[int] = None,
+    block_size: int = MULTIPLICATION_BLOCK_SIZE,
+) -> MatrixLike:
+    """
+    Multiplies matrices with the Winograd variant of Strassen's algorithm, which needs O(n^2.81) multiplications
+    instead of O(n^3). The halves are multiplied recursively until a dimension is at most [crossover], then they are
+    multiplied by blocked_multiplication. The result differs from matrix_multiplication by rounding: every element
+    is within STRASSEN_TOLERANCE * n * max|matrix1| * max|matrix2| of it, n being the largest dimension.
+    Matrices that NumPy multiplies in the auto mode are multiplied by NumPy, like by matrix_multiplication.
+    :param crossover: STRASSEN_CROSSOVER by default
+    :return: a Matrix if any of the matrices is one, otherwise a list of lists
+    """
     n_rows1, n_cols1 = check_and_matrix_shape(matrix1)
     n_rows2, n_cols2 = check_and_matrix_shape(matrix2)
     if n_cols1 != n_rows2:
         raise IndexError(
             f"Matrix multiplication is not defined for matrices of shapes {n_rows1}x{n_cols1} and {n_rows2}x{n_cols2}"
         )
-    transposed = matrix_transpose(matrix2)
-    return [[dot_product(matrix1[i], transposed[j]) for j in range(n_cols2)] for i in range(n_rows1)]
+    numpy_backend = numpy_backend_for(n_rows1 * n_cols1 + n_rows2 * n_cols2, matrix1, matrix2)
+    if numpy_backend is not None:
+        return numpy_backend.matrix_multiplication(matrix1, matrix2)
+    crossover = max(1, STRASSEN_CROSSOVER if crossover is None else crossover)
+    rows1 = [list(matrix1[i]) for i in range(n_rows1)]
+    rows2 = [list(matrix2[i]) for i in range(n_rows2)]
+    product = winograd_rows(rows1, rows2, crossover, block_size)
+    if isinstance(matrix1, (Matrix, TransposedMatrix)) or isinstance(matrix2, (Matrix, TransposedMatrix)):
+        return Matrix.from_rows(product)
+    return product
 
 
 if __name__ == "__main__":
@@ -75,3 +628,4 @@ if __name__ == "__main__":
                [7, 8, 9],
            ]
     # fmt: on
+    assert matrix_multiplication(Matrix.from_rows([[1, 2], [3, 4]]), [[1], [1]]) == Matrix.from_rows([[3], [7]])
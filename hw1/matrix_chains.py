@@ -0,0 +1,153 @@
+"""
+Products of many matrices: multiply_chain multiplies a chain of matrices in the order that needs the fewest
+floating point operations, found by the classic dynamic programming over the ways to parenthesise the chain,
+and matrix_power raises a square matrix to a power by repeated squaring.
+Both report the number of floating point operations they planned: multiplying n x m by m x p matrices
+takes n * m * p multiplications and as many additions.
+"""
+
+import sys
+from array import array
+from typing import Any, List, NamedTuple, Sequence, Tuple, cast
+
+from hw1.matrices import Matrix, MatrixLike, check_and_matrix_shape, is_ndarray, matrix_multiplication
+
+# the order of a chain is the index of a matrix of the chain or a pair of the orders of its two halves,
+# ((0, 1), 2) multiplies the first two matrices and then the product by the third one
+Order = Any
+
+
+class ChainPlan(NamedTuple):
+    order: Order
+    flops: int
+
+
+class ChainProduct(NamedTuple):
+    product: MatrixLike
+    flops: int
+
+
+def multiplication_flops(n_rows1: int, n_cols1: int, n_cols2: int) -> int:
+    return 2 * n_rows1 * n_cols1 * n_cols2
+
+
+def chain_shapes(matrices: Sequence[MatrixLike]) -> List[Tuple[int, int]]:
+    """
+    :return: the shapes of [matrices]
+    :raise IndexError: if a matrix is not of rectangular shape or two neighbouring matrices cannot be multiplied
+    """
+    if not matrices:
+        raise ValueError("A chain of matrices needs at least one matrix")
+    shapes = [check_and_matrix_shape(matrix) for matrix in matrices]
+    for (n_rows1, n_cols1), (n_rows2, n_cols2) in zip(shapes, shapes[1:]):
+        if n_cols1 != n_rows2:
+            raise IndexError(
+                f"Matrix multiplication is not defined for matrices of shapes {n_rows1}x{n_cols1} "
+                f"and {n_rows2}x{n_cols2}"
+            )
+    return shapes
+
+
+def order_flops(shapes: Sequence[Tuple[int, int]], order: Order) -> int:
+    """
+    :return: the floating point operations of multiplying matrices of [shapes] in [order]
+    """
+
+    def flops_and_shape(order: Order) -> Tuple[int, Tuple[int, int]]:
+        if isinstance(order, int):
+            return 0, shapes[order]
+        (flops1, (n_rows, n_inner)), (flops2, (_, n_cols)) = flops_and_shape(order[0]), flops_and_shape(order[1])
+        return flops1 + flops2 + multiplication_flops(n_rows, n_inner, n_cols), (n_rows, n_cols)
+
+    return flops_and_shape(order)[0]
+
+
+def plan_chain(shapes: Sequence[Tuple[int, int]]) -> ChainPlan:
+    """
+    Finds the cheapest order of a chain in O(n^3) time: cost[i][j] is the fewest operations to multiply
+    the matrices i to j, the cheapest over k of multiplying the matrices i to k, the matrices k + 1 to j
+    and then the two products. The shapes are expected to be checked already.
+    """
+    n = len(shapes)
+    dimensions = [shapes[0][0]] + [n_cols for _, n_cols in shapes]
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cost[i][j], split[i][j] = min(
+                (
+                    cost[i][k]
+                    + cost[k + 1][j]
+                    + multiplication_flops(dimensions[i], dimensions[k + 1], dimensions[j + 1]),
+                    k,
+                )
+                for k in range(i, j)
+            )
+
+    def order(i: int, j: int) -> Order:
+        if i == j:
+            return i
+        return order(i, split[i][j]), order(split[i][j] + 1, j)
+
+    return ChainPlan(order(0, n - 1), cost[0][n - 1])
+
+
+def multiply_chain(*matrices: MatrixLike) -> ChainProduct:
+    """
+    Multiplies [matrices] in the order found by plan_chain, every multiplication is done by matrix_multiplication.
+    :return: the product and the floating point operations it took, the product of one matrix is the matrix itself
+    :raise IndexError: if the matrices cannot be multiplied, before anything is multiplied
+    """
+    plan = plan_chain(chain_shapes(matrices))
+
+    def multiply(order: Order) -> MatrixLike:
+        if isinstance(order, int):
+            return matrices[order]
+        return matrix_multiplication(multiply(order[0]), multiply(order[1]))
+
+    return ChainProduct(multiply(plan.order), plan.flops)
+
+
+def identity_like(matrix: MatrixLike, n: int) -> MatrixLike:
+    if isinstance(matrix, Matrix):
+        identity = Matrix(n, n)
+        identity.data[:: n + 1] = array("d", [1.0]) * n
+        return identity
+    if is_ndarray(matrix):
+        return cast(Any, sys.modules["numpy"]).eye(n)
+    return [[1 if i == j else 0 for j in range(n)] for i in range(n)]
+
+
+def matrix_power(matrix: MatrixLike, power: int) -> ChainProduct:
+    """
+    Raises a square matrix to a power by repeated squaring: the squares matrix^(2^i) are multiplied into the result
+    for the ones of the binary digits of [power], which takes at most 2 * log2(power) multiplications.
+    :return: the power and the floating point operations it took, the power 0 is the identity matrix
+    and the power 1 is [matrix] itself
+    :raise IndexError: if [matrix] is not square
+    :raise ValueError: if [power] is negative
+    """
+    n_rows, n_cols = check_and_matrix_shape(matrix)
+    if n_rows != n_cols:
+        raise IndexError(
+            f"Matrix power is only defined for square matrices, not for a matrix of shape {n_rows}x{n_cols}"
+        )
+    if power < 0:
+        raise ValueError(f"Matrix power is only defined for powers that are not negative, not for {power}")
+    if power == 0:
+        return ChainProduct(identity_like(matrix, n_rows), 0)
+    result, square, flops = None, matrix, 0
+    while True:
+        if power & 1:
+            if result is None:
+                result = square
+            else:
+                result = matrix_multiplication(result, square)
+                flops += multiplication_flops(n_rows, n_rows, n_rows)
+        power >>= 1
+        if not power:
+            break
+        square = matrix_multiplication(square, square)
+        flops += multiplication_flops(n_rows, n_rows, n_rows)
+    return ChainProduct(result, flops)
@@ -0,0 +1,253 @@
+"""
+Lazy matrix expressions: lazy(A) @ B + C builds an expression instead of computing intermediate matrices, the shapes
+are checked as it is built, and evaluate() computes it in one pass into one Matrix.
+Transposes are pushed down to the matrices the expression is built of ((A @ B).T is B.T @ A.T), so transposing twice
+costs nothing. Sums are streamed element by element into the result. Products are computed a band of rows at a time
+into one reused buffer, and the elements of a band are streamed into the enclosing sum before the next band is
+computed, so a product never takes more memory than a band. The results are identical to the eager functions of
+hw1.matrices with the python backend.
+C += lazy(A) @ B accumulates an expression into the Matrix C in place, without allocating a matrix for its value.
+"""
+
+from array import array
+from abc import ABC, abstractmethod
+from itertools import chain, islice
+from operator import add
+from typing import Iterator, Tuple, Union
+
+from hw1.matrices import (
+    MULTIPLICATION_BLOCK_SIZE,
+    Matrix,
+    MatrixLike,
+    blocked_rows_by_columns,
+    check_and_matrix_shape,
+    matrix_sum,
+    shares_storage,
+)
+
+
+class MatrixExpression(ABC):
+    """
+    A node of an expression. Build expressions with lazy, +, @ and .T, and compute them with evaluate().
+    """
+
+    __slots__ = ("shape",)
+
+    def __init__(self, shape: Tuple[int, int]):
+        self.shape = shape
+
+    @abstractmethod
+    def iter_elements(self) -> Iterator[float]:
+        """
+        :return: the elements of the value of the expression row by row, computed as they are consumed where possible
+        """
+
+    @abstractmethod
+    def transposed(self) -> "MatrixExpression":
+        pass
+
+    def rows(self) -> MatrixLike:
+        """
+        :return: the rows of the value of the expression, computed only if the expression is not a matrix
+        """
+        return self.evaluate()
+
+    def columns(self) -> MatrixLike:
+        """
+        :return: the columns of the value of the expression, computed only if the expression is not a transposed matrix
+        """
+        return self.transposed().rows()
+
+    def evaluate(self) -> Matrix:
+        n_rows, n_cols = self.shape
+        return Matrix(n_rows, n_cols, array("d", self.iter_elements()))
+
+    @abstractmethod
+    def reads(self, matrix: Matrix) -> bool:
+        """
+        :return: whether the value of the expression depends on the elements of [matrix]
+        """
+
+    def accumulate_into(self, out: Matrix) -> None:
+        """
+        Adds the value of the expression to [out] in place, it is what out += expression does.
+        """
+        if self.reads(out):
+            # the expression must see [out] as it was before anything is added to it
+            matrix_sum(out, self.evaluate(), out=out)
+        else:
+            self.add_into(out)
+
+    def add_into(self, out: Matrix) -> None:
+        """
+        Adds the value of the expression to [out] in place, [out] is not read by the expression.
+        """
+        matrix_sum(out, self.evaluate(), out=out)
+
+    @property
+    def T(self) -> "MatrixExpression":
+        return self.transposed()
+
+    def __add__(self, other: Union["MatrixExpression", MatrixLike]) -> "MatrixExpression":
+        return SumExpression(self, as_expression(other))
+
+    def __radd__(self, other: MatrixLike) -> "MatrixExpression":
+        return SumExpression(as_expression(other), self)
+
+    def __matmul__(self, other: Union["MatrixExpression", MatrixLike]) -> "MatrixExpression":
+        return ProductExpression(self, as_expression(other))
+
+    def __rmatmul__(self, other: MatrixLike) -> "MatrixExpression":
+        return ProductExpression(as_expression(other), self)
+
+
+class MatrixLeaf(MatrixExpression):
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: MatrixLike):
+        super().__init__(check_and_matrix_shape(matrix))
+        self.matrix = matrix
+
+    def iter_elements(self) -> Iterator[float]:
+        if isinstance(self.matrix, Matrix):
+            return iter(self.matrix.data)
+        return chain.from_iterable(self.matrix)
+
+    def transposed(self) -> MatrixExpression:
+        return TransposedLeaf(self)
+
+    def rows(self) -> MatrixLike:
+        return self.matrix
+
+    def reads(self, matrix: Matrix) -> bool:
+        return shares_storage(self.matrix, matrix)
+
+    def add_into(self, out: Matrix) -> None:
+        matrix_sum(out, self.matrix, out=out)
+
+    def __repr__(self) -> str:
+        return f"lazy({self.matrix!r})"
+
+
+class TransposedLeaf(MatrixExpression):
+    """
+    The transpose of a matrix, its elements are read column by column from the matrix without copying it.
+    """
+
+    __slots__ = ("leaf",)
+
+    def __init__(self, leaf: MatrixLeaf):
+        super().__init__((leaf.shape[1], leaf.shape[0]))
+        self.leaf = leaf
+
+    def iter_elements(self) -> Iterator[float]:
+        matrix = self.leaf.matrix
+        if isinstance(matrix, Matrix):
+            # a column is a strided slice of the array
+            return chain.from_iterable(matrix.data[j :: matrix.n_cols] for j in range(matrix.n_cols))
+        return chain.from_iterable(zip(*matrix))
+
+    def transposed(self) -> MatrixExpression:
+        return self.leaf
+
+    def rows(self) -> MatrixLike:
+        matrix = self.leaf.matrix
+        if isinstance(matrix, Matrix):
+            # a view, its rows are the columns of the matrix
+            return matrix.T
+        return super().rows()
+
+    def reads(self, matrix: Matrix) -> bool:
+        return self.leaf.reads(matrix)
+
+    def add_into(self, out: Matrix) -> None:
+        matrix = self.leaf.matrix
+        matrix_sum(out, matrix.T if isinstance(matrix, Matrix) else list(zip(*matrix)), out=out)
+
+    def __repr__(self) -> str:
+        return f"{self.leaf!r}.T"
+
+
+class SumExpression(MatrixExpression):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: MatrixExpression, right: MatrixExpression):
+        if left.shape != right.shape:
+            raise IndexError("Matrix sum is only defined for matrices of the same shape")
+        super().__init__(left.shape)
+        self.left = left
+        self.right = right
+
+    def iter_elements(self) -> Iterator[float]:
+        return map(add, self.left.iter_elements(), self.right.iter_elements())
+
+    def transposed(self) -> MatrixExpression:
+        return SumExpression(self.left.transposed(), self.right.transposed())
+
+    def reads(self, matrix: Matrix) -> bool:
+        return self.left.reads(matrix) or self.right.reads(matrix)
+
+    def add_into(self, out: Matrix) -> None:
+        self.left.add_into(out)
+        self.right.add_into(out)
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} + {self.right!r})"
+
+
+class ProductExpression(MatrixExpression):
+    """
+    A product is computed when its elements are needed by blocked_rows_by_columns, reading the rows of its left
+    operand and the columns of its right one directly from the matrices they are (or the transposes of them).
+    It is computed a band of [block_size] rows at a time, the tiles of a band are the tiles blocked_multiplication
+    multiplies, so every element is summed in the same order.
+    """
+
+    __slots__ = ("left", "right", "block_size")
+
+    def __init__(self, left: MatrixExpression, right: MatrixExpression, block_size: int = MULTIPLICATION_BLOCK_SIZE):
+        (n_rows1, n_cols1), (n_rows2, n_cols2) = left.shape, right.shape
+        if n_cols1 != n_rows2:
+            raise IndexError(
+                f"Matrix multiplication is not defined for matrices of shapes {n_rows1}x{n_cols1} "
+                f"and {n_rows2}x{n_cols2}"
+            )
+        super().__init__((n_rows1, n_cols2))
+        self.left = left
+        self.right = right
+        self.block_size = block_size
+
+    def iter_elements(self) -> Iterator[float]:
+        rows, columns = self.left.rows(), self.right.columns()
+        n_rows, n_cols = self.shape
+        band = array("d", bytes(8 * min(self.block_size, n_rows) * n_cols))
+        for i0 in range(0, n_rows, self.block_size):
+            band_rows = [rows[i] for i in range(i0, min(i0 + self.block_size, n_rows))]
+            # the band is overwritten, the elements of the previous one have all been consumed
+            blocked_rows_by_columns(band_rows, columns, band, self.block_size, accumulate=False)
+            yield from islice(band, len(band_rows) * n_cols)
+
+    def reads(self, matrix: Matrix) -> bool:
+        return self.left.reads(matrix) or self.right.reads(matrix)
+
+    def add_into(self, out: Matrix) -> None:
+        blocked_rows_by_columns(self.left.rows(), self.right.columns(), out.data, self.block_size)
+
+    def transposed(self) -> MatrixExpression:
+        # the products of the elements are the same, and they are summed in the same order
+        return ProductExpression(self.right.transposed(), self.left.transposed(), self.block_size)
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} @ {self.right!r})"
+
+
+def lazy(matrix: MatrixLike) -> MatrixExpression:
+    """
+    :return: an expression of [matrix] to build a larger expression of with +, @ and .T
+    :raise IndexError: if [matrix] is not of rectangular shape
+    """
+    return MatrixLeaf(matrix)
+
+
+def as_expression(matrix: Union[MatrixExpression, MatrixLike]) -> MatrixExpression:
+    return matrix if isinstance(matrix, MatrixExpression) else MatrixLeaf(matrix)
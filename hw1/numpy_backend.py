@@ -0,0 +1,85 @@
+"""
+The NumPy kernels behind the matrix functions of hw1.matrices, this module is only imported if NumPy is installed
+and selected. The shapes are checked by hw1.matrices before these functions are called.
+"""
+
+from array import array
+from math import acos
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from hw1.matrices import Matrix, MatrixLike, TransposedMatrix, Vector
+
+
+def to_ndarray(matrix: Union[MatrixLike, Vector]) -> np.ndarray:
+    """
+    Matrices and arrays of doubles are viewed without copying, other sequences are converted into arrays of floats.
+    """
+    if isinstance(matrix, np.ndarray):
+        return matrix
+    if isinstance(matrix, Matrix):
+        return np.frombuffer(matrix.data, dtype=np.float64).reshape(matrix.shape)
+    if isinstance(matrix, TransposedMatrix):
+        return to_ndarray(matrix.base).T
+    if isinstance(matrix, (array, memoryview)):
+        return np.frombuffer(matrix, dtype=np.float64)
+    return np.asarray(matrix, dtype=np.float64)
+
+
+def to_vector(vector: Any) -> np.ndarray:
+    vector = to_ndarray(vector)
+    if vector.ndim == 2 and 1 in vector.shape:
+        return vector.ravel()
+    if vector.ndim != 1:
+        raise IndexError(f"An array of shape {vector.shape} is not a vector")
+    return vector
+
+
+def like_operands(result: np.ndarray, *operands: Any) -> Any:
+    """
+    :return: the result as an ndarray if any operand is one, as a Matrix if any operand is one, otherwise as lists
+    """
+    if any(isinstance(operand, np.ndarray) for operand in operands):
+        return result
+    if any(isinstance(operand, (Matrix, TransposedMatrix)) for operand in operands):
+        data = array("d")
+        data.frombytes(np.ascontiguousarray(result, dtype=np.float64).tobytes())
+        return Matrix(result.shape[0], result.shape[1], data)
+    return result.tolist()
+
+
+def dot_product(vector1: Any, vector2: Any) -> float:
+    return float(np.dot(to_vector(vector1), to_vector(vector2)))
+
+
+def angle_between_vectors(vector1: Any, vector2: Any) -> float:
+    vector1, vector2 = to_vector(vector1), to_vector(vector2)
+    # acos of python floats raises ValueError out of [-1, 1] like the python backend, np.arccos would give nan
+    return acos(float(np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))))
+
+
+def matrix_transpose(matrix: MatrixLike) -> Any:
+    return like_operands(to_ndarray(matrix).T, matrix)
+
+
+def matrix_sum(matrix1: MatrixLike, matrix2: MatrixLike, out: Optional[Matrix] = None) -> Any:
+    if out is not None:
+        np.add(to_ndarray(matrix1), to_ndarray(matrix2), out=to_ndarray(out))
+        return out
+    return like_operands(to_ndarray(matrix1) + to_ndarray(matrix2), matrix1, matrix2)
+
+
+def matrix_multiplication(
+    matrix1: MatrixLike, matrix2: MatrixLike, out: Optional[Matrix] = None, accumulate: bool = False
+) -> Any:
+    # matmul of arrays of doubles runs in BLAS
+    if out is None:
+        return like_operands(to_ndarray(matrix1) @ to_ndarray(matrix2), matrix1, matrix2)
+    target = to_ndarray(out)
+    if accumulate:
+        target += to_ndarray(matrix1) @ to_ndarray(matrix2)
+    else:
+        # matmul copies the operands that overlap with its output
+        np.matmul(to_ndarray(matrix1), to_ndarray(matrix2), out=target)
+    return out
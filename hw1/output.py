@@ -0,0 +1,93 @@
+import os
+import sys
+from contextlib import contextmanager
+from types import TracebackType
+from typing import BinaryIO, Iterator, Optional, Type
+
+from hw1.readers import NEWLINE, Bytes
+
+OUTPUT_BLOCK_SIZE = 64 * 1024
+# the exit code of a process killed by SIGPIPE, which is what happens to C programs writing into a closed pipe
+BROKEN_PIPE_EXIT_CODE = 128 + 13
+
+
+class BufferedOutput:
+    """
+    Collects output in a bytearray and writes it to a binary stream in large blocks, so printing a line costs
+    an append instead of a call through the text layer.
+    Line-buffered when the stream is a TTY, so every line is seen as soon as it is printed,
+    block-buffered otherwise (pipes and files).
+    """
+
+    def __init__(self, stream: BinaryIO, block_size: int = OUTPUT_BLOCK_SIZE, line_buffered: Optional[bool] = None):
+        """
+        :param line_buffered: whether to flush after every line, by default only if the stream is a TTY
+        """
+        self.stream = stream
+        self.block_size = block_size
+        self.line_buffered = stream.isatty() if line_buffered is None else line_buffered
+        # hot loops may append formatted lines to the buffer themselves and flush once it holds flush_size bytes
+        self.buffer = bytearray()
+        self.flush_size = 1 if self.line_buffered else block_size
+
+    @staticmethod
+    def for_stdout() -> "BufferedOutput":
+        """
+        Creates an output for the binary buffer under sys.stdout.
+        The text layer is flushed first, so whatever was printed as text stays before the bytes.
+        """
+        sys.stdout.flush()
+        return BufferedOutput(sys.stdout.buffer)
+
+    def write(self, data: Bytes) -> None:
+        if len(data) >= self.block_size:
+            # large blocks are not worth copying into the buffer
+            self.flush()
+            self.stream.write(data)
+            return
+        self.buffer += data
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def write_line(self, line: Bytes) -> None:
+        """
+        This is needed to fight special cases when lines end not with a newline character but with EOF or some weird
+        character. Supports only \n newlines for simplicity.
+        """
+        self.buffer += line
+        if len(line) != 0 and line[-1] != NEWLINE:
+            self.buffer += b"\n"
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        try:
+            self.stream.write(self.buffer)
+            self.stream.flush()
+        finally:
+            self.buffer.clear()
+
+    def __enter__(self) -> "BufferedOutput":
+        return self
+
+    def __exit__(
+        self, _: Optional[Type[BaseException]], exception: Optional[BaseException], __: Optional[TracebackType]
+    ) -> None:
+        # nothing more can be written into a closed pipe
+        if not isinstance(exception, BrokenPipeError):
+            self.flush()
+
+
+@contextmanager
+def exit_on_broken_pipe() -> Iterator[None]:
+    """
+    Lets a command be piped into a command that stops reading early, like head: once stdout is closed the command
+    stops and the process exits with the code of a process killed by SIGPIPE, without a traceback.
+    """
+    try:
+        yield
+    except BrokenPipeError:
+        # whatever is left in the stdout buffers would fail to be flushed again at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(BROKEN_PIPE_EXIT_CODE)
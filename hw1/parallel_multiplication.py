@@ -0,0 +1,100 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Tuple, cast
+
+from hw1.matrices import Matrix, MatrixLike, as_matrix, blocked_multiplication, check_and_matrix_shape
+
+DOUBLE_SIZE = array("d").itemsize
+
+
+def create_shared(stack: ExitStack, n_rows: int, n_cols: int) -> SharedMemory:
+    """
+    :return: a new shared memory block for a matrix of the shape, it is freed when [stack] is closed
+    """
+    shared = SharedMemory(create=True, size=n_rows * n_cols * DOUBLE_SIZE)
+    stack.callback(shared.unlink)
+    stack.callback(shared.close)
+    return shared
+
+
+def write_shared_rows(shared: SharedMemory, start: int, n_cols: int, data: array) -> None:
+    """
+    Copies the elements [data] of whole rows of a matrix of [n_cols] columns into a shared memory block
+    starting with row [start].
+    """
+    offset = start * n_cols * DOUBLE_SIZE
+    cast(memoryview, shared.buf)[offset : offset + len(data) * DOUBLE_SIZE] = memoryview(data).cast("B")
+
+
+def read_shared_matrix(name: str, start: int, n_rows: int, n_cols: int) -> Matrix:
+    """
+    Copies [n_rows] rows of a matrix of [n_cols] columns starting with row [start] out of a shared memory block,
+    it is one memcpy.
+    """
+    shared = SharedMemory(name)
+    try:
+        data = array("d")
+        data.frombytes(
+            cast(memoryview, shared.buf)[start * n_cols * DOUBLE_SIZE : (start + n_rows) * n_cols * DOUBLE_SIZE]
+        )
+        return Matrix(n_rows, n_cols, data)
+    finally:
+        shared.close()
+
+
+def multiply_band(
+    names: Tuple[str, str, str], n_cols1: int, n_cols2: int, band: Tuple[int, int], block_size: int
+) -> None:
+    """
+    Runs in a worker process: multiplies the rows band[0]:band[1] of the first matrix by the second one and writes
+    them into the same rows of the product. Only the names of the shared memory blocks and the shapes are pickled.
+    """
+    name1, name2, product_name = names
+    start, end = band
+    rows = read_shared_matrix(name1, start, end - start, n_cols1)
+    matrix2 = read_shared_matrix(name2, 0, n_cols1, n_cols2)
+    band_product = array("d", blocked_multiplication(rows, matrix2, block_size))
+    shared = SharedMemory(product_name)
+    try:
+        write_shared_rows(shared, start, n_cols2, band_product)
+    finally:
+        shared.close()
+
+
+def split_into_bands(n_rows: int, n_bands: int) -> List[Tuple[int, int]]:
+    """
+    :return: at most [n_bands] ranges of rows covering [n_rows] rows, their sizes differ by one at most
+    """
+    n_bands = min(n_bands, n_rows)
+    bounds = [n_rows * k // n_bands for k in range(n_bands + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def parallel_multiplication(matrix1: MatrixLike, matrix2: MatrixLike, jobs: int, block_size: int) -> List[float]:
+    """
+    Multiplies matrices on a pool of [jobs] processes, each multiplying a band of rows of [matrix1] by [matrix2].
+    Both matrices and the product are placed in shared memory, so the workers read the operands and write
+    the product without pickling them. Every band is multiplied by blocked_multiplication, so the result is
+    identical to the serial one. The shapes are expected to be checked already.
+    :return: the elements of the product row by row
+    """
+    n_rows1, n_cols1 = check_and_matrix_shape(matrix1)
+    n_cols2 = check_and_matrix_shape(matrix2)[1]
+    with ExitStack() as stack:
+        shared1 = create_shared(stack, n_rows1, n_cols1)
+        shared2 = create_shared(stack, n_cols1, n_cols2)
+        shared_product = create_shared(stack, n_rows1, n_cols2)
+        write_shared_rows(shared1, 0, n_cols1, as_matrix(matrix1).data)
+        write_shared_rows(shared2, 0, n_cols2, as_matrix(matrix2).data)
+        names = (shared1.name, shared2.name, shared_product.name)
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = [
+                executor.submit(multiply_band, names, n_cols1, n_cols2, band, block_size)
+                for band in split_into_bands(n_rows1, jobs)
+            ]
+            for future in futures:
+                future.result()
+        product = read_shared_matrix(shared_product.name, 0, n_rows1, n_cols2).data.tolist()
+    return product
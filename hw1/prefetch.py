@@ -0,0 +1,133 @@
+import io
+import os
+import stat
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Iterable, Optional, Tuple
+
+from hw1.readers import STDIN
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+class PrefetchedFile(io.RawIOBase):
+    """
+    A raw file whose first bytes have been read ahead, they are served from memory and the rest is read from the file.
+    The file descriptor is the one of the file, so it can still be mapped into memory and stat-ed.
+    """
+
+    def __init__(self, file: io.FileIO, head: bytes):
+        """
+        :param file: the file positioned right after [head]
+        :param head: the first bytes of the file
+        """
+        super().__init__()
+        self.file = file
+        self.head = memoryview(head)
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore
+        if self.position < len(self.head):
+            n_bytes = min(len(buffer), len(self.head) - self.position)
+            memoryview(buffer)[:n_bytes] = self.head[self.position : self.position + n_bytes]
+        else:
+            n_bytes = self.file.readinto(buffer) or 0
+        self.position += n_bytes
+        return n_bytes
+
+    def seekable(self) -> bool:
+        return self.file.seekable()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += os.fstat(self.file.fileno()).st_size
+        # the file stays right after the head while the head is being read
+        self.file.seek(max(offset, len(self.head)))
+        self.position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self.position
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+def read_ahead(filepath: str, size: int) -> Optional[PrefetchedFile]:
+    """
+    Opens a regular file and reads its first [size] bytes.
+    :return: None for stdin, special files (reading them ahead might block or consume them) and files that cannot be
+    opened, those are opened as usual when they are needed
+    """
+    if filepath == STDIN:
+        return None
+    try:
+        if not stat.S_ISREG(os.stat(filepath).st_mode):
+            return None
+        file = io.FileIO(filepath, "rb")
+    except OSError:
+        return None
+    try:
+        head = file.read(size)
+    except OSError:
+        file.close()
+        return None
+    return PrefetchedFile(file, head)
+
+
+class Prefetcher:
+    """
+    Reads the first bytes of the files that are going to be opened next on a small thread pool, so the storage is
+    busy while the current file is processed. At most [n_ahead] files are read ahead at a time, so at most
+    n_ahead * [size] bytes are held in memory.
+    """
+
+    def __init__(self, filepaths: Iterable[str], n_ahead: int, size: int):
+        """
+        :param filepaths: the files in the order they are going to be opened
+        """
+        # the pool is only needed when there is something to read ahead
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.filepaths = iter(filepaths)
+        self.size = size
+        self.executor = ThreadPoolExecutor(n_ahead, thread_name_prefix="prefetch")
+        self.pending: Deque[Tuple[str, "Future[Optional[PrefetchedFile]]"]] = deque()
+        for _ in range(n_ahead):
+            self.submit_next()
+
+    def submit_next(self) -> None:
+        filepath = next(self.filepaths, None)
+        if filepath is not None:
+            self.pending.append((filepath, self.executor.submit(read_ahead, filepath, self.size)))
+
+    def take(self, filepath: str) -> Optional[PrefetchedFile]:
+        """
+        :return: the file read ahead if [filepath] is the next file to be opened and it could be read ahead,
+        the caller has to close it
+        """
+        if len(self.pending) == 0 or self.pending[0][0] != filepath:
+            return None
+        _, future = self.pending.popleft()
+        self.submit_next()
+        return future.result()
+
+    def close(self) -> None:
+        for _, future in self.pending:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        for _, future in self.pending:
+            if not future.cancelled():
+                prefetched = future.result()
+                if prefetched is not None:
+                    prefetched.close()
+        self.pending.clear()
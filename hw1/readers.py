@@ -0,0 +1,248 @@
+import io
+import mmap
+import os
+import stat
+import sys
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import TYPE_CHECKING, BinaryIO, Generator, Iterator, Optional, Sequence, Tuple, Union, cast
+
+if TYPE_CHECKING:
+    from hw1.prefetch import Prefetcher
+
+Bytes = Union[bytes, memoryview]
+# something to search with find, rfind and re, it is either a chunk of a file or its memory mapping
+Buffer = Union[bytes, mmap.mmap]
+LineBlock = Tuple[Buffer, int, int]
+
+STDIN = "-"
+NEWLINE = ord("\n")
+GZIP_MAGIC = b"\x1f\x8b"
+BZIP2_MAGIC = b"BZh"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+# mapping small files costs more than reading them
+MMAP_MIN_SIZE = 1024 * 1024
+# how often (in bytes) a mapped file is checked for being resized while it is being read
+SIZE_CHECK_INTERVAL = 16 * 1024 * 1024
+# how many of the next files are read ahead while the current one is processed, and how much of each of them
+PREFETCH_FILES = 4
+PREFETCH_SIZE = 1024 * 1024
+
+# set while open_input takes the files it opens from a prefetcher, a context variable so that threads (and nested uses)
+# each have their own and restore their own
+_prefetcher: "ContextVar[Optional[Prefetcher]]" = ContextVar("prefetcher", default=None)
+
+
+def open_decompressing(raw: io.BufferedReader) -> BinaryIO:
+    """
+    Wraps a stream into a streaming decompressor if it starts with the magic bytes of gzip, bzip2 or xz,
+    the extension of the file does not matter. The decompressor modules are only imported when they are needed.
+    """
+    magic = raw.peek(len(XZ_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        import gzip
+
+        return cast(BinaryIO, gzip.GzipFile(fileobj=raw))
+    if magic.startswith(BZIP2_MAGIC):
+        import bz2
+
+        return cast(BinaryIO, bz2.BZ2File(raw))
+    if magic.startswith(XZ_MAGIC):
+        import lzma
+
+        return cast(BinaryIO, lzma.LZMAFile(raw))
+    return cast(BinaryIO, raw)
+
+
+@contextmanager
+def prefetching(filepaths: Sequence[str], n_ahead: int = PREFETCH_FILES) -> Iterator[None]:
+    """
+    Makes open_input overlap reading with processing: while a file of [filepaths] is processed, the first
+    PREFETCH_SIZE bytes of the next [n_ahead] regular files are read on a thread pool. The files have to be opened by open_input in
+    the order of [filepaths], a file opened out of order is simply opened as usual.
+    Nothing is read ahead if [n_ahead] is 0 or there is only one file.
+    """
+    if n_ahead <= 0 or len(filepaths) < 2 or _prefetcher.get() is not None:
+        yield
+        return
+    from hw1.prefetch import Prefetcher
+
+    # the first file is needed right away, there is nothing to overlap its reading with
+    prefetcher = Prefetcher(filepaths[1:], n_ahead, PREFETCH_SIZE)
+    token = _prefetcher.set(prefetcher)
+    try:
+        yield
+    finally:
+        _prefetcher.reset(token)
+        prefetcher.close()
+
+
+@contextmanager
+def open_input(filepath: str) -> Iterator[BinaryIO]:
+    """
+    Opens a file for binary reading, "-" means stdin (which is not closed afterwards).
+    Compressed files are decompressed on the fly in constant memory, so whatever is not read is not decompressed.
+    """
+    prefetcher = _prefetcher.get()
+    prefetched = prefetcher.take(filepath) if prefetcher is not None else None
+    if filepath == STDIN:
+        raw = cast(io.BufferedReader, sys.stdin.buffer)
+    elif prefetched is not None:
+        raw = io.BufferedReader(prefetched)
+    else:
+        raw = cast(io.BufferedReader, open(filepath, "rb"))
+    try:
+        f = open_decompressing(raw)
+        try:
+            yield f
+        finally:
+            if f is not raw:
+                f.close()
+    finally:
+        if filepath != STDIN:
+            raw.close()
+
+
+def plain_regular_file_stat(f: BinaryIO) -> Optional[os.stat_result]:
+    """
+    :return: the stat of the file if [f] reads a regular file as is (not decompressed) from its start, otherwise None
+    """
+    if not isinstance(f, (io.BufferedReader, io.FileIO)):
+        return None
+    try:
+        file_stat = os.fstat(f.fileno())
+    except io.UnsupportedOperation:
+        return None
+    return file_stat if stat.S_ISREG(file_stat.st_mode) and f.tell() == 0 else None
+
+
+@contextmanager
+def mapped(f: BinaryIO) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Maps a large regular file into memory for reading.
+    Yields None for small files, pipes, special files, decompressed streams and file-like objects without a file
+    descriptor, they should be streamed instead.
+    """
+    file_stat = plain_regular_file_stat(f)
+    if file_stat is None or file_stat.st_size == 0 or file_stat.st_size < MMAP_MIN_SIZE:
+        yield None
+        return
+    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapping, "madvise"):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    try:
+        yield mapping
+    finally:
+        try:
+            mapping.close()
+        except BufferError:
+            # somebody still holds a slice of the mapping, it is unmapped when the slice is collected
+            pass
+
+
+def has_been_resized(f: BinaryIO, mapping: mmap.mmap) -> bool:
+    return os.fstat(f.fileno()).st_size != len(mapping)
+
+
+def iter_chunks(f: BinaryIO, chunk_size: int) -> Generator[bytes, None, None]:
+    """
+    Yields the content of a binary file in chunks of [chunk_size] bytes (the last one may be shorter).
+    Large regular files are read through a memory mapping, if such a file is resized while it is being read,
+    the rest of it is read from the same offset as a stream.
+    """
+    with mapped(f) as mapping:
+        if mapping is None:
+            yield from iter(partial(f.read, chunk_size), b"")
+            return
+        for start in range(0, len(mapping), chunk_size):
+            if has_been_resized(f, mapping):
+                f.seek(start)
+                yield from iter(partial(f.read, chunk_size), b"")
+                return
+            yield mapping[start : start + chunk_size]
+
+
+def iter_lines(f: BinaryIO) -> Generator[Bytes, None, None]:
+    """
+    Yields the lines of a binary file including their \n newlines.
+    Lines of large regular files are memoryview slices of a memory mapping, they are not copied and are only valid
+    until the iteration is over. If such a file is resized while it is being read, the rest of it is read from
+    the same offset as a stream.
+    """
+    with mapped(f) as mapping:
+        if mapping is None:
+            yield from f
+            return
+        size = len(mapping)
+        view = memoryview(mapping)
+        try:
+            start = 0
+            next_size_check = SIZE_CHECK_INTERVAL
+            while start < size:
+                if start >= next_size_check:
+                    if has_been_resized(f, mapping):
+                        break
+                    next_size_check = start + SIZE_CHECK_INTERVAL
+                end = mapping.find(b"\n", start) + 1 or size
+                yield view[start:end]
+                start = end
+        finally:
+            view.release()
+        if start < size:
+            f.seek(start)
+            yield from f
+
+
+def iter_terminated_lines(f: BinaryIO) -> Generator[Bytes, None, None]:
+    """
+    Yields the lines of a binary file like iter_lines does, but the last line gets a newline too if it has none,
+    so that equal lines compare equal wherever they are.
+    """
+    with closing(iter_lines(f)) as lines:
+        for line in lines:
+            yield line if line[-1] == NEWLINE else bytes(line) + b"\n"
+
+
+def iter_streamed_line_blocks(f: BinaryIO, block_size: int) -> Generator[LineBlock, None, None]:
+    rest = bytearray()
+    for chunk in iter(partial(f.read, block_size), b""):
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            rest += chunk
+            continue
+        block = chunk if cut == len(chunk) else chunk[:cut]
+        if rest:
+            block = bytes(rest) + block
+            rest.clear()
+        rest += chunk[cut:]
+        yield block, 0, len(block)
+    if rest:
+        yield bytes(rest), 0, len(rest)
+
+
+def iter_line_blocks(f: BinaryIO, block_size: int) -> Generator[LineBlock, None, None]:
+    """
+    Yields the content of a binary file as blocks of whole lines (buffer, start, end), the lines are buffer[start:end].
+    Blocks of large regular files are ranges of one memory mapping, so they are not copied, search them with
+    find, rfind and re using start and end positions. Other files are read in chunks cut after their last newline.
+    If a mapped file is resized while it is being read, the rest of it is read from the same offset as a stream.
+    """
+    with mapped(f) as mapping:
+        if mapping is None:
+            yield from iter_streamed_line_blocks(f, block_size)
+            return
+        size = len(mapping)
+        start = 0
+        while start < size and not has_been_resized(f, mapping):
+            end = min(start + block_size, size)
+            if end < size:
+                cut = mapping.rfind(b"\n", start, end) + 1
+                # a line longer than a block makes the block longer
+                end = cut if cut > 0 else mapping.find(b"\n", end) + 1 or size
+            yield mapping, start, end
+            start = end
+        if start < size:
+            f.seek(start)
+            yield from iter_streamed_line_blocks(f, block_size)
@@ -0,0 +1,76 @@
+import heapq
+from array import array
+from math import acos, sqrt
+from operator import itemgetter, mul
+from typing import Iterator, List, Tuple
+
+from hw1.matrices import Matrix, MatrixLike, check_and_matrix_shape
+
+
+class VectorCorpus:
+    """
+    Vectors to compare queries with, the rows of a matrix. Their elements are kept as lists of python floats and
+    their norms are computed once, so comparing a query with a vector is one dot product in C and one division.
+    """
+
+    __slots__ = ("vectors", "norms", "dimension")
+
+    def __init__(self, vectors: MatrixLike):
+        n_vectors, self.dimension = check_and_matrix_shape(vectors)
+        self.vectors = [list(vectors[i]) for i in range(n_vectors)]
+        self.norms = [sqrt(sum(map(mul, vector, vector))) for vector in self.vectors]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+
+def iter_query_similarities(queries: MatrixLike, corpus: VectorCorpus) -> Iterator[Iterator[float]]:
+    """
+    Yields, for each row of [queries], the lazy cosine similarities with the vectors of [corpus] in their order.
+    Every similarity is computed exactly like in angle_between_vectors: the dot product divided by the product
+    of the norms.
+    :raise IndexError: if the queries and the corpus are of different dimensions
+    :raise ZeroDivisionError: (while iterating) if a query or a corpus vector is zero
+    """
+    n_queries, dimension = check_and_matrix_shape(queries)
+    if dimension != corpus.dimension:
+        raise IndexError(
+            f"Cannot perform dot product of vectors of different dimensions: {dimension} and {corpus.dimension}"
+        )
+    for i in range(n_queries):
+        query = list(queries[i])
+        query_norm = sqrt(sum(map(mul, query, query)))
+        yield (sum(map(mul, query, vector)) / (query_norm * norm) for vector, norm in zip(corpus.vectors, corpus.norms))
+
+
+def cosine_similarities(queries: MatrixLike, corpus: VectorCorpus) -> Matrix:
+    """
+    :return: the matrix of the cosine similarities of the rows of [queries] (its rows) with the vectors of [corpus]
+    """
+    n_queries = check_and_matrix_shape(queries)[0]
+    data = array("d")
+    for similarities in iter_query_similarities(queries, corpus):
+        data.extend(similarities)
+    return Matrix(n_queries, len(corpus), data)
+
+
+def angles(queries: MatrixLike, corpus: VectorCorpus) -> Matrix:
+    """
+    :return: the matrix of the angles between the rows of [queries] (its rows) and the vectors of [corpus]
+    in radians. Rounding errors may take a similarity slightly out of [-1, 1], it is clamped into it.
+    """
+    n_queries = check_and_matrix_shape(queries)[0]
+    data = array("d")
+    for similarities in iter_query_similarities(queries, corpus):
+        data.extend(acos(min(1.0, max(-1.0, similarity))) for similarity in similarities)
+    return Matrix(n_queries, len(corpus), data)
+
+
+def iter_most_similar(queries: MatrixLike, corpus: VectorCorpus, k: int) -> Iterator[List[Tuple[int, float]]]:
+    """
+    Yields, for each row of [queries], the indices of the [k] vectors of [corpus] most similar to it with their
+    cosine similarities, the most similar first (the first of equally similar vectors first). The similarities of
+    a query are streamed through a heap of [k] elements, so a query takes O(k) memory whatever the size of [corpus].
+    """
+    for similarities in iter_query_similarities(queries, corpus):
+        yield heapq.nlargest(k, enumerate(similarities), key=itemgetter(1))
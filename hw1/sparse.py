@@ -0,0 +1,262 @@
+from array import array
+from itertools import repeat
+from operator import add, mul
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from hw1.matrices import Matrix, MatrixLike, check_and_matrix_shape
+
+# the type code of the index arrays, 64 bits on every platform
+INDEX_TYPE = "q"
+
+
+def check_sparse_shape(n_rows: int, n_cols: int) -> None:
+    # the same rules as for dense matrices
+    if n_rows <= 0 or n_cols <= 0:
+        raise IndexError("Matrix cannot be empty or contain empty rows and must be of rectangular shape")
+
+
+class CSRMatrix:
+    """
+    A sparse matrix in the compressed sparse row format: the nonzero elements row by row in [values], their columns
+    in [column_indices] (increasing within a row), and row i being values[row_starts[i]:row_starts[i + 1]].
+    Everything is kept in arrays, so a nonzero element costs 16 bytes, and the operations cost time proportional
+    to the number of nonzero elements they touch rather than to the number of elements.
+    """
+
+    __slots__ = ("n_rows", "n_cols", "values", "column_indices", "row_starts")
+
+    def __init__(self, n_rows: int, n_cols: int, values: array, column_indices: array, row_starts: array):
+        """
+        The arrays are not copied nor checked, use from_dense or from_coo to build a matrix from anything else.
+        """
+        check_sparse_shape(n_rows, n_cols)
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.values = values
+        self.column_indices = column_indices
+        self.row_starts = row_starts
+
+    @staticmethod
+    def from_dense(matrix: MatrixLike) -> "CSRMatrix":
+        n_rows, n_cols = check_and_matrix_shape(matrix)
+        values, column_indices, row_starts = array("d"), array(INDEX_TYPE), array(INDEX_TYPE, [0])
+        for i in range(n_rows):
+            row = matrix[i]
+            nonzero_columns = [j for j in range(n_cols) if row[j] != 0]
+            column_indices.extend(nonzero_columns)
+            values.extend([row[j] for j in nonzero_columns])
+            row_starts.append(len(values))
+        return CSRMatrix(n_rows, n_cols, values, column_indices, row_starts)
+
+    @staticmethod
+    def from_coo(
+        n_rows: int, n_cols: int, rows: Sequence[int], columns: Sequence[int], values: Sequence[float]
+    ) -> "CSRMatrix":
+        """
+        Builds a matrix from its elements in the coordinate format: values[k] is at rows[k], columns[k].
+        The elements may come in any order, the values of repeated coordinates are added up.
+        :raise IndexError: if the shape is empty or a coordinate is out of it
+        """
+        check_sparse_shape(n_rows, n_cols)
+        if not len(rows) == len(columns) == len(values):
+            raise IndexError(f"{len(rows)} rows, {len(columns)} columns and {len(values)} values are not coordinates")
+        elements: Dict[Tuple[int, int], float] = {}
+        for i, j, value in zip(rows, columns, values):
+            if not (0 <= i < n_rows and 0 <= j < n_cols):
+                raise IndexError(f"Element {i}, {j} is out of a matrix of shape {n_rows}x{n_cols}")
+            elements[i, j] = elements.get((i, j), 0) + value
+        coordinates = sorted(coordinate for coordinate, value in elements.items() if value != 0)
+        row_counts = [0] * n_rows
+        for i, _ in coordinates:
+            row_counts[i] += 1
+        row_starts = array(INDEX_TYPE, [0])
+        for count in row_counts:
+            row_starts.append(row_starts[-1] + count)
+        return CSRMatrix(
+            n_rows,
+            n_cols,
+            array("d", [elements[coordinate] for coordinate in coordinates]),
+            array(INDEX_TYPE, [j for _, j in coordinates]),
+            row_starts,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    @property
+    def n_nonzeros(self) -> int:
+        return len(self.values)
+
+    def row(self, i: int) -> Tuple[array, array]:
+        """
+        :return: the columns and the values of the nonzero elements of row [i]
+        """
+        start, end = self.row_starts[i], self.row_starts[i + 1]
+        return self.column_indices[start:end], self.values[start:end]
+
+    def to_dense(self) -> Matrix:
+        dense = Matrix(self.n_rows, self.n_cols)
+        data, column_indices, values = dense.data, self.column_indices, self.values
+        for i in range(self.n_rows):
+            row_offset = i * self.n_cols
+            for k in range(self.row_starts[i], self.row_starts[i + 1]):
+                data[row_offset + column_indices[k]] = values[k]
+        return dense
+
+    def transpose(self) -> "CSCMatrix":
+        """
+        The rows of this matrix are the columns of its transpose, so the transpose shares the arrays of this matrix.
+        """
+        return CSCMatrix(self.n_cols, self.n_rows, self.values, self.column_indices, self.row_starts)
+
+    def to_csc(self) -> "CSCMatrix":
+        """
+        Converts this matrix into the compressed sparse column format in O(nonzeros + columns) by a counting sort.
+        """
+        values, row_indices, column_starts = compress_other_axis(
+            self.n_rows, self.n_cols, self.values, self.column_indices, self.row_starts
+        )
+        return CSCMatrix(self.n_rows, self.n_cols, values, row_indices, column_starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CSRMatrix):
+            return NotImplemented
+        return (
+            self.shape == other.shape
+            and self.row_starts == other.row_starts
+            and self.column_indices == other.column_indices
+            and self.values == other.values
+        )
+
+    def __repr__(self) -> str:
+        return f"CSRMatrix.from_dense({self.to_dense().to_rows()!r})"
+
+
+class CSCMatrix:
+    """
+    A sparse matrix in the compressed sparse column format: like CSRMatrix with the roles of rows and columns
+    swapped, column j being values[column_starts[j]:column_starts[j + 1]] at rows row_indices[...].
+    """
+
+    __slots__ = ("n_rows", "n_cols", "values", "row_indices", "column_starts")
+
+    def __init__(self, n_rows: int, n_cols: int, values: array, row_indices: array, column_starts: array):
+        check_sparse_shape(n_rows, n_cols)
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.values = values
+        self.row_indices = row_indices
+        self.column_starts = column_starts
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    def transpose(self) -> CSRMatrix:
+        return CSRMatrix(self.n_cols, self.n_rows, self.values, self.row_indices, self.column_starts)
+
+    def to_csr(self) -> CSRMatrix:
+        values, column_indices, row_starts = compress_other_axis(
+            self.n_cols, self.n_rows, self.values, self.row_indices, self.column_starts
+        )
+        return CSRMatrix(self.n_rows, self.n_cols, values, column_indices, row_starts)
+
+    def to_dense(self) -> Matrix:
+        return self.to_csr().to_dense()
+
+
+def compress_other_axis(
+    n_major: int, n_minor: int, values: array, minor_indices: array, major_starts: array
+) -> Tuple[array, array, array]:
+    """
+    Converts a compressed format along one axis into the compressed format along the other one (CSR into CSC and back)
+    by a counting sort. The elements of every line of the result stay sorted by their index on the original axis.
+    """
+    counts = [0] * n_minor
+    for j in minor_indices:
+        counts[j] += 1
+    minor_starts = array(INDEX_TYPE, [0])
+    for count in counts:
+        minor_starts.append(minor_starts[-1] + count)
+    next_positions = minor_starts[:-1].tolist()
+    converted_values = array("d", bytes(8 * len(values)))
+    major_indices = array(INDEX_TYPE, bytes(8 * len(values)))
+    for i in range(n_major):
+        for k in range(major_starts[i], major_starts[i + 1]):
+            j = minor_indices[k]
+            position = next_positions[j]
+            converted_values[position] = values[k]
+            major_indices[position] = i
+            next_positions[j] = position + 1
+    return converted_values, major_indices, minor_starts
+
+
+def sparse_matrix_sum(matrix1: CSRMatrix, matrix2: CSRMatrix) -> CSRMatrix:
+    """
+    Adds the matrices row by row merging their nonzero elements, elements that add up to zero are dropped.
+    """
+    if matrix1.shape != matrix2.shape:
+        raise IndexError("Matrix sum is only defined for matrices of the same shape")
+    values, column_indices, row_starts = array("d"), array(INDEX_TYPE), array(INDEX_TYPE, [0])
+    for i in range(matrix1.n_rows):
+        row: Dict[int, float] = dict(zip(*matrix1.row(i)))
+        for j, value in zip(*matrix2.row(i)):
+            row[j] = row.get(j, 0) + value
+        nonzero_columns = sorted(j for j, value in row.items() if value != 0)
+        column_indices.extend(nonzero_columns)
+        values.extend([row[j] for j in nonzero_columns])
+        row_starts.append(len(values))
+    return CSRMatrix(matrix1.n_rows, matrix1.n_cols, values, column_indices, row_starts)
+
+
+def check_multiplication_shapes(shape1: Tuple[int, int], shape2: Tuple[int, int]) -> None:
+    if shape1[1] != shape2[0]:
+        raise IndexError(
+            f"Matrix multiplication is not defined for matrices of shapes {shape1[0]}x{shape1[1]} "
+            f"and {shape2[0]}x{shape2[1]}"
+        )
+
+
+def sparse_dense_multiplication(sparse: CSRMatrix, dense: MatrixLike) -> Matrix:
+    """
+    Multiplies a sparse matrix by a dense one: every row of the product is the sum of the rows of [dense] picked by
+    the nonzero elements of the row of [sparse] scaled by them, each added in one pass in C. The work is proportional
+    to the number of nonzero elements times the number of columns of [dense], the rows of [dense] that are not
+    picked are never read.
+    """
+    n_rows2, n_cols2 = check_and_matrix_shape(dense)
+    check_multiplication_shapes(sparse.shape, (n_rows2, n_cols2))
+    dense_rows: List[Optional[List[float]]] = [None] * n_rows2
+    product = array("d")
+    zeros = [0.0] * n_cols2
+    for i in range(sparse.n_rows):
+        product_row = zeros
+        for k in range(sparse.row_starts[i], sparse.row_starts[i + 1]):
+            j = sparse.column_indices[k]
+            dense_row = dense_rows[j]
+            if dense_row is None:
+                dense_row = dense_rows[j] = list(dense[j])
+            product_row = list(map(add, product_row, map(mul, repeat(sparse.values[k]), dense_row)))
+        product.extend(product_row)
+    return Matrix(sparse.n_rows, n_cols2, product)
+
+
+def sparse_multiplication(matrix1: CSRMatrix, matrix2: CSRMatrix) -> CSRMatrix:
+    """
+    Multiplies sparse matrices row by row (Gustavson's algorithm): the nonzero elements of a row of [matrix1] pick
+    rows of [matrix2], which are scaled and accumulated by column. The work is proportional to the number of
+    multiplications of nonzero elements, zeros are never touched.
+    """
+    check_multiplication_shapes(matrix1.shape, matrix2.shape)
+    values, column_indices, row_starts = array("d"), array(INDEX_TYPE), array(INDEX_TYPE, [0])
+    for i in range(matrix1.n_rows):
+        row: Dict[int, float] = {}
+        for k, value in zip(*matrix1.row(i)):
+            for j, other_value in zip(*matrix2.row(k)):
+                row[j] = row.get(j, 0) + value * other_value
+        nonzero_columns = sorted(j for j, product in row.items() if product != 0)
+        column_indices.extend(nonzero_columns)
+        values.extend([row[j] for j in nonzero_columns])
+        row_starts.append(len(values))
+    return CSRMatrix(matrix1.n_rows, matrix2.n_cols, values, column_indices, row_starts)
@@ -0,0 +1,89 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from hw1.readers import iter_chunks
+from hw1.word_count import WC_CHUNK_SIZE, WordCountState, count_chunks
+
+# the last bytes of the counted prefix of a file, used to tell an appended file from a rewritten one
+FINGERPRINT_SIZE = 64
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    The wc state of a file after counting its first [size] bytes, when its modification time was [mtime_ns].
+    """
+
+    size: int
+    mtime_ns: int
+    fingerprint: bytes
+    state: WordCountState
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"size": self.size, "mtime_ns": self.mtime_ns, "fingerprint": self.fingerprint.hex(), "state": self.state}
+        )
+
+    @staticmethod
+    def from_json(text: str) -> "CacheEntry":
+        entry = json.loads(text)
+        return CacheEntry(
+            entry["size"], entry["mtime_ns"], bytes.fromhex(entry["fingerprint"]), WordCountState(*entry["state"])
+        )
+
+
+def entry_path(cache_directory: str, file_stat: os.stat_result) -> str:
+    """
+    Every file has its own small entry named by its (device, inode), so files can be counted in parallel processes
+    without sharing anything and without loading the whole cache.
+    """
+    return os.path.join(cache_directory, f"{file_stat.st_dev}-{file_stat.st_ino}.json")
+
+
+def load_entry(path: str) -> Optional[CacheEntry]:
+    try:
+        with open(path) as f:
+            return CacheEntry.from_json(f.read())
+    except (OSError, ValueError, KeyError, TypeError):
+        # a missing or broken entry only means the file is counted in full
+        return None
+
+
+def save_entry(path: str, entry: CacheEntry) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as f:
+        f.write(entry.to_json())
+    os.replace(temporary_path, path)
+
+
+def read_fingerprint(f: BinaryIO, size: int) -> bytes:
+    start = max(0, size - FINGERPRINT_SIZE)
+    f.seek(start)
+    return f.read(size - start)
+
+
+def count_with_cache(
+    f: BinaryIO, file_stat: os.stat_result, cache_directory: str, chunk_size: int = WC_CHUNK_SIZE
+) -> WordCountState:
+    """
+    Counts a regular file continuing from its cached state:
+    if its size and modification time have not changed, nothing is read;
+    if it has grown and still ends its cached prefix with the same bytes, only the appended part is counted;
+    otherwise (it has been truncated, rewritten or it is a new file) it is counted in full.
+    Replaced files have other inodes, so they never meet the entries of the files they replaced.
+    The new state is saved into [cache_directory].
+    """
+    path = entry_path(cache_directory, file_stat)
+    entry = load_entry(path)
+    if entry is not None and entry.size == file_stat.st_size and entry.mtime_ns == file_stat.st_mtime_ns:
+        return entry.state
+    state = WordCountState()
+    if entry is not None and entry.size < file_stat.st_size and read_fingerprint(f, entry.size) == entry.fingerprint:
+        state = entry.state
+    f.seek(state.n_bytes)
+    state = count_chunks(iter_chunks(f, chunk_size), state)
+    save_entry(path, CacheEntry(state.n_bytes, file_stat.st_mtime_ns, read_fingerprint(f, state.n_bytes), state))
+    return state
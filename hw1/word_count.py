@@ -0,0 +1,60 @@
+from typing import BinaryIO, Iterable, NamedTuple, Tuple
+
+from hw1.readers import iter_chunks
+
+Counters = Tuple[int, int, int]
+
+WC_CHUNK_SIZE = 1024 * 1024
+# str.split() treats the ASCII information separators as whitespace too, so they separate words here as well
+WHITESPACE_BYTES = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+# maps whitespace to 0 and every other byte to 1, so a word start becomes the b"\x00\x01" pair
+WORD_MARKS = bytes(0 if byte in WHITESPACE_BYTES else 1 for byte in range(256))
+
+
+class WordCountState(NamedTuple):
+    """
+    What wc knows after counting a prefix of a file, enough to continue counting from where it has stopped.
+    """
+
+    n_newlines: int = 0
+    n_words: int = 0
+    n_bytes: int = 0
+    inside_word: bool = False
+    ends_with_newline: bool = True
+
+    @property
+    def counters(self) -> Counters:
+        """
+        (lines, words, bytes), a last line that does not end with a newline is still counted as a line.
+        """
+        return self.n_newlines + (0 if self.ends_with_newline else 1), self.n_words, self.n_bytes
+
+
+def count_chunks(chunks: Iterable[bytes], state: WordCountState = WordCountState()) -> WordCountState:
+    """
+    Continues counting newlines, words and bytes from [state] over the chunks, so nothing is decoded and no per-line
+    or per-word objects are created. Words are separated by ASCII whitespace and are counted by their first bytes,
+    the state is carried between chunks so a word split between two chunks is counted once.
+    The counts are the ones of wc in the C locale, not of the text mode the files were once read in: only \n ends
+    a line (a lone \r does not, \r\n counts once), \r counts as a byte, and whitespace outside ASCII, such as
+    the no-break space, does not separate words.
+    """
+    n_newlines, n_words, n_bytes, inside_word, ends_with_newline = state
+    for chunk in chunks:
+        n_bytes += len(chunk)
+        n_newlines += chunk.count(b"\n")
+        marks = chunk.translate(WORD_MARKS)
+        n_words += marks.count(b"\x00\x01")
+        if marks[0] and not inside_word:
+            n_words += 1
+        inside_word = marks[-1] == 1
+        ends_with_newline = chunk[-1] == ord("\n")
+    return WordCountState(n_newlines, n_words, n_bytes, inside_word, ends_with_newline)
+
+
+def count_lines_words_bytes(f: BinaryIO, chunk_size: int = WC_CHUNK_SIZE) -> Counters:
+    """
+    Counts lines, words and bytes of a binary file reading it in large chunks.
+    :return: (lines, words, bytes)
+    """
+    return count_chunks(iter_chunks(f, chunk_size)).counters
@@ -1,7 +1,8 @@
 import inspect
 from functools import wraps, update_wrapper
+from weakref import WeakKeyDictionary
 
-from typing import Callable, Any, TypeVar
+from typing import Callable, Any, Optional, Tuple, TypeVar
 
 
 def positional_arity(func: Callable[..., Any]) -> int:
@@ -25,17 +26,44 @@ def has_varargs(func: Callable[..., Any]) -> bool:
 
 R = TypeVar("R")
 
+# the signatures of the curried functions by the functions, a signature is the number of positional arguments and
+# whether varargs are accepted, or None if it is unknown
+__signatures: "WeakKeyDictionary[Callable[..., Any], Optional[Tuple[int, bool]]]" = WeakKeyDictionary()
 
-def __check_curry_arity(func: Callable[..., R], arity: int):
-    if arity < 0:
-        raise TypeError(f"Arity cannot be negative but received {arity}")
+
+def curry_signature(func: Callable[..., Any]) -> Optional[Tuple[int, bool]]:
+    """
+    Analyses the signature of func once and caches it while func exists.
+    :param func: any function
+    :return: the number of positional arguments of func (excluding varargs) and True if func accepts varargs,
+    None if the signature of func is unknown
+    """
+    try:
+        return __signatures[func]
+    except (KeyError, TypeError):
+        # TypeError is raised for callables that cannot be weakly referenced or hashed, they are not cached
+        pass
     try:
-        actual_arity = positional_arity(func)
-        has_positional_varargs = has_varargs(func)
+        args, varargs, *rest = inspect.getfullargspec(func)
+        signature: Optional[Tuple[int, bool]] = (len(args), varargs is not None)
     except TypeError:
         # This happens if [func] is a built in function or other function which signature is unknown.
+        signature = None
+    try:
+        __signatures[func] = signature
+    except TypeError:
+        pass
+    return signature
+
+
+def __check_curry_arity(func: Callable[..., R], arity: int):
+    if arity < 0:
+        raise TypeError(f"Arity cannot be negative but received {arity}")
+    signature = curry_signature(func)
+    if signature is None:
         # If we cannot access [func]'s signature we cannot checks the correctness of arity => we silently fail
         return
+    actual_arity, has_positional_varargs = signature
 
     if (not has_positional_varargs and arity != actual_arity) or arity < actual_arity:
         raise TypeError(
@@ -43,36 +71,50 @@ def __check_curry_arity(func: Callable[..., R], arity: int):
         )
 
 
-def __curry_internal(func: Callable[..., R], arity: int, passed_args: list = None) -> Callable:
+def __curry_internal(func: Callable[..., R], arity: int) -> Callable:
     """
     For internal use by curry_explicit only!
+    Every application makes one small closure: the arguments passed so far are kept as a linked list of pairs
+    (the previous pairs, the argument), so an application costs the same whatever the arity is,
+    and they are unrolled only when the last argument is passed.
     """
-    if passed_args is None:
-        passed_args = []
-
-    __check_curry_arity(func, arity)
-
     if arity == 0:
         return update_wrapper(lambda: func(), func)
 
-    @wraps(func)
-    def curried_function(x):
-        if len(passed_args) + 1 < arity:
-            return __curry_internal(func, arity, [*passed_args, x])
-        else:
-            return func(*passed_args, x)
+    def call(passed_args: Any, x: Any) -> R:
+        args = [x]
+        while passed_args is not None:
+            passed_args, arg = passed_args
+            args.append(arg)
+        args.reverse()
+        return func(*args)
 
-    return curried_function
+    def curry_step(passed_args: Any, remaining: int) -> Callable:
+        if remaining == 1:
+
+            def last_curried_function(x):
+                return call(passed_args, x)
+
+            return last_curried_function
+
+        def curried_function(x):
+            return curry_step((passed_args, x), remaining - 1)
+
+        return curried_function
+
+    return wraps(func)(curry_step(None, arity))
 
 
 def curry_explicit(func: Callable[..., R], arity: int) -> Callable:
     """
     Curries a function. Converts function with given arity = n into a series of n nested functions.
     If arity is 0 then returns lambda: func()
+    The signature of the function is checked once, the nested functions do not look at it again.
     :param func: The original function
     :param arity: Arity of the original function. Should be exactly equal to a number of positional arguments that
     the function receives if it does not accept varargs, otherwise should not be greater than the number of
     positional arguments.
     :return: A curried function.
     """
+    __check_curry_arity(func, arity)
     return __curry_internal(func, arity)
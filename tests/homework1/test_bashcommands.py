@@ -0,0 +1,407 @@
+import gzip
+import io
+import lzma
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from threading import Thread
+from unittest.mock import patch
+
+from hw1.bashcommands import (
+    COMMANDS,
+    grep,
+    head,
+    main,
+    nl,
+    parallel_map,
+    parse_arguments,
+    read_last_lines,
+    sort,
+    tail,
+    uniq,
+    wc,
+)
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+class CommandTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def create_file(self, name: str, content: bytes) -> str:
+        filepath = os.path.join(self.directory.name, name)
+        with open(filepath, "wb") as f:
+            f.write(content)
+        return filepath
+
+    def run_command(self, command, *args, **kwargs) -> str:
+        buffer = io.BytesIO()
+        output = io.TextIOWrapper(buffer, encoding="utf8")
+        with redirect_stdout(output):
+            command(*args, **kwargs)
+        output.flush()
+        return buffer.getvalue().decode("utf8")
+
+
+class ReadLastLinesTestCase(unittest.TestCase):
+    def read_last_lines(self, content: bytes, n_lines: int, block_size: int = 4) -> bytes:
+        return read_last_lines(io.BytesIO(content), n_lines, block_size)
+
+    def test_should_return_last_lines(self):
+        self.assertEqual(b"b\nc\n", self.read_last_lines(b"a\nb\nc\n", 2))
+
+    def test_should_return_last_line_without_trailing_newline(self):
+        self.assertEqual(b"b\nc", self.read_last_lines(b"a\nb\nc", 2))
+
+    def test_should_return_whole_file_if_it_is_shorter_than_requested(self):
+        self.assertEqual(b"a\nb\nc\n", self.read_last_lines(b"a\nb\nc\n", 10))
+
+    def test_should_return_nothing_for_zero_lines(self):
+        self.assertEqual(b"", self.read_last_lines(b"a\nb\n", 0))
+
+    def test_should_return_nothing_for_empty_file(self):
+        self.assertEqual(b"", self.read_last_lines(b"", 3))
+
+    def test_should_work_with_lines_longer_than_block(self):
+        content = b"".join(bytes([ord("a") + i]) * 10 + b"\n" for i in range(5))
+        self.assertEqual(content.split(b"\n", 2)[2], self.read_last_lines(content, 3, block_size=3))
+
+    def test_should_keep_empty_lines(self):
+        self.assertEqual(b"\n\nx\n", self.read_last_lines(b"a\n\n\nx\n", 3))
+
+
+class WcTestCase(CommandTestCase):
+    def test_should_print_counts_for_file(self):
+        filepath = self.create_file("file", b"hello world\nbye\n")
+        output = self.run_command(wc, filepath)
+        self.assertTrue(output.startswith(f"lines : 2, words : 3, bytes : 16 for {filepath}\n"))
+
+    def test_should_report_missing_file(self):
+        self.assertTrue(self.run_command(wc, "missing").startswith("missing no such file\n"))
+
+    def test_should_print_totals_of_one_call_only(self):
+        filepath = self.create_file("file", b"a b\n")
+        self.run_command(wc, filepath)
+        self.assertTrue(self.run_command(wc, filepath).endswith("lines : 1, words : 2, bytes : 4 in total\n\n"))
+
+    def test_parallel_output_should_be_the_same_as_serial(self):
+        filepaths = [self.create_file(f"file{i}", b"word\n" * i) for i in range(6)]
+        filepaths.insert(3, "missing")
+        serial = self.run_command(wc, *filepaths)
+        self.assertEqual(serial, self.run_command(wc, *filepaths, jobs=3, use_threads=True))
+        self.assertEqual(serial, self.run_command(wc, *filepaths, jobs=2))
+
+    def test_should_print_the_same_with_cache(self):
+        filepaths = [self.create_file(f"file{i}", b"word " * i + b"\n") for i in range(4)]
+        cache_directory = os.path.join(self.directory.name, "cache")
+        uncached = self.run_command(wc, *filepaths)
+        self.assertEqual(uncached, self.run_command(wc, *filepaths, jobs=2, cache_directory=cache_directory))
+        self.assertEqual(uncached, self.run_command(wc, *filepaths, cache_directory=cache_directory))
+        self.assertEqual(len(filepaths), len(os.listdir(cache_directory)))
+
+    def test_should_count_decompressed_content(self):
+        filepath = self.create_file("file.log", lzma.compress(b"hello world\nbye\n"))
+        output = self.run_command(wc, filepath)
+        self.assertTrue(output.startswith(f"lines : 2, words : 3, bytes : 16 for {filepath}\n"))
+
+
+class NlTestCase(CommandTestCase):
+    def test_should_number_non_blank_lines(self):
+        filepath = self.create_file("file", b"a\n\n\t\nb")
+        self.assertEqual("1\ta\n\n\n2\tb\n", self.run_command(nl, filepath))
+
+    def test_should_continue_numbering_in_next_file(self):
+        first = self.create_file("first", b"a\nb\n")
+        second = self.create_file("second", b"c\n")
+        self.assertEqual("1\ta\n2\tb\n3\tc\n", self.run_command(nl, first, second))
+
+    def test_should_print_the_same_for_mapped_files(self):
+        filepath = self.create_file("file", b"a\n\r\n\tb\n\t\n" * 100 + b"c")
+        streamed = self.run_command(nl, filepath)
+        with patch("hw1.readers.MMAP_MIN_SIZE", 1):
+            self.assertEqual(streamed, self.run_command(nl, filepath))
+
+    def test_should_number_stdin(self):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(b"a\nb\n")))
+        filepath = self.create_file("file", b"c\n")
+        with patch("sys.stdin", stdin):
+            self.assertEqual("1\ta\n2\tb\n3\tc\n", self.run_command(nl, "-", filepath, jobs=2, use_threads=True))
+
+    def test_parallel_output_should_be_the_same_as_serial(self):
+        filepaths = [self.create_file(f"file{i}", b"line\n\n" * i) for i in range(6)]
+        filepaths.insert(2, "missing")
+        serial = self.run_command(nl, *filepaths)
+        self.assertEqual(serial, self.run_command(nl, *filepaths, jobs=3, use_threads=True))
+        self.assertEqual(serial, self.run_command(nl, *filepaths, jobs=2))
+
+
+class HeadTestCase(CommandTestCase):
+    def test_should_print_first_10_lines(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(20)))
+        self.assertEqual("".join(f"{i}\n" for i in range(10)), self.run_command(head, filepath))
+
+    def test_should_add_newline_to_last_line(self):
+        filepath = self.create_file("file", b"a\nb")
+        self.assertEqual("a\nb\n", self.run_command(head, filepath))
+
+    def test_should_print_headers_for_many_files(self):
+        first = self.create_file("first", b"1\n")
+        second = self.create_file("second", b"2\n")
+        self.assertEqual(f"==> {first} <==\n1\n==> {second} <==\n2\n", self.run_command(head, first, second))
+
+    def test_should_stop_decompressing_after_printing_lines(self):
+        compressed = gzip.compress(b"".join(b"%d\n" % i for i in range(100_000)))
+        # reading the truncated archive to its end would fail
+        filepath = self.create_file("file.gz", compressed[: len(compressed) // 2])
+        self.assertEqual("".join(f"{i}\n" for i in range(10)), self.run_command(head, filepath))
+
+    def test_should_print_the_same_for_mapped_files(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(20)))
+        with patch("hw1.readers.MMAP_MIN_SIZE", 1):
+            self.assertEqual("".join(f"{i}\n" for i in range(10)), self.run_command(head, filepath))
+
+
+class ParallelMapTestCase(unittest.TestCase):
+    def test_should_keep_order(self):
+        self.assertEqual([x * x for x in range(50)], list(parallel_map(square, range(50), jobs=4, use_threads=True)))
+
+    def test_should_keep_order_with_processes(self):
+        self.assertEqual([x * x for x in range(20)], list(parallel_map(square, range(20), jobs=2)))
+
+
+class TailTestCase(CommandTestCase):
+    def test_should_print_last_10_lines_by_default(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(20)))
+        self.assertEqual("".join(f"{i}\n" for i in range(10, 20)), self.run_command(tail, filepath))
+
+    def test_should_accept_arbitrary_number_of_lines(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(20)))
+        self.assertEqual("17\n18\n19\n", self.run_command(tail, filepath, n=3))
+
+    def test_should_add_newline_to_last_line(self):
+        filepath = self.create_file("file", b"a\nb")
+        self.assertEqual("a\nb\n", self.run_command(tail, filepath))
+
+    def test_should_print_headers_for_many_files(self):
+        first = self.create_file("first", b"1\n")
+        second = self.create_file("second", b"2\n")
+        self.assertEqual(f"==> {first} <==\n1\n==> {second} <==\n2\n", self.run_command(tail, first, second, n=1))
+
+    def test_should_report_missing_file(self):
+        self.assertEqual("missing no such file\n", self.run_command(tail, "missing"))
+
+    def test_should_print_last_lines_of_compressed_file(self):
+        filepath = self.create_file("file", gzip.compress(b"".join(b"%d\n" % i for i in range(20))))
+        self.assertEqual("18\n19\n", self.run_command(tail, filepath, n=2))
+
+    def followed_data(self, filepath: str, appended: bytes, **kwargs) -> bytes:
+        """
+        :return: what tail follows in the file after [appended] is appended to it, tail printed the last lines before
+        """
+        with patch("hw1.follow.follow_files") as follow_files:
+            self.run_command(tail, filepath, follow=True, **kwargs)
+        (followed,) = follow_files.call_args[0][0]
+        self.addCleanup(followed.close)
+        with open(filepath, "ab") as f:
+            f.write(appended)
+        return b"".join(followed.read_to_end())
+
+    def test_should_follow_from_end_of_file(self):
+        filepath = self.create_file("file", b"old1\nold2\n")
+        self.assertEqual(b"NEW\n", self.followed_data(filepath, b"NEW\n"))
+        self.assertEqual(b"NEW\n", self.followed_data(self.create_file("other", b"old1\nold2\n"), b"NEW\n", n=0))
+
+    def test_should_follow_from_end_of_tail_spanning_many_blocks(self):
+        filepath = self.create_file("file", b"".join(b"%011d\n" % i for i in range(20000)))
+        self.assertEqual(b"NEW\n", self.followed_data(filepath, b"NEW\n", n=10000))
+
+    @staticmethod
+    def write_to_fifo(fifo: str, content: bytes) -> None:
+        with open(fifo, "wb") as f:
+            f.write(content)
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "named pipes are not supported")
+    def test_should_stream_non_seekable_files(self):
+        fifo = os.path.join(self.directory.name, "fifo")
+        os.mkfifo(fifo)
+        writer = Thread(target=self.write_to_fifo, args=(fifo, b"".join(b"%d\n" % i for i in range(5))))
+        writer.start()
+        output = self.run_command(tail, fifo, n=2)
+        writer.join()
+        self.assertEqual("3\n4\n", output)
+
+
+class GrepTestCase(CommandTestCase):
+    def test_should_print_matching_lines(self):
+        filepath = self.create_file("file", b"foo\nbar\nfood\n")
+        self.assertEqual("foo\nfood\n", self.run_command(grep, filepath, pattern="fo+"))
+
+    def test_should_prefix_lines_with_path_and_number(self):
+        first = self.create_file("first", b"a\nb\n")
+        second = self.create_file("second", b"b\na\n")
+        output = self.run_command(grep, first, second, pattern="a", line_number=True)
+        self.assertEqual(f"{first}:1:a\n{second}:2:a\n", output)
+
+    def test_should_count_matching_lines(self):
+        filepath = self.create_file("file", b"ab\nb\nabab\n")
+        self.assertEqual("2\n", self.run_command(grep, filepath, pattern="a", count=True))
+
+    def test_should_print_files_with_matches(self):
+        first = self.create_file("first", b"a\n")
+        second = self.create_file("second", b"b\n")
+        self.assertEqual(f"{first}\n", self.run_command(grep, first, second, pattern="a", files_with_matches=True))
+
+    def test_should_match_fixed_strings_literally(self):
+        filepath = self.create_file("file", b"a.c\nabc\n")
+        self.assertEqual("a.c\n", self.run_command(grep, filepath, pattern="a.c", fixed_strings=True))
+
+    def test_should_anchor_at_line_boundaries(self):
+        filepath = self.create_file("file", b"ab\nba\n\nb")
+        self.assertEqual("ab\n", self.run_command(grep, filepath, pattern="^a"))
+        self.assertEqual("\n", self.run_command(grep, filepath, pattern="^$"))
+        self.assertEqual("ab\nb\n", self.run_command(grep, filepath, pattern="b$"))
+
+    def test_should_not_match_across_lines(self):
+        filepath = self.create_file("file", b"a\nb\n")
+        self.assertEqual("", self.run_command(grep, filepath, pattern=r"a\sb"))
+
+    def test_should_return_whether_anything_matched(self):
+        filepath = self.create_file("file", b"a\n")
+        with redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+            self.assertTrue(grep(filepath, "missing", pattern="a"))
+            self.assertFalse(grep(filepath, pattern="b"))
+
+    def test_should_print_the_same_for_mapped_files(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(1000)))
+        streamed = self.run_command(grep, filepath, pattern="7$", line_number=True)
+        with patch("hw1.readers.MMAP_MIN_SIZE", 1):
+            self.assertEqual(streamed, self.run_command(grep, filepath, pattern="7$", line_number=True))
+
+    def test_should_search_decompressed_content(self):
+        filepath = self.create_file("file.xz", lzma.compress(b"a\nb\n"))
+        self.assertEqual("b\n", self.run_command(grep, filepath, pattern="b"))
+
+
+class SortTestCase(CommandTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        generator = random.Random(3)
+        self.lines = [b"%d\n" % generator.randrange(1000) for _ in range(500)]
+
+    def test_should_sort_lines_of_all_files_together(self):
+        first = self.create_file("first", b"b\nd\n")
+        second = self.create_file("second", b"c\na")
+        self.assertEqual("a\nb\nc\nd\n", self.run_command(sort, first, second))
+
+    def test_should_sort_by_bytes(self):
+        filepath = self.create_file("file", "b\nB\né\na\n".encode("utf8"))
+        self.assertEqual("B\na\nb\né\n", self.run_command(sort, filepath))
+
+    def test_should_merge_spilled_runs(self):
+        filepath = self.create_file("file", b"".join(self.lines))
+        expected = b"".join(sorted(self.lines)).decode()
+        with patch("hw1.external_sort.MERGE_FAN_IN", 3):
+            self.assertEqual(
+                expected, self.run_command(sort, filepath, run_size=100, temp_directory=self.directory.name)
+            )
+        self.assertEqual(["file"], os.listdir(self.directory.name))
+
+    def test_parallel_output_should_be_the_same_as_serial(self):
+        filepath = self.create_file("file", b"".join(self.lines))
+        serial = self.run_command(sort, filepath, run_size=1000)
+        self.assertEqual(serial, self.run_command(sort, filepath, run_size=1000, jobs=2))
+        self.assertEqual(serial, self.run_command(sort, filepath, run_size=1000, jobs=3, use_threads=True))
+
+    def test_should_report_missing_file(self):
+        filepath = self.create_file("file", b"b\na\n")
+        self.assertEqual("missing no such file\na\nb\n", self.run_command(sort, "missing", filepath))
+
+
+class UniqTestCase(CommandTestCase):
+    def test_should_collapse_adjacent_equal_lines(self):
+        filepath = self.create_file("file", b"a\na\nb\na\na")
+        self.assertEqual("a\nb\na\n", self.run_command(uniq, filepath))
+
+    def test_should_count_adjacent_equal_lines(self):
+        filepath = self.create_file("file", b"a\na\nb\n")
+        self.assertEqual("      2 a\n      1 b\n", self.run_command(uniq, filepath, count=True))
+
+    def test_should_print_headers_for_many_files(self):
+        first = self.create_file("first", b"1\n1\n")
+        second = self.create_file("second", b"2\n")
+        self.assertEqual(f"==> {first} <==\n1\n==> {second} <==\n2\n", self.run_command(uniq, first, second))
+
+    def test_should_print_the_same_for_mapped_files(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % (i // 3) for i in range(100)))
+        streamed = self.run_command(uniq, filepath, count=True)
+        with patch("hw1.readers.MMAP_MIN_SIZE", 1):
+            self.assertEqual(streamed, self.run_command(uniq, filepath, count=True))
+
+
+class ParseArgumentsTestCase(unittest.TestCase):
+    def test_should_separate_options_from_operands(self):
+        operands, kwargs = parse_arguments(COMMANDS["tail"].options, ["a", "-n", "5", "-f", "b", "-"])
+        self.assertEqual(["a", "b", "-"], operands)
+        self.assertEqual({"n": 5, "follow": True}, kwargs)
+
+    def test_should_accept_grouped_switches_and_attached_values(self):
+        _, kwargs = parse_arguments(COMMANDS["grep"].options, ["-cnF"])
+        self.assertEqual({"count": True, "line_number": True, "fixed_strings": True}, kwargs)
+        self.assertEqual(([], {"n": 3}), parse_arguments(COMMANDS["head"].options, ["-n3"]))
+
+    def test_should_treat_everything_after_double_dash_as_operands(self):
+        self.assertEqual((["-n", "a"], {}), parse_arguments(COMMANDS["head"].options, ["--", "-n", "a"]))
+
+    def test_should_reject_bad_options(self):
+        for arguments in (["-x"], ["-n"], ["-n", "many"]):
+            with self.subTest(arguments=arguments), self.assertRaises(ValueError):
+                parse_arguments(COMMANDS["head"].options, arguments)
+
+
+class MainTestCase(CommandTestCase):
+    def test_should_run_command_with_options(self):
+        filepath = self.create_file("file", b"".join(b"%d\n" % i for i in range(5)))
+        self.assertEqual("0\n1\n", self.run_command(main, ["head", "-n", "2", filepath]))
+
+    def test_should_read_stdin_without_files(self):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(b"b\na\n")))
+        with patch("sys.stdin", stdin):
+            self.assertEqual("a\nb\n", self.run_command(main, ["sort"]))
+
+    def test_should_return_grep_status(self):
+        filepath = self.create_file("file", b"a\n")
+        with redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+            self.assertEqual(0, main(["grep", "-c", "a", filepath]))
+            self.assertEqual(1, main(["grep", "b", filepath]))
+
+    def test_should_report_usage_errors(self):
+        for arguments in ([], ["cat"], ["head", "-x"], ["grep"]):
+            with self.subTest(arguments=arguments), redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(2, main(arguments))
+                self.assertIn("usage:", stderr.getvalue())
+
+    def test_should_import_only_what_command_needs(self):
+        filepath = self.create_file("file", b"a\n")
+        script = (
+            "import sys\n"
+            "from hw1.bashcommands import main\n"
+            f"main(['head', {filepath!r}])\n"
+            "print(sorted({'tempfile', 'hw1.follow', 'hw1.wc_cache', 'hw1.external_sort', 'json'} & set(sys.modules)))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, check=True).stdout
+        self.assertEqual(b"a\n[]\n", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import io
+import os
+import tempfile
+import unittest
+
+from hw1.external_sort import iter_runs, merge_runs, spill_sorted_run
+
+
+class IterRunsTestCase(unittest.TestCase):
+    def test_should_split_lines_into_runs_of_about_run_size(self):
+        runs = list(iter_runs([io.BytesIO(b"aa\nbb\ncc\ndd\n")], run_size=6))
+        self.assertEqual([[b"aa\n", b"bb\n"], [b"cc\n", b"dd\n"]], runs)
+
+    def test_should_terminate_last_line_of_every_file(self):
+        runs = list(iter_runs([io.BytesIO(b"a\nb"), io.BytesIO(b"c")]))
+        self.assertEqual([[b"a\n", b"b\n", b"c\n"]], runs)
+
+    def test_should_yield_nothing_for_empty_files(self):
+        self.assertEqual([], list(iter_runs([io.BytesIO(b""), io.BytesIO(b"")])))
+
+
+class MergeRunsTestCase(unittest.TestCase):
+    def test_should_merge_runs_in_several_passes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            runs = [[b"%03d\n" % i for i in range(start, 100, 7)] for start in range(7)]
+            paths = [spill_sorted_run(run[::-1], directory) for run in runs]
+            self.assertEqual([b"%03d\n" % i for i in range(100)], list(merge_runs(paths, directory, fan_in=2)))
+            # 7 runs are merged into 4 and then into 2, which are merged last, the merged runs are removed
+            self.assertEqual(2, len(os.listdir(directory)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr
+from threading import Event, Lock, Thread
+from typing import Callable, List
+from unittest.mock import patch
+
+from hw1.follow import FollowedFile, follow_files
+
+
+class SynchronizedBytesIO(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.lock = Lock()
+
+    def write(self, data) -> int:  # type: ignore
+        with self.lock:
+            return super().write(data)
+
+    def getvalue(self) -> bytes:
+        with self.lock:
+            return super().getvalue()
+
+
+class FollowFilesTestCase(unittest.TestCase):
+    use_inotify = True
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.out = SynchronizedBytesIO()
+        self.stop = Event()
+        self.threads: List[Thread] = []
+        if not self.use_inotify:
+            inotify_patch = patch("hw1.follow.open_inotify", return_value=None)
+            inotify_patch.start()
+            self.addCleanup(inotify_patch.stop)
+
+    def tearDown(self) -> None:
+        self.stop.set()
+        for thread in self.threads:
+            thread.join()
+        self.directory.cleanup()
+
+    def create_file(self, name: str, content: bytes) -> str:
+        filepath = os.path.join(self.directory.name, name)
+        with open(filepath, "wb") as f:
+            f.write(content)
+        return filepath
+
+    @staticmethod
+    def append(filepath: str, content: bytes) -> None:
+        with open(filepath, "ab") as f:
+            f.write(content)
+
+    def follow(self, *filepaths: str) -> None:
+        followed = []
+        for path in filepaths:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                followed.append(FollowedFile(path, f))
+        thread = Thread(
+            target=follow_files,
+            args=(followed, self.out, len(filepaths) > 1, filepaths[-1], self.stop, 0.05),
+        )
+        self.threads.append(thread)
+        thread.start()
+
+    def wait_for_output(self, expected: bytes, timeout: float = 5) -> None:
+        self.wait_until(lambda: self.out.getvalue() == expected, timeout)
+        self.assertEqual(expected, self.out.getvalue())
+
+    @staticmethod
+    def wait_until(condition: Callable[[], bool], timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_should_print_appended_data(self):
+        filepath = self.create_file("log", b"old\n")
+        self.follow(filepath)
+        self.append(filepath, b"new\n")
+        self.wait_for_output(b"new\n")
+        self.append(filepath, b"newer\n")
+        self.wait_for_output(b"new\nnewer\n")
+
+    def test_should_print_new_data_quickly(self):
+        filepath = self.create_file("log", b"")
+        self.follow(filepath)
+        time.sleep(0.3)
+        start = time.monotonic()
+        self.append(filepath, b"new\n")
+        self.wait_for_output(b"new\n")
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    def test_should_read_truncated_file_from_start(self):
+        filepath = self.create_file("log", b"old content\n")
+        self.follow(filepath)
+        with redirect_stderr(io.StringIO()):
+            with open(filepath, "wb") as f:
+                f.write(b"new\n")
+            self.wait_for_output(b"new\n")
+
+    def test_should_follow_rotated_file(self):
+        filepath = self.create_file("log", b"old\n")
+        self.follow(filepath)
+        with redirect_stderr(io.StringIO()):
+            self.append(filepath, b"before rotation\n")
+            os.rename(filepath, filepath + ".1")
+            self.append(filepath + ".1", b"late write\n")
+            self.create_file("log", b"after rotation\n")
+            self.wait_for_output(b"before rotation\nlate write\nafter rotation\n")
+
+    def test_should_print_headers_when_switching_files(self):
+        first = self.create_file("first", b"")
+        second = self.create_file("second", b"")
+        self.follow(first, second)
+        self.append(second, b"2\n")
+        self.wait_for_output(b"2\n")
+        self.append(first, b"1\n")
+        self.wait_for_output(f"2\n==> {first} <==\n1\n".encode())
+        self.append(second, b"3\n")
+        self.wait_for_output(f"2\n==> {first} <==\n1\n==> {second} <==\n3\n".encode())
+
+
+class PollingFollowFilesTestCase(FollowFilesTestCase):
+    use_inotify = False
+
+
+if __name__ == "__main__":
+    unittest.main()
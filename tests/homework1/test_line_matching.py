@@ -0,0 +1,56 @@
+import io
+import random
+import re
+import unittest
+
+from hw1.line_matching import LineMatcher, iter_matching_lines
+
+
+def naive_matching_lines(content: bytes, pattern: bytes, fixed_strings: bool):
+    lines = content.split(b"\n")
+    if content.endswith(b"\n"):
+        lines.pop()
+    for number, line in enumerate(lines, 1):
+        if (pattern in line) if fixed_strings else re.search(pattern, line):
+            yield number, line
+
+
+class LineMatcherTestCase(unittest.TestCase):
+    def matching_lines(self, content: bytes, pattern: bytes, fixed_strings: bool = False, block_size: int = 4):
+        matcher = LineMatcher(pattern, fixed_strings)
+        lines = iter_matching_lines(io.BufferedReader(io.BytesIO(content)), matcher, True, block_size)  # type: ignore
+        return [(number, buffer[start:end]) for number, buffer, start, end in lines]
+
+    def test_should_find_the_same_lines_as_line_by_line_search(self):
+        generator = random.Random(7)
+        patterns = [(b"ab", True), (b"", True), (b"ab", False), (b"a[^b]", False), (b"^b", False), (b"a$", False)]
+        patterns += [(b"^$", False), (b"^", False), (b"$", False), (b"x*", False)]
+        for _ in range(50):
+            content = bytes(generator.choice(b"ab\n ") for _ in range(generator.randrange(60)))
+            for pattern, fixed_strings in patterns:
+                for block_size in (1, 5, 1024):
+                    with self.subTest(content=content, pattern=pattern, block_size=block_size):
+                        self.assertEqual(
+                            list(naive_matching_lines(content, pattern, fixed_strings)),
+                            self.matching_lines(content, pattern, fixed_strings, block_size),
+                        )
+
+    def test_should_not_match_empty_line_after_last_newline(self):
+        self.assertEqual([], self.matching_lines(b"a\nb\n", b"^$", block_size=1024))
+        self.assertEqual([(2, b"")], self.matching_lines(b"a\n\nb\n", b"^$", block_size=1024))
+        self.assertEqual([(1, b"a"), (2, b"b")], self.matching_lines(b"a\nb\n", b"^", block_size=1024))
+
+    def test_should_not_match_empty_line_at_block_boundaries(self):
+        # every block of 2 bytes ends with a newline
+        self.assertEqual([(2, b"")], self.matching_lines(b"a\n\nb\n", b"^$", block_size=2))
+        self.assertEqual([(1, b"a"), (2, b""), (3, b"b")], self.matching_lines(b"a\n\nb\n", b"x*", block_size=2))
+
+    def test_should_never_match_fixed_strings_with_newlines(self):
+        self.assertEqual([], self.matching_lines(b"a\nb\n", b"a\nb", fixed_strings=True))
+
+    def test_should_find_match_after_a_match_across_lines(self):
+        self.assertEqual([(1, b"axy")], self.matching_lines(b"axy\nb\n", b"a[^z]*b|x", block_size=1024))
+
+
+if __name__ == "__main__":
+    unittest.main()
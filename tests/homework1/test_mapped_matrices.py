@@ -0,0 +1,91 @@
+import mmap
+import os
+import tempfile
+import unittest
+
+from hw1.mapped_matrices import (
+    HEADER,
+    MappedMatrix,
+    mapped_matrix_multiplication,
+    mapped_matrix_sum,
+    mapped_matrix_transpose,
+    rows_per_band,
+    tile_size,
+)
+from hw1.matrices import PYTHON_BACKEND, Matrix, matrix_backend, matrix_multiplication, matrix_sum, matrix_transpose
+from tests.homework1.test_matrices import random_rows
+
+# small enough to split the test matrices into many bands and tiles
+TINY_BUDGET = 64 * 1024
+
+
+class MappedMatrixTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def mapped(self, name: str, rows) -> MappedMatrix:
+        matrix = MappedMatrix.from_matrix(self.path(name), rows)
+        self.addCleanup(matrix.close)
+        return matrix
+
+    def test_should_store_header_and_raw_doubles(self):
+        rows = random_rows(3, 4)
+        self.mapped("a", rows)
+        self.assertEqual(HEADER.size + 12 * 8, os.path.getsize(self.path("a")))
+        with MappedMatrix(self.path("a")) as matrix:
+            self.assertEqual((3, 4), matrix.shape)
+            self.assertEqual(Matrix.from_rows(rows), matrix.to_matrix())
+
+    def test_should_reject_other_files(self):
+        with open(self.path("a"), "wb") as f:
+            f.write(b"not a matrix at all, just some text")
+        self.assertRaises(ValueError, MappedMatrix, self.path("a"))
+
+    def test_should_reject_truncated_files(self):
+        self.mapped("a", random_rows(3, 4)).close()
+        with open(self.path("a"), "r+b") as f:
+            f.truncate(HEADER.size + 8)
+        self.assertRaises(ValueError, MappedMatrix, self.path("a"))
+
+    def test_created_matrix_should_be_zeros(self):
+        with MappedMatrix.create(self.path("a"), 2, 3) as matrix:
+            self.assertEqual(Matrix(2, 3), matrix.to_matrix())
+        self.assertRaises(IndexError, MappedMatrix.create, self.path("b"), 0, 3)
+
+    def test_sum_should_equal_in_memory_sum(self):
+        rows1, rows2 = random_rows(70, 50, seed=1), random_rows(70, 50, seed=2)
+        with mapped_matrix_sum(self.mapped("a", rows1), self.mapped("b", rows2), self.path("c"), TINY_BUDGET) as result:
+            self.assertEqual(Matrix.from_rows(matrix_sum(rows1, rows2)), result.to_matrix())
+
+    def test_sum_should_fail_for_different_shapes(self):
+        with self.assertRaises(IndexError):
+            mapped_matrix_sum(self.mapped("a", [[1, 2]]), self.mapped("b", [[1], [2]]), self.path("c"))
+
+    def test_transpose_should_equal_in_memory_transpose(self):
+        rows = random_rows(90, 45, seed=3)
+        with mapped_matrix_transpose(self.mapped("a", rows), self.path("b"), TINY_BUDGET) as result:
+            self.assertEqual(Matrix.from_rows(matrix_transpose(rows)), result.to_matrix())
+
+    def test_multiplication_should_equal_in_memory_multiplication(self):
+        rows1, rows2 = random_rows(40, 70, seed=4), random_rows(70, 30, seed=5)
+        matrix1, matrix2 = self.mapped("a", rows1), self.mapped("b", rows2)
+        with matrix_backend(PYTHON_BACKEND):
+            expected = Matrix.from_rows(matrix_multiplication(rows1, rows2))
+        with mapped_matrix_multiplication(matrix1, matrix2, self.path("c"), TINY_BUDGET) as result:
+            self.assertEqual(expected, result.to_matrix())
+
+    def test_multiplication_should_fail_for_mismatching_shapes(self):
+        with self.assertRaises(IndexError):
+            mapped_matrix_multiplication(self.mapped("a", [[1, 2]]), self.mapped("b", [[1, 2]]), self.path("c"))
+
+    def test_bands_and_tiles_should_fit_in_budget(self):
+        self.assertEqual(1, rows_per_band(10 ** 9, 4, TINY_BUDGET))
+        self.assertLessEqual(4 * rows_per_band(1000, 4, 2 ** 20) * 1000 * 8, 2 ** 20)
+        size = tile_size(32, 3, 2 ** 20)
+        self.assertLessEqual(3 * (size * size * 32 + 2 * size * mmap.PAGESIZE), 2 ** 20)
+        self.assertGreater(3 * ((size + 1) * (size + 1) * 32 + 2 * (size + 1) * mmap.PAGESIZE), 2 ** 20)
@@ -0,0 +1,242 @@
+import random
+import unittest
+from array import array
+from typing import List
+
+from hw1.matrices import (
+    PYTHON_BACKEND,
+    STRASSEN_TOLERANCE,
+    Matrix,
+    TransposedMatrix,
+    check_and_matrix_shape,
+    dot_product,
+    matrix_backend,
+    matrix_multiplication,
+    matrix_sum,
+    matrix_transpose,
+    strassen_multiplication,
+)
+
+
+def multiply_rows_by_columns(rows1: List[List[float]], rows2: List[List[float]]) -> List[List[float]]:
+    """
+    The multiplication matrix_multiplication did before it was blocked.
+    """
+    columns = list(zip(*rows2))
+    return [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in rows1]
+
+
+def random_rows(n_rows: int, n_cols: int, seed: int = 0) -> List[List[float]]:
+    generator = random.Random(seed)
+    return [[generator.uniform(-1, 1) for _ in range(n_cols)] for _ in range(n_rows)]
+
+
+class MatrixTestCase(unittest.TestCase):
+    def test_should_store_elements_row_by_row(self):
+        matrix = Matrix.from_rows([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(array("d", [1, 2, 3, 4, 5, 6]), matrix.data)
+        self.assertEqual((2, 3), matrix.shape)
+        self.assertEqual(6, matrix[1, 2])
+        self.assertEqual(5, matrix[1][1])
+        self.assertEqual([[1, 2, 3], [4, 5, 6]], matrix.to_rows())
+
+    def test_rows_should_be_views(self):
+        matrix = Matrix(2, 2)
+        matrix.data[3] = 7
+        self.assertEqual([0, 7], matrix[1].tolist())
+
+    def test_should_reject_bad_shapes(self):
+        for rows in ([], [[]], [[1], [1, 2]]):
+            with self.subTest(rows=rows), self.assertRaises(IndexError):
+                Matrix.from_rows(rows)
+        with self.assertRaises(IndexError):
+            Matrix(2, 2, array("d", [1, 2, 3]))
+
+    def test_should_reject_elements_out_of_range(self):
+        matrix = Matrix(2, 3)
+        for index in ((2, 0), (0, 3), (-1, 0)):
+            with self.subTest(index=index), self.assertRaises(IndexError):
+                matrix[index]
+        with self.assertRaises(IndexError):
+            matrix[2]
+
+    def test_shape_should_be_known_without_looking_at_rows(self):
+        self.assertEqual((3, 4), check_and_matrix_shape(Matrix(3, 4)))
+
+
+class MatrixFunctionsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows1 = random_rows(5, 7, seed=1)
+        self.rows2 = random_rows(7, 3, seed=2)
+        self.matrix1 = Matrix.from_rows(self.rows1)
+        self.matrix2 = Matrix.from_rows(self.rows2)
+
+    def test_transpose_should_be_the_same_as_for_lists(self):
+        self.assertEqual(Matrix.from_rows(matrix_transpose(self.rows1)), matrix_transpose(self.matrix1))
+
+    def test_sum_should_be_the_same_as_for_lists(self):
+        expected = Matrix.from_rows(matrix_sum(self.rows1, self.rows1))
+        self.assertEqual(expected, matrix_sum(self.matrix1, self.matrix1))
+        self.assertEqual(expected, matrix_sum(self.rows1, self.matrix1))
+
+    def test_multiplication_should_be_the_same_as_for_lists(self):
+        expected = Matrix.from_rows(matrix_multiplication(self.rows1, self.rows2))
+        self.assertEqual(expected, matrix_multiplication(self.matrix1, self.matrix2))
+        self.assertEqual(expected, matrix_multiplication(self.matrix1, self.rows2))
+
+    def test_blocked_multiplication_should_be_identical_to_unblocked(self):
+        for n_rows, n_inner, n_cols in ((1, 1, 1), (5, 7, 3), (16, 16, 16), (9, 20, 11)):
+            rows1, rows2 = random_rows(n_rows, n_inner, seed=n_rows), random_rows(n_inner, n_cols, seed=n_cols)
+            expected = multiply_rows_by_columns(rows1, rows2)
+            for block_size in (1, 3, 4, 8, 100):
+                with self.subTest(shape=(n_rows, n_inner, n_cols), block_size=block_size):
+                    self.assertEqual(expected, matrix_multiplication(rows1, rows2, block_size))
+                    matrix = matrix_multiplication(Matrix.from_rows(rows1), Matrix.from_rows(rows2), block_size)
+                    self.assertEqual(Matrix.from_rows(expected), matrix)
+
+    def test_should_multiply_integers_exactly(self):
+        rows = [[2 ** 60, 1], [3, 2 ** 61]]
+        self.assertEqual(multiply_rows_by_columns(rows, rows), matrix_multiplication(rows, rows, block_size=1))
+
+    def test_should_keep_returning_lists_for_lists(self):
+        self.assertIsInstance(matrix_multiplication(self.rows1, self.rows2), list)
+        self.assertIsInstance(matrix_sum(self.rows1, self.rows1), list)
+        self.assertIsInstance(matrix_transpose(self.rows1), list)
+
+    def test_should_reject_mismatching_shapes(self):
+        with self.assertRaises(IndexError):
+            matrix_sum(self.matrix1, self.matrix2)
+        with self.assertRaises(IndexError):
+            matrix_multiplication(self.matrix2, self.matrix2)
+
+    def test_dot_product_should_accept_vector_matrices(self):
+        self.assertEqual(11, dot_product(Matrix.from_rows([[1, 2]]), Matrix.from_rows([[3], [4]])))
+        self.assertEqual(11, dot_product(Matrix.from_rows([[1, 2]])[0], array("d", [3, 4])))
+        with self.assertRaises(IndexError):
+            dot_product(self.matrix1, self.matrix1)
+
+
+class TransposedMatrixTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows = random_rows(3, 4, seed=1)
+        self.matrix = Matrix.from_rows(self.rows)
+
+    def test_transpose_should_be_a_view(self):
+        view = matrix_transpose(self.matrix)
+        self.assertIsInstance(view, TransposedMatrix)
+        self.assertIs(self.matrix.data, view.base.data)
+        self.assertEqual((4, 3), view.shape)
+        self.assertEqual(matrix_transpose(self.rows), view.to_rows())
+        self.assertEqual(self.rows[2][1], view[1, 2])
+        self.matrix.data[1] = 42
+        self.assertEqual(42, view[1][0])
+
+    def test_transposing_twice_should_give_the_matrix(self):
+        self.assertIs(self.matrix, matrix_transpose(matrix_transpose(self.matrix)))
+        self.assertIs(self.matrix, self.matrix.T.T)
+
+    def test_copy_should_not_share_storage(self):
+        copy = self.matrix.T.copy()
+        self.assertEqual(Matrix.from_rows(matrix_transpose(self.rows)), copy)
+        self.matrix.data[0] = 42
+        self.assertNotEqual(42, copy[0, 0])
+
+    def test_views_should_be_operands(self):
+        expected = Matrix.from_rows(matrix_sum(matrix_transpose(self.rows), matrix_transpose(self.rows)))
+        self.assertEqual(expected, matrix_sum(self.matrix.T, self.matrix.T))
+        expected = Matrix.from_rows(matrix_multiplication(self.rows, matrix_transpose(self.rows)))
+        self.assertEqual(expected, matrix_multiplication(self.matrix, self.matrix.T))
+
+
+class InPlaceTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows1 = random_rows(5, 7, seed=1)
+        self.rows2 = random_rows(7, 5, seed=2)
+        self.square = random_rows(5, 5, seed=3)
+
+    def test_sum_should_be_written_into_out(self):
+        out = Matrix(5, 5)
+        data = out.data
+        self.assertIs(out, matrix_sum(self.square, self.square, out=out))
+        self.assertIs(data, out.data)
+        self.assertEqual(Matrix.from_rows(matrix_sum(self.square, self.square)), out)
+
+    def test_should_add_in_place(self):
+        matrix = Matrix.from_rows(self.square)
+        matrix += self.square
+        self.assertEqual(Matrix.from_rows(matrix_sum(self.square, self.square)), matrix)
+        # the transpose of the matrix is read before its elements are overwritten
+        matrix = Matrix.from_rows(self.square)
+        matrix += matrix.T
+        self.assertEqual(Matrix.from_rows(matrix_sum(self.square, matrix_transpose(self.square))), matrix)
+
+    def test_product_should_be_written_into_out(self):
+        out = Matrix.from_rows(self.square)
+        self.assertIs(out, matrix_multiplication(self.rows1, self.rows2, block_size=3, out=out))
+        self.assertEqual(Matrix.from_rows(matrix_multiplication(self.rows1, self.rows2)), out)
+
+    def test_product_should_be_accumulated_into_out(self):
+        out = Matrix.from_rows(self.square)
+        matrix_multiplication(self.rows1, self.rows2, out=out, accumulate=True)
+        expected = matrix_sum(self.square, matrix_multiplication(self.rows1, self.rows2))
+        for expected_row, row in zip(expected, out):
+            for x, y in zip(expected_row, row):
+                self.assertAlmostEqual(x, y)
+
+    def test_product_of_out_should_be_written_into_it(self):
+        matrix = Matrix.from_rows(self.square)
+        expected = Matrix.from_rows(matrix_multiplication(self.square, matrix_transpose(self.square)))
+        self.assertEqual(expected, matrix_multiplication(matrix, matrix.T, out=matrix))
+
+    def test_out_should_be_a_matrix_of_the_shape_of_the_result(self):
+        with self.assertRaises(IndexError):
+            matrix_sum(self.square, self.square, out=Matrix(5, 4))
+        with self.assertRaises(IndexError):
+            matrix_multiplication(self.rows1, self.rows2, out=Matrix(7, 7))
+        with self.assertRaises(TypeError):
+            matrix_sum(self.square, self.square, out=self.square)
+
+    def test_large_out_should_be_written_by_every_backend(self):
+        rows = random_rows(70, 70, seed=4)
+        with matrix_backend(PYTHON_BACKEND):
+            expected = Matrix.from_rows(matrix_multiplication(rows, rows))
+        out = Matrix(70, 70)
+        matrix_multiplication(Matrix.from_rows(rows), rows, out=out)
+        for x, y in zip(expected.data, out.data):
+            self.assertAlmostEqual(x, y)
+
+
+class StrassenTestCase(unittest.TestCase):
+    def assertWithinTolerance(self, expected, actual, rows1, rows2) -> None:
+        scale = max(len(rows1), len(rows2), len(rows2[0]))
+        scale *= max(abs(x) for row in rows1 for x in row) * max(abs(x) for row in rows2 for x in row)
+        for expected_row, row in zip(expected, actual):
+            for x, y in zip(expected_row, row):
+                self.assertLessEqual(abs(x - y), STRASSEN_TOLERANCE * scale)
+
+    def test_should_be_within_tolerance_of_multiplication(self):
+        with matrix_backend(PYTHON_BACKEND):
+            for n_rows, n_inner, n_cols in ((1, 1, 1), (2, 2, 2), (16, 16, 16), (33, 17, 9), (48, 48, 48)):
+                rows1, rows2 = random_rows(n_rows, n_inner, seed=n_rows), random_rows(n_inner, n_cols, seed=n_cols)
+                expected = matrix_multiplication(rows1, rows2)
+                for crossover in (2, 5, 8):
+                    with self.subTest(shape=(n_rows, n_inner, n_cols), crossover=crossover):
+                        product = strassen_multiplication(rows1, rows2, crossover)
+                        self.assertEqual((n_rows, n_cols), check_and_matrix_shape(product))
+                        self.assertWithinTolerance(expected, product, rows1, rows2)
+
+    def test_should_multiply_integers_exactly(self):
+        rows1, rows2 = [[i * 7 + j for j in range(7)] for i in range(5)], [[i - j for j in range(3)] for i in range(7)]
+        self.assertEqual(multiply_rows_by_columns(rows1, rows2), strassen_multiplication(rows1, rows2, crossover=1))
+
+    def test_should_return_matrix_for_matrices(self):
+        rows = random_rows(6, 6, seed=1)
+        product = strassen_multiplication(Matrix.from_rows(rows), rows, crossover=2)
+        self.assertIsInstance(product, Matrix)
+        self.assertWithinTolerance(matrix_multiplication(rows, rows), product, rows, rows)
+        with self.assertRaises(IndexError):
+            strassen_multiplication(rows, [[1, 2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
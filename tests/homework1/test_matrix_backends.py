@@ -0,0 +1,153 @@
+import importlib.util
+import unittest
+from fractions import Fraction
+from math import isclose
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from hw1.matrices import (
+    AUTO_BACKEND,
+    NUMPY_BACKEND,
+    PYTHON_BACKEND,
+    Matrix,
+    TransposedMatrix,
+    angle_between_vectors,
+    dot_product,
+    get_backend,
+    matrix_backend,
+    matrix_multiplication,
+    matrix_sum,
+    matrix_transpose,
+    set_backend,
+)
+from tests.homework1.test_matrices import random_rows
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class BackendSelectionTestCase(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_backend(AUTO_BACKEND)
+
+    def test_should_select_automatically_by_default(self):
+        self.assertEqual(AUTO_BACKEND, get_backend())
+
+    def test_should_restore_backend_after_with_block(self):
+        with matrix_backend(PYTHON_BACKEND):
+            self.assertEqual(PYTHON_BACKEND, get_backend())
+        self.assertEqual(AUTO_BACKEND, get_backend())
+
+    def test_should_reject_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_backend("fortran")
+
+    @unittest.skipIf(HAS_NUMPY, "NumPy is installed")
+    def test_should_not_select_numpy_if_it_is_not_installed(self):
+        with self.assertRaises(ImportError):
+            set_backend(NUMPY_BACKEND)
+
+    def test_should_dispatch_large_inputs_only(self):
+        backend = SimpleNamespace(matrix_sum=lambda *_: "numpy")
+        matrix = Matrix.from_rows([[1.0, 2.0], [3.0, 4.0]])
+        with patch("hw1.matrices.load_numpy_backend", return_value=backend):
+            self.assertEqual(Matrix.from_rows([[2.0, 4.0], [6.0, 8.0]]), matrix_sum(matrix, matrix))
+            with patch("hw1.matrices.NUMPY_MIN_SIZE", 8):
+                self.assertEqual("numpy", matrix_sum(matrix, matrix))
+                with matrix_backend(PYTHON_BACKEND):
+                    self.assertEqual(Matrix.from_rows([[2.0, 4.0], [6.0, 8.0]]), matrix_sum(matrix, matrix))
+
+    def test_should_not_dispatch_lists_in_auto_mode(self):
+        backend = SimpleNamespace(matrix_sum=lambda *_: "numpy")
+        rows = [[1.0, 2.0], [3.0, 4.0]]
+        with patch("hw1.matrices.load_numpy_backend", return_value=backend), patch("hw1.matrices.NUMPY_MIN_SIZE", 8):
+            self.assertEqual([[2.0, 4.0], [6.0, 8.0]], matrix_sum(rows, rows))
+            self.assertEqual(Matrix.from_rows([[2.0, 4.0], [6.0, 8.0]]), matrix_sum(Matrix.from_rows(rows), rows))
+            with matrix_backend(NUMPY_BACKEND):
+                self.assertEqual("numpy", matrix_sum(rows, rows))
+
+    def test_should_compute_large_lists_of_other_numbers_exactly_in_auto_mode(self):
+        n = 64
+        identity = [[2 ** 60 if i == j else 0 for j in range(n)] for i in range(n)]
+        ones = [[1] * n for _ in range(n)]
+        self.assertEqual(
+            [[(2 ** 60 + 1 if i == j else 1) * 2 ** 60 for j in range(n)] for i in range(n)],
+            matrix_multiplication(matrix_sum(identity, ones), identity),
+        )
+        thirds = [[Fraction(1, 3)] * n for _ in range(n)]
+        self.assertEqual([[Fraction(2, 3)] * n for _ in range(n)], matrix_sum(thirds, thirds))
+        imaginary = [[1j] * n for _ in range(n)]
+        self.assertEqual([[2j] * n for _ in range(n)], matrix_sum(imaginary, imaginary))
+
+    def test_should_run_python_code_if_numpy_is_missing(self):
+        rows = random_rows(3, 3)
+        expected = matrix_multiplication(rows, rows)
+        with patch("hw1.matrices.load_numpy_backend", return_value=None), patch("hw1.matrices.NUMPY_MIN_SIZE", 1):
+            self.assertEqual(expected, matrix_multiplication(rows, rows))
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class BackendParityTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        import numpy as np
+
+        self.np = np
+        self.rows1 = random_rows(6, 9, seed=1)
+        self.rows2 = random_rows(9, 4, seed=2)
+        self.square = random_rows(6, 9, seed=3)
+
+    def assertAllClose(self, expected, actual) -> None:
+        if isinstance(actual, Matrix):
+            actual = actual.to_rows()
+        self.assertTrue(self.np.allclose(self.np.asarray(expected), self.np.asarray(actual), rtol=1e-12, atol=1e-12))
+
+    def compute_with_both(self, function, *operands):
+        with matrix_backend(PYTHON_BACKEND):
+            expected = function(*operands)
+        with matrix_backend(NUMPY_BACKEND):
+            actual = function(*operands)
+        return expected, actual
+
+    def test_matrix_functions_should_agree(self):
+        cases = (
+            (matrix_transpose, (self.rows1,)),
+            (matrix_sum, (self.rows1, self.square)),
+            (matrix_multiplication, (self.rows1, self.rows2)),
+        )
+        for function, operands in cases:
+            for convert in (list, Matrix.from_rows, self.np.asarray):
+                with self.subTest(function=function.__name__, convert=convert.__name__):
+                    converted = [convert(operand) for operand in operands]
+                    expected, actual = self.compute_with_both(function, *converted)
+                    self.assertAllClose(expected, actual)
+                    if function is matrix_transpose and convert is Matrix.from_rows:
+                        # a Matrix is transposed as a view by both backends
+                        self.assertIsInstance(actual, TransposedMatrix)
+                    else:
+                        self.assertIsInstance(actual, type(converted[0]))
+
+    def test_vector_functions_should_agree(self):
+        vector1, vector2 = self.rows1[0], self.rows1[1]
+        for function in (dot_product, angle_between_vectors):
+            for convert in (list, self.np.asarray):
+                with self.subTest(function=function.__name__, convert=convert.__name__):
+                    expected, actual = self.compute_with_both(function, convert(vector1), convert(vector2))
+                    self.assertTrue(isclose(expected, actual, rel_tol=1e-12))
+
+    def test_should_raise_index_error_on_mismatching_shapes(self):
+        with matrix_backend(NUMPY_BACKEND):
+            for function, operands in (
+                (matrix_sum, (self.rows1, self.rows2)),
+                (matrix_multiplication, (self.rows1, self.rows1)),
+                (dot_product, (self.rows1[0], self.rows2[0])),
+                (matrix_transpose, (self.np.zeros((0, 3)),)),
+            ):
+                with self.subTest(function=function.__name__), self.assertRaises(IndexError):
+                    function(*[self.np.asarray(operand) for operand in operands])
+
+    def test_should_dispatch_ndarrays_in_auto_mode(self):
+        result = matrix_sum(self.np.ones((2, 2)), [[1.0, 1.0], [1.0, 1.0]])
+        self.assertIsInstance(result, self.np.ndarray)
+
+
+if __name__ == "__main__":
+    unittest.main()
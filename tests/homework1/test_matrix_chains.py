@@ -0,0 +1,78 @@
+import unittest
+from functools import reduce
+
+from hw1.matrices import Matrix, matrix_multiplication
+from hw1.matrix_chains import chain_shapes, matrix_power, multiply_chain, order_flops, plan_chain
+from tests.homework1.test_matrices import random_rows
+
+
+class MatrixChainTestCase(unittest.TestCase):
+    def test_should_plan_textbook_chain(self):
+        # the example of Cormen et al., 15125 multiplications
+        shapes = [(30, 35), (35, 15), (15, 5), (5, 10), (10, 20), (20, 25)]
+        plan = plan_chain(shapes)
+        self.assertEqual(((0, (1, 2)), ((3, 4), 5)), plan.order)
+        self.assertEqual(2 * 15125, plan.flops)
+        self.assertEqual(plan.flops, order_flops(shapes, plan.order))
+
+    def test_plan_should_be_cheapest_order(self):
+        shapes = [(10, 100), (100, 5), (5, 50)]
+        self.assertEqual(((0, 1), 2), plan_chain(shapes).order)
+        self.assertLess(plan_chain(shapes).flops, order_flops(shapes, (0, (1, 2))))
+        self.assertEqual((0, 0), plan_chain([(3, 4)]))
+
+    def test_product_should_equal_pairwise_products(self):
+        rows = [
+            random_rows(4, 9, seed=1),
+            random_rows(9, 2, seed=2),
+            random_rows(2, 7, seed=3),
+            random_rows(7, 3, seed=4),
+        ]
+        expected = reduce(matrix_multiplication, rows)
+        for convert in (list, Matrix.from_rows):
+            with self.subTest(convert=convert.__name__):
+                product, flops = multiply_chain(*map(convert, rows))
+                for expected_row, row in zip(expected, product):
+                    for x, y in zip(expected_row, row):
+                        self.assertAlmostEqual(x, y)
+                self.assertEqual(plan_chain([(4, 9), (9, 2), (2, 7), (7, 3)]).flops, flops)
+
+    def test_should_check_every_shape_before_multiplying(self):
+        with self.assertRaises(IndexError):
+            multiply_chain([[1, 2]], [[1], [2]], [[1, 2]], [[1, 2]])
+        with self.assertRaises(IndexError):
+            chain_shapes([[[1, 2]], [[1], [2, 3]]])
+        with self.assertRaises(ValueError):
+            multiply_chain()
+
+
+class MatrixPowerTestCase(unittest.TestCase):
+    def test_should_compute_fibonacci_numbers_exactly(self):
+        power, flops = matrix_power([[1, 1], [1, 0]], 90)
+        self.assertEqual(2880067194370816120, power[0][1])
+        # 6 squarings and 3 more multiplications for the 4 ones of 0b1011010
+        self.assertEqual(9 * 2 * 2 ** 3, flops)
+
+    def test_should_equal_repeated_multiplication(self):
+        matrix = Matrix.from_rows(random_rows(4, 4, seed=1))
+        expected = matrix
+        for power in range(1, 10):
+            with self.subTest(power=power):
+                result, _ = matrix_power(matrix, power)
+                for x, y in zip(expected.data, result.data):
+                    self.assertAlmostEqual(x, y)
+            expected = matrix_multiplication(expected, matrix)
+
+    def test_power_zero_should_be_identity(self):
+        self.assertEqual(Matrix.from_rows([[1, 0], [0, 1]]), matrix_power(Matrix(2, 2), 0).product)
+        self.assertEqual(([[1, 0], [0, 1]], 0), matrix_power([[5, 6], [7, 8]], 0))
+
+    def test_should_reject_non_square_matrices_and_negative_powers(self):
+        with self.assertRaises(IndexError):
+            matrix_power([[1, 2]], 2)
+        with self.assertRaises(ValueError):
+            matrix_power([[1]], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest import mock
+
+from hw1.matrices import (
+    Matrix,
+    TransposedMatrix,
+    blocked_rows_by_columns,
+    matrix_multiplication,
+    matrix_sum,
+    matrix_transpose,
+)
+from hw1.matrix_expressions import MatrixExpression, MatrixLeaf, ProductExpression, SumExpression, TransposedLeaf, lazy
+from tests.homework1.test_matrices import random_rows
+
+
+class MatrixExpressionTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.a = random_rows(5, 7, seed=1)
+        self.b = random_rows(7, 3, seed=2)
+        self.c = random_rows(5, 3, seed=3)
+
+    def test_should_equal_eager_sum_of_product(self):
+        expected = Matrix.from_rows(matrix_sum(matrix_multiplication(self.a, self.b), self.c))
+        self.assertEqual(expected, (lazy(self.a) @ self.b + self.c).evaluate())
+        self.assertEqual(expected, (lazy(Matrix.from_rows(self.a)) @ Matrix.from_rows(self.b) + self.c).evaluate())
+
+    def test_should_equal_eager_expression_with_transposes(self):
+        expected = matrix_transpose(matrix_sum(matrix_multiplication(self.a, self.b), self.c))
+        result = (self.c + lazy(self.a) @ self.b).T.evaluate()
+        self.assertEqual(
+            Matrix.from_rows(
+                matrix_sum(matrix_transpose(self.c), matrix_transpose(matrix_multiplication(self.a, self.b)))
+            ),
+            result,
+        )
+        self.assertEqual(Matrix.from_rows(expected), (lazy(self.a) @ self.b + self.c).T.evaluate())
+
+    def test_should_fold_double_transposes(self):
+        leaf = lazy(self.a)
+        self.assertIs(leaf, leaf.T.T)
+        self.assertIsInstance(leaf.T, TransposedLeaf)
+        self.assertEqual(Matrix.from_rows(self.a), leaf.T.T.T.T.evaluate())
+
+    def test_should_push_transposes_down_to_matrices(self):
+        expression = (lazy(self.a) @ self.b + self.c).T
+        self.assertIsInstance(expression, SumExpression)
+        self.assertIsInstance(expression.left, ProductExpression)
+        self.assertIsInstance(expression.left.left, TransposedLeaf)
+        self.assertIsInstance(expression.right, TransposedLeaf)
+
+    def test_product_should_read_columns_of_transposed_matrix_without_transposing(self):
+        with mock.patch("hw1.matrix_expressions.blocked_rows_by_columns") as multiply:
+            (lazy(self.a) @ lazy(self.a).T).evaluate()
+        rows, columns = multiply.call_args[0][:2]
+        self.assertEqual(self.a, rows)
+        self.assertIs(self.a[0], rows[0])
+        self.assertIs(self.a, columns)
+
+    def test_product_should_read_columns_of_matrix_through_transposed_view(self):
+        b = Matrix.from_rows(self.b)
+        with mock.patch.object(MatrixExpression, "evaluate", side_effect=AssertionError("an operand is copied")):
+            with mock.patch("hw1.matrix_expressions.blocked_rows_by_columns") as multiply:
+                list((lazy(self.a) @ b).iter_elements())
+        columns = multiply.call_args[0][1]
+        self.assertIsInstance(columns, TransposedMatrix)
+        self.assertIs(b, columns.base)
+
+    def test_product_should_be_computed_band_by_band(self):
+        expected = Matrix.from_rows(matrix_sum(matrix_multiplication(self.a, self.b, block_size=2), self.c))
+        with mock.patch("hw1.matrix_expressions.blocked_rows_by_columns", wraps=blocked_rows_by_columns) as multiply:
+            result = (ProductExpression(lazy(self.a), lazy(self.b), block_size=2) + self.c).evaluate()
+        self.assertEqual(expected, result)
+        self.assertEqual([2, 2, 1], [len(call[0][0]) for call in multiply.call_args_list])
+
+    def test_should_not_build_expressions_without_elements(self):
+        class Expression(MatrixExpression):
+            def transposed(self):
+                return self
+
+        with self.assertRaises(TypeError):
+            Expression((1, 1))
+
+    def test_sum_should_not_materialize_operands(self):
+        expression = lazy(self.c) + lazy(self.c) + self.c
+        with mock.patch.object(MatrixLeaf, "rows", side_effect=AssertionError("materialized")):
+            self.assertEqual(Matrix.from_rows(matrix_sum(matrix_sum(self.c, self.c), self.c)), expression.evaluate())
+
+    def test_should_accumulate_into_matrix_in_place(self):
+        expected = Matrix.from_rows(matrix_sum(self.c, matrix_multiplication(self.a, self.b)))
+        result = Matrix.from_rows(self.c)
+        data = result.data
+        with mock.patch.object(ProductExpression, "evaluate", side_effect=AssertionError("materialized")):
+            result += lazy(self.a) @ self.b
+        self.assertIs(data, result.data)
+        for x, y in zip(expected.data, result.data):
+            self.assertAlmostEqual(x, y)
+
+    def test_should_accumulate_expressions_of_the_matrix_itself(self):
+        square = random_rows(5, 5, seed=4)
+        result = Matrix.from_rows(square)
+        result += lazy(result) @ result.T + lazy(result).T
+        product = matrix_multiplication(square, matrix_transpose(square))
+        expected = matrix_sum(matrix_sum(square, product), matrix_transpose(square))
+        for x, y in zip(Matrix.from_rows(expected).data, result.data):
+            self.assertAlmostEqual(x, y)
+
+    def test_should_check_shapes_when_built(self):
+        with self.assertRaises(IndexError):
+            lazy(self.a) @ self.c
+        with self.assertRaises(IndexError):
+            lazy(self.a) + self.b
+        with self.assertRaises(IndexError):
+            lazy([[1, 2], [3]])
@@ -0,0 +1,82 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+from hw1.output import BROKEN_PIPE_EXIT_CODE, BufferedOutput
+
+
+class CountingBytesIO(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.n_writes = 0
+
+    def write(self, data) -> int:  # type: ignore
+        self.n_writes += 1
+        return super().write(data)
+
+
+class BufferedOutputTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = CountingBytesIO()
+
+    def test_should_write_nothing_until_block_is_full(self):
+        out = BufferedOutput(self.stream, block_size=10)
+        out.write_line(b"12345")
+        self.assertEqual(0, self.stream.n_writes)
+        out.write_line(b"6789")
+        self.assertEqual(1, self.stream.n_writes)
+        self.assertEqual(b"12345\n6789\n", self.stream.getvalue())
+
+    def test_should_write_everything_on_exit(self):
+        with BufferedOutput(self.stream) as out:
+            out.write(b"1\t")
+            out.write_line(b"line")
+        self.assertEqual(b"1\tline\n", self.stream.getvalue())
+
+    def test_should_flush_every_line_if_line_buffered(self):
+        out = BufferedOutput(self.stream, line_buffered=True)
+        out.write_line(b"first\n")
+        out.write_line(b"second\n")
+        self.assertEqual(2, self.stream.n_writes)
+
+    def test_should_be_block_buffered_if_not_tty(self):
+        self.assertFalse(BufferedOutput(self.stream).line_buffered)
+
+    def test_should_not_add_newline_to_empty_line(self):
+        with BufferedOutput(self.stream) as out:
+            out.write_line(b"")
+        self.assertEqual(b"", self.stream.getvalue())
+
+    def test_should_keep_order_of_large_writes(self):
+        with BufferedOutput(self.stream, block_size=10) as out:
+            out.write(b"small")
+            out.write(b"large" * 10)
+            out.write(b"small")
+        self.assertEqual(b"small" + b"large" * 10 + b"small", self.stream.getvalue())
+
+
+class BrokenPipeTestCase(unittest.TestCase):
+    def test_should_exit_quietly_when_output_is_closed(self):
+        script = (
+            "from hw1.output import BufferedOutput, exit_on_broken_pipe\n"
+            "with exit_on_broken_pipe(), BufferedOutput.for_stdout() as out:\n"
+            "    while True:\n"
+            "        out.write_line(b'line')\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        process = subprocess.Popen(
+            [sys.executable, "-c", script], cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        assert process.stdout is not None and process.stderr is not None
+        self.assertEqual(b"line\n", process.stdout.readline())
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        self.assertEqual(BROKEN_PIPE_EXIT_CODE, process.wait())
+        self.assertEqual(b"", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
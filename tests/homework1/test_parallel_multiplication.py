@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+from hw1 import matrices
+from hw1.matrices import (
+    AUTO_BACKEND,
+    PYTHON_BACKEND,
+    Matrix,
+    get_backend,
+    matrix_backend,
+    matrix_multiplication,
+)
+from hw1.parallel_multiplication import parallel_multiplication, split_into_bands
+from tests.homework1.test_matrices import random_rows
+
+
+class SplitIntoBandsTestCase(unittest.TestCase):
+    def test_should_cover_rows_with_even_bands(self):
+        self.assertEqual([(0, 3), (3, 6), (6, 10)], split_into_bands(10, 3))
+
+    def test_should_not_make_empty_bands(self):
+        self.assertEqual([(0, 1), (1, 2)], split_into_bands(2, 8))
+
+
+class ParallelMultiplicationTestCase(unittest.TestCase):
+    def test_should_equal_serial_multiplication(self):
+        rows1, rows2 = random_rows(13, 9, seed=1), random_rows(9, 11, seed=2)
+        expected = matrix_multiplication(rows1, rows2, block_size=4)
+        self.assertEqual([element for row in expected for element in row], parallel_multiplication(rows1, rows2, 3, 4))
+
+    def test_should_multiply_in_parallel_above_cutoff(self):
+        rows1, rows2 = random_rows(6, 5, seed=3), random_rows(5, 4, seed=4)
+        with mock.patch.object(matrices, "PARALLEL_MIN_WORK", 0):
+            self.assertEqual(matrix_multiplication(rows1, rows2), matrix_multiplication(rows1, rows2, jobs=2))
+            self.assertEqual(
+                matrix_multiplication(Matrix.from_rows(rows1), rows2),
+                matrix_multiplication(Matrix.from_rows(rows1), rows2, jobs=2),
+            )
+
+    def test_jobs_should_select_pool_in_default_mode(self):
+        self.assertEqual(AUTO_BACKEND, get_backend())
+        # large enough to be multiplied by NumPy in the auto mode if it is installed
+        matrix = Matrix.from_rows(random_rows(64, 64, seed=5))
+        with mock.patch.object(matrices, "PARALLEL_MIN_WORK", 0), mock.patch(
+            "hw1.parallel_multiplication.parallel_multiplication", wraps=parallel_multiplication
+        ) as parallel:
+            product = matrix_multiplication(matrix, matrix, jobs=2)
+        parallel.assert_called_once()
+        with matrix_backend(PYTHON_BACKEND):
+            self.assertEqual(matrix_multiplication(matrix, matrix), product)
+
+    def test_should_stay_serial_below_cutoff(self):
+        with mock.patch("hw1.parallel_multiplication.parallel_multiplication") as parallel:
+            self.assertEqual([[2]], matrix_multiplication([[1]], [[2]], jobs=4))
+            matrix_multiplication(random_rows(4, 4), random_rows(4, 4), jobs=4)
+        parallel.assert_not_called()
@@ -0,0 +1,136 @@
+import gzip
+import io
+import os
+import unittest
+from concurrent.futures import wait
+from threading import Event, Thread
+from typing import Dict
+from unittest.mock import patch
+
+from hw1 import readers
+from hw1.bashcommands import head, nl, wc
+from hw1.prefetch import Prefetcher, read_ahead
+from hw1.readers import open_input, prefetching
+from tests.homework1.test_bashcommands import CommandTestCase
+
+
+class PrefetchedFileTestCase(CommandTestCase):
+    content = b"".join(b"line %d\n" % i for i in range(100))
+
+    def test_should_read_the_whole_file(self):
+        filepath = self.create_file("file", self.content)
+        for size in (0, 1, 10, len(self.content), 2 * len(self.content)):
+            with self.subTest(size=size):
+                prefetched = read_ahead(filepath, size)
+                assert prefetched is not None
+                with io.BufferedReader(prefetched) as f:
+                    self.assertEqual(self.content, f.read())
+
+    def test_should_seek_inside_and_after_head(self):
+        filepath = self.create_file("file", self.content)
+        prefetched = read_ahead(filepath, 10)
+        assert prefetched is not None
+        with io.BufferedReader(prefetched) as f:
+            for position in (5, 20, 0, 9, len(self.content) - 3):
+                f.seek(position)
+                self.assertEqual(position, f.tell())
+                self.assertEqual(self.content[position : position + 7], f.read(7))
+            f.seek(-4, os.SEEK_END)
+            self.assertEqual(self.content[-4:], f.read())
+
+    def test_should_not_read_special_files_ahead(self):
+        fifo = os.path.join(self.directory.name, "fifo")
+        os.mkfifo(fifo)
+        self.assertIsNone(read_ahead(fifo, 10))
+        self.assertIsNone(read_ahead("-", 10))
+        self.assertIsNone(read_ahead(os.path.join(self.directory.name, "missing"), 10))
+
+
+class PrefetcherTestCase(CommandTestCase):
+    def test_should_give_files_in_order_only(self):
+        first = self.create_file("first", b"1\n")
+        second = self.create_file("second", b"2\n")
+        prefetcher = Prefetcher([first, second], n_ahead=1, size=1)
+        try:
+            self.assertIsNone(prefetcher.take(second))
+            prefetched = prefetcher.take(first)
+            assert prefetched is not None
+            with io.BufferedReader(prefetched) as f:
+                self.assertEqual(b"1\n", f.read())
+        finally:
+            prefetcher.close()
+        self.assertEqual(0, len(prefetcher.pending))
+
+    def test_open_input_should_use_files_read_ahead(self):
+        filepaths = [self.create_file(f"file{i}", b"%d\n" % i) for i in range(4)]
+        with prefetching(filepaths, n_ahead=2):
+            prefetcher = readers._prefetcher.get()
+            assert prefetcher is not None
+            wait([future for _, future in prefetcher.pending])
+            # the files read ahead are already open
+            os.remove(filepaths[1])
+            for i, filepath in enumerate(filepaths):
+                with open_input(filepath) as f:
+                    self.assertEqual(b"%d\n" % i, f.read())
+        self.assertIsNone(readers._prefetcher.get())
+
+    def test_threads_leaving_in_any_order_should_restore_their_own_prefetchers(self):
+        filepaths = [self.create_file(f"file{i}", b"%d\n" % i) for i in range(3)]
+        first_entered, second_entered, first_left = Event(), Event(), Event()
+        seen: Dict[str, object] = {}
+
+        def first() -> None:
+            with prefetching(filepaths, n_ahead=1):
+                seen["first"] = readers._prefetcher.get()
+                first_entered.set()
+                second_entered.wait()
+            first_left.set()
+            seen["first after"] = readers._prefetcher.get()
+
+        def second() -> None:
+            first_entered.wait()
+            with prefetching(filepaths, n_ahead=1):
+                seen["second"] = readers._prefetcher.get()
+                second_entered.set()
+                first_left.wait()
+                seen["second after first left"] = readers._prefetcher.get()
+            seen["second after"] = readers._prefetcher.get()
+
+        threads = [Thread(target=first), Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIsNotNone(seen["first"])
+        self.assertIsNotNone(seen["second"])
+        self.assertIsNot(seen["first"], seen["second"])
+        self.assertIs(seen["second"], seen["second after first left"])
+        self.assertIsNone(seen["first after"])
+        self.assertIsNone(seen["second after"])
+        self.assertIsNone(readers._prefetcher.get())
+
+
+class PrefetchingCommandsTestCase(CommandTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.filepaths = [self.create_file(f"file{i}", b"word %d\n\n" % i * (i * 50)) for i in range(6)]
+        self.filepaths.insert(2, "missing")
+        self.filepaths.append(self.create_file("file.gz", gzip.compress(b"a\nb c\n")))
+
+    def test_output_should_be_the_same_as_without_prefetching(self):
+        for command in (wc, nl, head):
+            with self.subTest(command=command.__name__):
+                expected = self.run_command(command, *self.filepaths, prefetch=0)
+                self.assertEqual(expected, self.run_command(command, *self.filepaths, prefetch=3))
+                with patch("hw1.readers.MMAP_MIN_SIZE", 1), patch("hw1.readers.PREFETCH_SIZE", 100):
+                    self.assertEqual(expected, self.run_command(command, *self.filepaths, prefetch=2))
+
+    def test_should_read_stdin_between_files(self):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(b"x\n")))
+        with patch("sys.stdin", stdin):
+            output = self.run_command(head, self.filepaths[0], "-", self.filepaths[-1])
+        self.assertIn("==> - <==\nx\n", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
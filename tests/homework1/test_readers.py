@@ -0,0 +1,108 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from hw1.readers import iter_chunks, iter_lines, open_input
+
+
+class ReadersTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.file = tempfile.NamedTemporaryFile(delete=False)
+        self.content = b"".join(b"line %d\n" % i for i in range(1000)) + b"last"
+        self.file.write(self.content)
+        self.file.close()
+        self.mmap_min_size = patch("hw1.readers.MMAP_MIN_SIZE", 1)
+        self.mmap_min_size.start()
+
+    def tearDown(self) -> None:
+        self.mmap_min_size.stop()
+        os.remove(self.file.name)
+
+    def test_mapped_lines_should_be_memoryviews(self):
+        with open(self.file.name, "rb") as f:
+            lines = iter_lines(f)
+            self.assertIsInstance(next(lines), memoryview)
+            lines.close()
+
+    def test_mapped_lines_should_be_the_same_as_streamed(self):
+        with open(self.file.name, "rb") as f:
+            self.assertEqual(self.content.splitlines(keepends=True), [bytes(line) for line in iter_lines(f)])
+
+    def test_mapped_chunks_should_be_the_same_as_streamed(self):
+        with open(self.file.name, "rb") as f:
+            self.assertEqual(self.content, b"".join(iter_chunks(f, 1000)))
+
+    def test_should_stream_file_like_objects_without_descriptor(self):
+        f = io.BytesIO(self.content)
+        self.assertEqual(self.content.splitlines(keepends=True), list(iter_lines(f)))
+
+    def test_should_stream_the_rest_of_file_resized_while_reading_lines(self):
+        with patch("hw1.readers.SIZE_CHECK_INTERVAL", 100), open(self.file.name, "rb") as f:
+            lines = iter_lines(f)
+            first_line = bytes(next(lines))
+            with open(self.file.name, "ab") as appending:
+                appending.write(b" appended\n")
+            rest = b"".join(bytes(line) for line in lines)
+        self.assertEqual(self.content + b" appended\n", first_line + rest)
+
+    def test_should_stream_the_rest_of_file_resized_while_reading_chunks(self):
+        with open(self.file.name, "rb") as f:
+            chunks = iter_chunks(f, 100)
+            first_chunk = next(chunks)
+            with open(self.file.name, "ab") as appending:
+                appending.write(b" appended\n")
+            rest = b"".join(chunks)
+        self.assertEqual(self.content + b" appended\n", first_chunk + rest)
+
+
+class OpenInputTestCase(unittest.TestCase):
+    content = b"".join(b"line %d\n" % i for i in range(1000))
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read_input(self, content: bytes) -> bytes:
+        filepath = os.path.join(self.directory.name, "file.txt")
+        with open(filepath, "wb") as f:
+            f.write(content)
+        with open_input(filepath) as f:
+            return f.read()
+
+    def test_should_read_plain_file_as_is(self):
+        self.assertEqual(self.content, self.read_input(self.content))
+
+    def test_should_decompress_gzip_whatever_the_extension(self):
+        self.assertEqual(self.content, self.read_input(gzip.compress(self.content)))
+
+    def test_should_decompress_bzip2_whatever_the_extension(self):
+        self.assertEqual(self.content, self.read_input(bz2.compress(self.content)))
+
+    def test_should_decompress_xz_whatever_the_extension(self):
+        self.assertEqual(self.content, self.read_input(lzma.compress(self.content)))
+
+    def test_should_not_map_decompressed_files(self):
+        with patch("hw1.readers.MMAP_MIN_SIZE", 1):
+            filepath = os.path.join(self.directory.name, "file.gz")
+            with open(filepath, "wb") as f:
+                f.write(gzip.compress(self.content))
+            with open_input(filepath) as f:
+                self.assertEqual(self.content.splitlines(keepends=True), list(iter_lines(f)))
+
+    def test_should_read_stdin_without_closing_it(self):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(self.content))))
+        with patch("sys.stdin", stdin):
+            with open_input("-") as f:
+                self.assertEqual(self.content, f.read())
+        self.assertFalse(stdin.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
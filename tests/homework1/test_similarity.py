@@ -0,0 +1,49 @@
+import unittest
+from math import pi
+
+from hw1.matrices import Matrix, angle_between_vectors, dot_product, magnitude
+from hw1.similarity import VectorCorpus, angles, cosine_similarities, iter_most_similar
+from tests.homework1.test_matrices import random_rows
+
+
+class SimilarityTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queries = random_rows(4, 6, seed=1)
+        self.vectors = random_rows(9, 6, seed=2)
+        self.corpus = VectorCorpus(self.vectors)
+
+    def test_corpus_should_cache_norms(self):
+        self.assertEqual([magnitude(vector) for vector in self.vectors], self.corpus.norms)
+        self.assertEqual(9, len(VectorCorpus(Matrix.from_rows(self.vectors))))
+
+    def test_similarities_should_equal_pairwise_ones(self):
+        expected = [
+            [dot_product(query, vector) / (magnitude(query) * magnitude(vector)) for vector in self.vectors]
+            for query in self.queries
+        ]
+        self.assertEqual(Matrix.from_rows(expected), cosine_similarities(self.queries, self.corpus))
+
+    def test_angles_should_equal_pairwise_ones(self):
+        expected = [[angle_between_vectors(query, vector) for vector in self.vectors] for query in self.queries]
+        self.assertEqual(Matrix.from_rows(expected), angles(Matrix.from_rows(self.queries), self.corpus))
+
+    def test_angle_of_vector_with_itself_should_be_zero(self):
+        vector = [0.1, 0.2, 0.3]
+        self.assertEqual([[0.0]], angles([vector], VectorCorpus([vector])).to_rows())
+        self.assertAlmostEqual(pi, angles([[-0.1, -0.2, -0.3]], VectorCorpus([vector]))[0, 0])
+
+    def test_should_find_most_similar_vectors_in_order(self):
+        similarities = cosine_similarities(self.queries, self.corpus)
+        for i, most_similar in enumerate(iter_most_similar(self.queries, self.corpus, 3)):
+            expected = sorted(enumerate(similarities[i]), key=lambda pair: pair[1], reverse=True)[:3]
+            self.assertEqual(expected, most_similar)
+
+    def test_equally_similar_vectors_should_come_in_corpus_order(self):
+        corpus = VectorCorpus([[0, 1], [2, 0], [1, 0], [0, 3]])
+        self.assertEqual([[(1, 1.0), (2, 1.0)]], list(iter_most_similar([[1, 0]], corpus, 2)))
+
+    def test_should_fail_for_different_dimensions(self):
+        with self.assertRaises(IndexError):
+            cosine_similarities([[1, 2, 3]], self.corpus)
+        with self.assertRaises(IndexError):
+            VectorCorpus([])
@@ -0,0 +1,97 @@
+import random
+import unittest
+from array import array
+from typing import List
+
+from hw1.matrices import Matrix, matrix_multiplication, matrix_sum, matrix_transpose
+from hw1.sparse import CSRMatrix, sparse_dense_multiplication, sparse_matrix_sum, sparse_multiplication
+
+
+def random_sparse_rows(n_rows: int, n_cols: int, density: float, seed: int = 0) -> List[List[float]]:
+    generator = random.Random(seed)
+    return [
+        [generator.uniform(-1, 1) if generator.random() < density else 0.0 for _ in range(n_cols)]
+        for _ in range(n_rows)
+    ]
+
+
+class CSRMatrixTestCase(unittest.TestCase):
+    def test_should_keep_only_nonzeros(self):
+        matrix = CSRMatrix.from_dense([[0, 1, 0], [0, 0, 0], [2, 0, 3]])
+        self.assertEqual((3, 3), matrix.shape)
+        self.assertEqual(3, matrix.n_nonzeros)
+        self.assertEqual(array("d", [1, 2, 3]), matrix.values)
+        self.assertEqual(array("q", [1, 0, 2]), matrix.column_indices)
+        self.assertEqual(array("q", [0, 1, 1, 3]), matrix.row_starts)
+
+    def test_should_convert_back_to_dense(self):
+        rows = random_sparse_rows(7, 5, 0.3)
+        self.assertEqual(Matrix.from_rows(rows), CSRMatrix.from_dense(rows).to_dense())
+        self.assertEqual(CSRMatrix.from_dense(rows), CSRMatrix.from_dense(Matrix.from_rows(rows)))
+
+    def test_should_build_from_unordered_coordinates_adding_repeated_ones(self):
+        matrix = CSRMatrix.from_coo(2, 3, [1, 0, 1, 1], [2, 1, 0, 2], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual([[0, 2, 0], [3, 0, 5]], matrix.to_dense().to_rows())
+
+    def test_should_drop_coordinates_adding_up_to_zero(self):
+        matrix = CSRMatrix.from_coo(2, 2, [0, 0, 1], [0, 0, 1], [1.0, -1.0, 2.0])
+        self.assertEqual(1, matrix.n_nonzeros)
+
+    def test_should_check_shape_like_dense_matrices(self):
+        self.assertRaises(IndexError, CSRMatrix.from_dense, [])
+        self.assertRaises(IndexError, CSRMatrix.from_dense, [[1, 2], [3]])
+        self.assertRaises(IndexError, CSRMatrix.from_coo, 0, 3, [], [], [])
+        self.assertRaises(IndexError, CSRMatrix.from_coo, 2, 2, [2], [0], [1.0])
+        self.assertRaises(IndexError, CSRMatrix.from_coo, 2, 2, [0, 1], [0], [1.0])
+
+    def test_should_transpose_into_csc_sharing_arrays(self):
+        rows = random_sparse_rows(4, 6, 0.4)
+        matrix = CSRMatrix.from_dense(rows)
+        transposed = matrix.transpose()
+        self.assertIs(matrix.values, transposed.values)
+        self.assertEqual((6, 4), transposed.shape)
+        self.assertEqual(matrix_transpose(rows), transposed.to_dense().to_rows())
+
+    def test_should_convert_to_csc_and_back(self):
+        rows = random_sparse_rows(5, 8, 0.3, seed=1)
+        matrix = CSRMatrix.from_dense(rows)
+        csc = matrix.to_csc()
+        self.assertEqual(
+            array("q", sorted(csc.row_indices[csc.column_starts[0] : csc.column_starts[1]])),
+            csc.row_indices[csc.column_starts[0] : csc.column_starts[1]],
+        )
+        self.assertEqual(matrix, csc.to_csr())
+        self.assertEqual(CSRMatrix.from_dense(matrix_transpose(rows)), matrix.transpose().to_csr())
+
+
+class SparseOperationsTestCase(unittest.TestCase):
+    def test_sum_should_equal_dense_sum(self):
+        rows1, rows2 = random_sparse_rows(6, 7, 0.3, seed=2), random_sparse_rows(6, 7, 0.3, seed=3)
+        result = sparse_matrix_sum(CSRMatrix.from_dense(rows1), CSRMatrix.from_dense(rows2))
+        self.assertEqual(CSRMatrix.from_dense(matrix_sum(rows1, rows2)), result)
+
+    def test_sum_should_drop_cancelled_elements(self):
+        matrix = CSRMatrix.from_dense([[1, 0], [0, 2]])
+        negated = CSRMatrix.from_dense([[-1, 0], [0, 0]])
+        self.assertEqual(1, sparse_matrix_sum(matrix, negated).n_nonzeros)
+
+    def test_sum_should_fail_for_different_shapes(self):
+        self.assertRaises(
+            IndexError, sparse_matrix_sum, CSRMatrix.from_dense([[1, 2]]), CSRMatrix.from_dense([[1], [2]])
+        )
+
+    def test_sparse_dense_multiplication_should_equal_dense_multiplication(self):
+        rows1, rows2 = random_sparse_rows(9, 6, 0.2, seed=4), random_sparse_rows(6, 5, 1, seed=5)
+        product = sparse_dense_multiplication(CSRMatrix.from_dense(rows1), rows2)
+        self.assertEqual(matrix_multiplication(rows1, rows2), product.to_rows())
+        self.assertEqual(product, sparse_dense_multiplication(CSRMatrix.from_dense(rows1), Matrix.from_rows(rows2)))
+
+    def test_sparse_multiplication_should_equal_dense_multiplication(self):
+        rows1, rows2 = random_sparse_rows(8, 10, 0.2, seed=6), random_sparse_rows(10, 7, 0.2, seed=7)
+        product = sparse_multiplication(CSRMatrix.from_dense(rows1), CSRMatrix.from_dense(rows2))
+        self.assertEqual(CSRMatrix.from_dense(matrix_multiplication(rows1, rows2)), product)
+
+    def test_multiplication_should_fail_for_mismatching_shapes(self):
+        matrix = CSRMatrix.from_dense([[1, 2, 3]])
+        self.assertRaises(IndexError, sparse_dense_multiplication, matrix, [[1, 2, 3]])
+        self.assertRaises(IndexError, sparse_multiplication, matrix, matrix)
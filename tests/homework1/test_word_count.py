@@ -0,0 +1,121 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from typing import Tuple
+from unittest.mock import patch
+
+from hw1.wc_cache import count_with_cache
+from hw1.word_count import Counters, count_lines_words_bytes
+
+
+def count_like_text_mode(content: bytes) -> Tuple[int, int, int]:
+    lines = list(io.TextIOWrapper(io.BytesIO(content), encoding="utf8"))
+    return len(lines), sum(len(line.split()) for line in lines), sum(len(line.encode("utf8")) for line in lines)
+
+
+class CountLinesWordsBytesTestCase(unittest.TestCase):
+    contents = [
+        b"",
+        b"\n",
+        b"one",
+        b"one two\n",
+        b"  leading and trailing  \n\n",
+        b"tabs\tand\x0bvertical\x0cfeeds\n",
+        b"separators\x1care\x1dwhitespace\x1e\x1ftoo\n",
+        b"no newline at\nthe end",
+        "юникод тоже считается\n".encode("utf8"),
+    ]
+
+    def test_should_count_like_text_mode_for_any_chunk_size(self):
+        for content in self.contents:
+            for chunk_size in (1, 2, 3, 7, 1024):
+                with self.subTest(content=content, chunk_size=chunk_size):
+                    self.assertEqual(
+                        count_like_text_mode(content),
+                        count_lines_words_bytes(io.BytesIO(content), chunk_size),
+                    )
+
+    def test_should_count_newlines_bytes_and_ascii_whitespace_only(self):
+        content = "a\xa0b c\r\nd\re\n".encode("utf8")
+        self.assertEqual((3, 5, 11), count_like_text_mode(content))
+        self.assertEqual((2, 4, 12), count_lines_words_bytes(io.BytesIO(content)))
+
+
+class CountWithCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, "cache")
+        self.filepath = os.path.join(self.directory.name, "file")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, content: bytes, mode: str = "wb") -> None:
+        with open(self.filepath, mode) as f:
+            f.write(content)
+        # makes sure the modification time differs from the one of the previous write
+        os.utime(self.filepath, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+    def count(self) -> Counters:
+        with open(self.filepath, "rb") as f:
+            return count_with_cache(f, os.fstat(f.fileno()), self.cache_directory, chunk_size=4).counters
+
+    def count_without_cache(self) -> Counters:
+        with open(self.filepath, "rb") as f:
+            return count_lines_words_bytes(f)
+
+    def test_should_not_read_unchanged_file(self):
+        self.write(b"hello world\n")
+        self.count()
+        with patch("hw1.wc_cache.count_chunks", side_effect=AssertionError("the file is counted again")):
+            self.assertEqual((1, 2, 12), self.count())
+
+    def test_should_only_count_appended_part(self):
+        self.write(b"hello wo")
+        self.count()
+        self.write(b"rld\nbye\n", "ab")
+        with patch("hw1.wc_cache.iter_chunks", wraps=lambda f, chunk_size: iter([f.read()])) as iter_chunks:
+            self.assertEqual(self.count_without_cache(), self.count())
+        self.assertEqual(1, iter_chunks.call_count)
+
+    def test_should_count_appended_part_correctly(self):
+        contents = [b"hello wo", b"rld\n", b"", b"  bye", b"\nno newline"]
+        for content in contents:
+            with self.subTest(content=content):
+                self.write(content, "ab")
+                self.assertEqual(self.count_without_cache(), self.count())
+
+    def test_should_recount_truncated_file(self):
+        self.write(b"one two three\nfour\n")
+        self.count()
+        self.write(b"one\n")
+        self.assertEqual((1, 1, 4), self.count())
+
+    def test_should_recount_file_rewritten_and_grown(self):
+        self.write(b"one two three\n")
+        self.count()
+        self.write(b"a b c d e f g h i j k\n")
+        self.assertEqual((1, 11, 22), self.count())
+
+    def test_should_recount_replaced_file(self):
+        self.write(b"one two three\n")
+        self.count()
+        replacement = self.filepath + ".new"
+        with open(replacement, "wb") as f:
+            f.write(b"one two three\nfour\n")
+        os.replace(replacement, self.filepath)
+        self.assertEqual((2, 4, 19), self.count())
+
+    def test_should_ignore_broken_entries(self):
+        self.write(b"one two\n")
+        self.count()
+        for entry in os.listdir(self.cache_directory):
+            with open(os.path.join(self.cache_directory, entry), "w") as f:
+                f.write("{broken")
+        self.assertEqual((1, 2, 8), self.count())
+
+
+if __name__ == "__main__":
+    unittest.main()
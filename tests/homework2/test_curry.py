@@ -1,4 +1,6 @@
+import inspect
 import unittest
+from unittest import mock
 
 from hw2.curry import curry_explicit
 
@@ -90,6 +92,28 @@ class TestCurry(unittest.TestCase):
     def test_does_not_fail_for_builtin_functions(self):
         curry_explicit(print, 5)
 
+    def test_should_analyse_signature_once_per_function(self):
+        def add3(x, y, z):
+            return x + y + z
+
+        with mock.patch("inspect.getfullargspec", wraps=inspect.getfullargspec) as getfullargspec:
+            curried = curry_explicit(add3, 3)
+            self.assertEqual(6, curried(1)(2)(3))
+            self.assertEqual(6, curry_explicit(add3, 3)(1)(2)(3))
+        self.assertEqual(1, getfullargspec.call_count)
+
+    def test_partial_applications_should_be_reusable(self):
+        add_one = curry_explicit(add_many, 3)(1)
+        self.assertEqual(6, add_one(2)(3))
+        self.assertEqual(15, add_one(10)(4))
+        self.assertEqual(7, add_one(2)(4))
+
+    def test_should_pass_arguments_in_order_for_large_arity(self):
+        curried = curry_explicit(lambda *args: args, 20)
+        for i in range(20):
+            curried = curried(i)
+        self.assertEqual(tuple(range(20)), curried)
+
 
 if __name__ == "__main__":
     unittest.main()